@@ -43,12 +43,22 @@ async function executeRadioCommand(command: string): Promise<string> {
 }
 
 /**
- * Scan radio up by 0.1 MHz
+ * Number of channels to move, from an optional { steps } body.
+ * Hardware clients coalesce bursts of presses into one request.
  */
-export async function scanUp(_req: Request, res: Response) {
+function parseSteps(req: Request): number {
+  const steps = parseInt(req.body?.steps, 10);
+  return Number.isFinite(steps) && steps > 1 ? steps : 1;
+}
+
+/**
+ * Scan radio up by 0.1 MHz (or by { steps } channels in one tune)
+ */
+export async function scanUp(req: Request, res: Response) {
   try {
-    console.log('📻 Scanning radio up...');
-    const output = await executeRadioCommand('up');
+    const steps = parseSteps(req);
+    console.log(`📻 Scanning radio up (${steps})...`);
+    const output = await executeRadioCommand(steps > 1 ? `step ${steps}` : 'up');
 
     // Parse and broadcast frequency change
     const frequency = parseFrequency(output);
@@ -73,12 +83,13 @@ export async function scanUp(_req: Request, res: Response) {
 }
 
 /**
- * Scan radio down by 0.1 MHz
+ * Scan radio down by 0.1 MHz (or by { steps } channels in one tune)
  */
-export async function scanDown(_req: Request, res: Response) {
+export async function scanDown(req: Request, res: Response) {
   try {
-    console.log('📻 Scanning radio down...');
-    const output = await executeRadioCommand('down');
+    const steps = parseSteps(req);
+    console.log(`📻 Scanning radio down (${steps})...`);
+    const output = await executeRadioCommand(steps > 1 ? `step -${steps}` : 'down');
 
     // Parse and broadcast frequency change
     const frequency = parseFrequency(output);
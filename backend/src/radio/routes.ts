@@ -10,12 +10,14 @@ const router = Router();
 /**
  * POST /api/radio/scan-up
  * Scan radio up by 0.1 MHz
+ * Body (optional): { steps: number } - move several channels in one tune
  */
 router.post('/scan-up', radioController.scanUp);
 
 /**
  * POST /api/radio/scan-down
  * Scan radio down by 0.1 MHz
+ * Body (optional): { steps: number } - move several channels in one tune
  */
 router.post('/scan-down', radioController.scanDown);
 
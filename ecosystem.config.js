@@ -3,11 +3,13 @@
  *
  * This file manages all services required for the Cogito system:
  * 1. Hardware Service - Manages GPIO buttons and radio control
- * 2. Button Handler - Python script for hardware button events
- * 3. Encoder Service - ANO Rotary Encoder for volume & radio control
- * 4. Emergency Reboot - Safety button for system reboot
- * 5. Backend API - Express server with Socket.io
- * 6. Frontend Web App - React application
+ *    Radio Daemon - Resident TEA5767 control over a Unix socket
+ * 2. Hardware Daemon - One Python process hosting the hardware handlers:
+ *    - Button Handler - Mode button (radio <-> AI)
+ *    - Encoder Service - ANO Rotary Encoder for volume & radio control
+ *    - Emergency Reboot - Safety button for system reboot
+ * 3. Backend API - Express server with Socket.io
+ * 4. Frontend Web App - React application
  *
  * Usage:
  *   pm2 start ecosystem.config.js
@@ -34,48 +36,38 @@ module.exports = {
       log_date_format: 'YYYY-MM-DD HH:mm:ss Z',
     },
     {
-      name: 'button-handler',
+      name: 'radio-daemon',
       cwd: './hardware-service/python',
-      script: 'button-vapi-handler.py',
+      script: 'radio_daemon.py',
       interpreter: 'python3',
       instances: 1,
       autorestart: true,
       watch: false,
-      max_memory_restart: '100M',
-      error_file: './logs/button-error.log',
-      out_file: './logs/button-out.log',
-      log_date_format: 'YYYY-MM-DD HH:mm:ss Z',
-    },
-    {
-      name: 'encoder-service',
-      cwd: './hardware-service/python',
-      script: 'encoder_service.py',
-      interpreter: 'python3',
-      instances: 1,
-      autorestart: true,
-      watch: false,
-      max_memory_restart: '100M',
+      max_memory_restart: '50M',
       env: {
         PYTHONUNBUFFERED: '1',
       },
-      error_file: './logs/encoder-error.log',
-      out_file: './logs/encoder-out.log',
+      error_file: './logs/radio-error.log',
+      out_file: './logs/radio-out.log',
       log_date_format: 'YYYY-MM-DD HH:mm:ss Z',
     },
     {
-      name: 'emergency-reboot',
+      // Mode button, ANO encoder and emergency reboot button as plugins of
+      // one Python process (select with COGITO_PLUGINS, e.g. 'button,reboot')
+      name: 'hardware-daemon',
       cwd: './hardware-service/python',
-      script: 'emergency-reboot-handler.py',
+      script: 'hardware_daemon.py',
       interpreter: 'python3',
       instances: 1,
       autorestart: true,
       watch: false,
-      max_memory_restart: '50M',
+      max_memory_restart: '150M',
+      kill_timeout: 8000, // Plugins return to radio mode and flush on SIGTERM
       env: {
         PYTHONUNBUFFERED: '1',
       },
-      error_file: './logs/reboot-error.log',
-      out_file: './logs/reboot-out.log',
+      error_file: './logs/hardware-daemon-error.log',
+      out_file: './logs/hardware-daemon-out.log',
       log_date_format: 'YYYY-MM-DD HH:mm:ss Z',
     },
     {
@@ -2,6 +2,7 @@
 const express = require('express');
 const http = require('http');
 const socketIo = require('socket.io');
+const net = require('net');
 const { exec } = require('child_process');
 
 const app = express();
@@ -34,14 +35,103 @@ let vapiConnected = false;  // Track if Vapi call has connected
 
 console.log('Cogito Hardware Service Starting...');
 
-// Set mode endpoint
-app.post('/api/mode/set', (req, res) => {
-  const { mode } = req.body;
+// ========== RADIO DAEMON CLIENT ==========
+// python/radio_daemon.py keeps the TEA5767 bus open; talking to its socket
+// avoids forking a Python interpreter per command. Falls back to the CLI
+// script when the daemon is not running.
+
+const RADIO_SOCKET = process.env.COGITO_RADIO_SOCKET || '/tmp/cogito-radio.sock';
+const RADIO_SOCKET_TIMEOUT = 1000; // ms, allows a first-tune quality pass
+const RADIO_SEEK_TIMEOUT = 7000; // ms, hardware search plus software fallback
+const RADIO_SURVEY_TIMEOUT = 30000; // ms, full band at maximum dwell
+// Results only the daemon returns as data (the CLI just prints them): without
+// the daemon these fail fast instead of running radio-control.py for nothing
+const RADIO_DAEMON_ONLY = new Set(['survey', 'stations']);
+
+function radioCommand(cmd, params, callback) {
+  const socket = net.createConnection(RADIO_SOCKET);
+  const timeout = cmd === 'seek' ? RADIO_SEEK_TIMEOUT
+    : cmd === 'survey' ? RADIO_SURVEY_TIMEOUT
+    : RADIO_SOCKET_TIMEOUT;
+  let buffer = '';
+  let done = false;
+  let connected = false;
+
+  const finish = (result) => {
+    if (done) return;
+    done = true;
+    socket.destroy();
+    callback(result);
+  };
+
+  // null only when the daemon is not running; once the request may have
+  // reached it, failures are errors so the command is never run twice
+  socket.setTimeout(timeout, () => finish({ ok: false, error: `Radio daemon did not answer '${cmd}' within ${timeout} ms` }));
+  socket.on('connect', () => {
+    connected = true;
+    socket.write(JSON.stringify({ ...params, cmd }) + '\n');
+  });
+  socket.on('data', (chunk) => {
+    buffer += chunk;
+    const newline = buffer.indexOf('\n');
+    if (newline !== -1) {
+      try {
+        finish(JSON.parse(buffer.slice(0, newline)));
+      } catch (e) {
+        finish({ ok: false, error: `Malformed reply from radio daemon to '${cmd}'` });
+      }
+    }
+  });
+  socket.on('error', (err) => {
+    if (!connected && (err.code === 'ENOENT' || err.code === 'ECONNREFUSED')) return finish(null);
+    finish({ ok: false, error: `Radio daemon connection failed during '${cmd}': ${err.message}` });
+  });
+  socket.on('close', () => finish({ ok: false, error: `Radio daemon closed the connection during '${cmd}'` }));
+}
+
+// Run a radio command via the daemon, or via radio-control.py if it is not running
+// (RADIO_DAEMON_ONLY commands fail with error.code 'RADIO_DAEMON_DOWN' instead).
+// callback(error, result) where result has at least { frequency } on success.
+function runRadio(cmd, params, callback) {
+  radioCommand(cmd, params, (resp) => {
+    if (resp) {
+      if (!resp.ok) return callback(new Error(resp.error), resp);
+      return callback(null, resp);
+    }
 
-  if (!mode || (mode !== 'radio' && mode !== 'ai')) {
-    return res.status(400).json({ error: 'Invalid mode. Use "radio" or "ai"' });
-  }
+    if (RADIO_DAEMON_ONLY.has(cmd)) {
+      const error = new Error(`Radio daemon is not running ('${cmd}' needs it)`);
+      error.code = 'RADIO_DAEMON_DOWN';
+      return callback(error, { error: error.message });
+    }
+
+    let args = cmd;
+    if (cmd === 'set') args = `set ${params.freq}`;
+    if (cmd === 'seek') args = `seek ${params.direction}`;
+    if (cmd === 'step') args = `step ${params.delta}`;
+    if (cmd === 'preset') args = `preset ${params.slot}`;
+    if (cmd === 'save_preset') args = `save-preset ${params.slot}`;
+    exec(`python3 python/radio-control.py ${args}`, (error, stdout, stderr) => {
+      if (error) return callback(error, { error: stderr });
+
+      console.log(stdout);
+
+      const freqMatch = stdout.match(/(\d+\.\d+)\s*MHz/);
+      const signalMatch = stdout.match(/Signal Level:\s*(\d+)/);
+      const stereoMatch = stdout.match(/Stereo:\s*(Yes|No)/);
+
+      callback(null, {
+        ok: true,
+        frequency: freqMatch ? parseFloat(freqMatch[1]) : null,
+        signal: signalMatch ? parseInt(signalMatch[1]) : 0,
+        stereo: stereoMatch ? stereoMatch[1] === 'Yes' : false,
+      });
+    });
+  });
+}
 
+// Switch between radio and AI mode (shared by the HTTP endpoint and the push channel)
+function setMode(mode) {
   if (mode === 'ai' && currentMode === 'radio') {
     // Enter AI mode
     currentMode = 'ai';
@@ -50,7 +140,7 @@ app.post('/api/mode/set', (req, res) => {
     console.log('🎤 AI MODE - Listening (waiting for Vapi connection...)');
 
     // Stop radio
-    exec('python3 python/radio-control.py stop', (error) => {
+    runRadio('stop', {}, (error) => {
       if (error) console.error('Radio stop error:', error);
     });
 
@@ -69,7 +159,7 @@ app.post('/api/mode/set', (req, res) => {
       console.warn('⚠️  WARNING: No clients connected! Frontend may not be running.');
     }
 
-    res.json({ mode: 'ai', message: 'AI mode activated' });
+    return { mode: 'ai', message: 'AI mode activated' };
 
   } else if (mode === 'radio' && currentMode === 'ai') {
     // Return to radio mode
@@ -84,18 +174,28 @@ app.post('/api/mode/set', (req, res) => {
     console.log('📤 Emitted: stop-voice to frontend');
 
     // Resume radio
-    exec('python3 python/radio-control.py resume', (error) => {
+    runRadio('resume', {}, (error) => {
       if (error) console.error('Radio resume error:', error);
     });
 
     // Notify WebSocket clients about mode change
     io.emit('mode-changed', { mode: 'radio' });
 
-    res.json({ mode: 'radio', message: 'Radio mode activated' });
+    return { mode: 'radio', message: 'Radio mode activated' };
+  }
 
-  } else {
-    res.json({ mode: currentMode, message: 'Already in that mode' });
+  return { mode: currentMode, message: 'Already in that mode' };
+}
+
+// Set mode endpoint
+app.post('/api/mode/set', (req, res) => {
+  const { mode } = req.body;
+
+  if (!mode || (mode !== 'radio' && mode !== 'ai')) {
+    return res.status(400).json({ error: 'Invalid mode. Use "radio" or "ai"' });
   }
+
+  res.json(setMode(mode));
 });
 
 // Get current mode
@@ -110,6 +210,13 @@ app.get('/api/mode/current', (req, res) => {
   });
 });
 
+// Pre-reboot checkpoint (python/checkpoint.py): report state for the snapshot.
+// Mode is in memory only, so it is handed over rather than persisted here.
+app.post('/api/checkpoint', (req, res) => {
+  console.log(`💾 Checkpoint requested (mode: ${currentMode})`);
+  res.json({ ok: true, mode: currentMode, vapiConnected });
+});
+
 // Report speech activity (called by Vapi or voice detection)
 app.post('/api/ai/activity', (req, res) => {
   if (currentMode === 'ai') {
@@ -156,14 +263,12 @@ app.post('/api/radio/frequency', (req, res) => {
 
   console.log(`📻 Setting frequency to ${frequency} MHz`);
 
-  exec(`python3 python/radio-control.py set ${frequency}`, (error, stdout, stderr) => {
+  runRadio('set', { freq: frequency }, (error, result) => {
     if (error) {
       console.error('Radio frequency error:', error);
-      return res.status(500).json({ error: 'Failed to set frequency', details: stderr });
+      return res.status(500).json({ error: 'Failed to set frequency', details: result && result.error });
     }
 
-    console.log(stdout);
-
     // Notify WebSocket clients
     io.emit('radio-state-update', { frequency });
 
@@ -175,17 +280,13 @@ app.post('/api/radio/frequency', (req, res) => {
 app.post('/api/radio/tune/up', (req, res) => {
   console.log('📻 Tuning up');
 
-  exec('python3 python/radio-control.py up', (error, stdout, stderr) => {
+  runRadio('up', {}, (error, result) => {
     if (error) {
       console.error('Radio tune up error:', error);
-      return res.status(500).json({ error: 'Failed to tune up', details: stderr });
+      return res.status(500).json({ error: 'Failed to tune up', details: result && result.error });
     }
 
-    console.log('Tune up output:', stdout);
-
-    // Parse frequency from output - look for pattern like "99.5 MHz"
-    const match = stdout.match(/(\d+\.\d+)\s*MHz/);
-    const frequency = match ? parseFloat(match[1]) : null;
+    const frequency = result.frequency;
 
     if (frequency) {
       console.log(`✅ Tuned up to ${frequency} MHz`);
@@ -202,17 +303,13 @@ app.post('/api/radio/tune/up', (req, res) => {
 app.post('/api/radio/tune/down', (req, res) => {
   console.log('📻 Tuning down');
 
-  exec('python3 python/radio-control.py down', (error, stdout, stderr) => {
+  runRadio('down', {}, (error, result) => {
     if (error) {
       console.error('Radio tune down error:', error);
-      return res.status(500).json({ error: 'Failed to tune down', details: stderr });
+      return res.status(500).json({ error: 'Failed to tune down', details: result && result.error });
     }
 
-    console.log('Tune down output:', stdout);
-
-    // Parse frequency from output - look for pattern like "99.5 MHz"
-    const match = stdout.match(/(\d+\.\d+)\s*MHz/);
-    const frequency = match ? parseFloat(match[1]) : null;
+    const frequency = result.frequency;
 
     if (frequency) {
       console.log(`✅ Tuned down to ${frequency} MHz`);
@@ -225,30 +322,88 @@ app.post('/api/radio/tune/down', (req, res) => {
   });
 });
 
-// Set volume (placeholder - actual volume control depends on hardware)
+// Seek to next station (direction: up | down)
+app.post('/api/radio/seek/:direction', (req, res) => {
+  const { direction } = req.params;
+
+  if (direction !== 'up' && direction !== 'down') {
+    return res.status(400).json({ error: 'Invalid direction. Use "up" or "down"' });
+  }
+
+  console.log(`📻 Seeking ${direction}`);
+
+  runRadio('seek', { direction }, (error, result) => {
+    if (error) {
+      console.error(`Radio seek ${direction} error:`, error);
+      return res.status(500).json({ error: `Failed to seek ${direction}`, details: result && result.error });
+    }
+
+    const frequency = result.frequency;
+    console.log(`✅ Seek ${direction} found ${frequency} MHz`);
+    io.emit('radio-state-update', { frequency });
+    res.json({ message: `Seek ${direction}`, frequency, signalStrength: result.signal });
+  });
+});
+
+// Sweep the band and rebuild the station index ({ refresh: true } re-probes only stale/marginal channels)
+app.post('/api/radio/survey', (req, res) => {
+  const refresh = !!(req.body && req.body.refresh);
+
+  console.log(`📻 Surveying band${refresh ? ' (refresh)' : ''}`);
+
+  runRadio('survey', { refresh }, (error, result) => {
+    if (error && error.code === 'RADIO_DAEMON_DOWN') {
+      return res.status(503).json({ error: 'Survey needs radio_daemon.py, which is not running' });
+    }
+    if (error || !result.stations) {
+      console.error('Radio survey error:', error);
+      return res.status(500).json({ error: 'Survey failed', details: result && result.error });
+    }
+
+    io.emit('radio-stations-update', { stations: result.stations });
+    res.json({ stations: result.stations, probed: result.probed, duration: result.duration });
+  });
+});
+
+// List stations from the index (no band sweep)
+app.get('/api/radio/stations', (req, res) => {
+  runRadio('stations', {}, (error, result) => {
+    if (error || !result.stations) {
+      return res.json({ stations: [], error: 'Station index unavailable' });
+    }
+    res.json({ stations: result.stations });
+  });
+});
+
+// Set volume on the ALSA Master control
 app.post('/api/radio/volume', (req, res) => {
-  const { volume } = req.body;
+  const volume = Number(req.body.volume);
 
-  if (volume === undefined || volume < 0 || volume > 100) {
+  if (req.body.volume === undefined || !Number.isFinite(volume) || volume < 0 || volume > 100) {
     return res.status(400).json({ error: 'Invalid volume. Must be between 0 and 100' });
   }
 
   console.log(`📻 Setting volume to ${volume}%`);
 
-  // Note: TEA5767 doesn't have built-in volume control
-  // Volume is typically controlled via system audio or external amplifier
-  // This endpoint is for frontend state management
+  // TEA5767 has no volume control of its own; the system mixer sets the level.
+  // The encoder services subscribe to mixer events and pick this change up.
+  exec(`amixer set Master ${Math.round(volume)}%`, (error) => {
+    if (error) {
+      console.error('Volume error:', error.message);
+      return res.status(500).json({ error: 'Failed to set volume' });
+    }
 
-  io.emit('radio-state-update', { volume });
+    io.emit('radio-state-update', { volume });
 
-  res.json({ volume, message: 'Volume set (software state only)' });
+    res.json({ volume, message: 'Volume set' });
+  });
 });
 
 // Get radio status
 app.get('/api/radio/status', (req, res) => {
   console.log('📻 Getting radio status');
 
-  exec('python3 python/radio-control.py status', (error, stdout, stderr) => {
+  runRadio('status', {}, (error, result) => {
     if (error) {
       console.error('Radio status error:', error);
       // Return default state if hardware is unavailable
@@ -263,16 +418,9 @@ app.get('/api/radio/status', (req, res) => {
       return res.json(fallbackStatus);
     }
 
-    console.log('Radio status output:', stdout);
-
-    // Parse status from output
-    const freqMatch = stdout.match(/Frequency:\s*(\d+\.\d+)\s*MHz/);
-    const signalMatch = stdout.match(/Signal Level:\s*(\d+)/);
-    const stereoMatch = stdout.match(/Stereo:\s*(Yes|No)/);
-
-    const frequency = freqMatch ? parseFloat(freqMatch[1]) : 99.1;
-    const signalStrength = signalMatch ? parseInt(signalMatch[1]) : 0;
-    const isStereo = stereoMatch ? stereoMatch[1] === 'Yes' : false;
+    const frequency = result.frequency || 99.1;
+    const signalStrength = result.signal || 0;
+    const isStereo = !!result.stereo;
 
     const status = {
       frequency,
@@ -287,6 +435,53 @@ app.get('/api/radio/status', (req, res) => {
   });
 });
 
+// ========== HARDWARE PUSH CHANNEL ==========
+// python/push_channel.py keeps one Socket.io connection per hardware service
+// and sends batched 'hardware-events'; replies go out as the usual broadcasts
+function handleHardwareEvent(event, socket) {
+  switch (event && event.type) {
+    case 'mode':
+      if (event.mode === 'radio' || event.mode === 'ai') {
+        const previousMode = currentMode;
+        setMode(event.mode);
+        // No broadcast when nothing changed; answer the sender so it can confirm
+        if (currentMode === previousMode) socket.emit('mode-changed', { mode: currentMode });
+      }
+      break;
+
+    case 'scan': {
+      const delta = parseInt(event.steps, 10);
+      if (!delta) break;
+      console.log(`📻 Scan ${delta > 0 ? 'up' : 'down'} ${Math.abs(delta)} (push)`);
+      runRadio('step', { delta }, (error, result) => {
+        if (error) return console.error('Radio step error:', error);
+        if (result.frequency) io.emit('radio-state-update', { frequency: result.frequency });
+      });
+      break;
+    }
+
+    case 'preset': {
+      // Short press recalls, long press ({ save: true }) stores the current station
+      const slot = parseInt(event.slot, 10);
+      if (!slot) break;
+      const cmd = event.save ? 'save_preset' : 'preset';
+      console.log(`📻 ${event.save ? 'Save' : 'Recall'} preset ${slot} (push)`);
+      runRadio(cmd, { slot }, (error, result) => {
+        if (error) return console.error(`Radio ${cmd} error:`, error);
+        if (!event.save && result.frequency) io.emit('radio-state-update', { frequency: result.frequency });
+      });
+      break;
+    }
+
+    case 'select':
+      console.log('🔘 Select pressed (push)');
+      break;
+
+    default:
+      console.warn('⚠️  Unknown hardware event:', event);
+  }
+}
+
 // Health check
 app.get('/health', (req, res) => {
   res.json({ status: 'ok', mode: currentMode });
@@ -306,6 +501,11 @@ io.on('connection', (socket) => {
     console.log('📡 Remaining clients:', io.sockets.sockets.size);
   });
   
+  // Batched events from the Python hardware services
+  socket.on('hardware-events', (events) => {
+    if (Array.isArray(events)) events.forEach((event) => handleHardwareEvent(event, socket));
+  });
+
   // Log any events received from client
   socket.onAny((event, ...args) => {
     console.log('📨 Received from client:', event, args);
@@ -13,20 +13,74 @@ Hardware:
 Button Mapping:
 - Pin 1: Up (scan radio up)
 - Pin 2: Down (scan radio down)
-- Pin 3: Left (scan radio down - same as down)
-- Pin 4: Right (scan radio up - same as up)
+- Pin 3: Left (preset 1: press to tune, hold LONG_PRESS seconds to save)
+- Pin 4: Right (preset 2: press to tune, hold LONG_PRESS seconds to save)
+- Pin 5: Center/select (reported as "select")
+
+Preset buttons report on release, with the hold time deciding between a
+recall and a save. A recall is one radio daemon command and one I2C write
+(radio_tuner.RadioTuner.recall_preset).
+
+I2C Traffic:
+By default all buttons are fetched with one seesaw bulk GPIO read and the
+rotation with one read of the encoder delta register, i.e. two I2C
+transactions per poll instead of five.
+
+Interrupt Mode:
+With interrupt_pin set (the ANO INT line is wired to GPIO 22), the seesaw
+asserts INT on any button or encoder change. wait_for_event() blocks on the
+falling edge, so I2C is only read when something happened, plus a slow
+safety poll in case an edge is missed.
 
 Rotary Encoder:
 - Clockwise: Volume up
 - Counter-clockwise: Volume down
+- Accelerated: fast spins take bigger steps; mixer writes are batched to at
+  most one per 30ms (see rotation_processor.py)
 """
 
+import struct
+import threading
 import time
 import board
 import busio
+import RPi.GPIO as GPIO
 from digitalio import Direction, Pull
-from adafruit_seesaw import seesaw, rotaryio, digitalio
-import subprocess
+from adafruit_seesaw import seesaw, digitalio
+from radio_daemon import send_command
+from poll_scheduler import PollScheduler
+from radio_tuner import RadioTuner
+from rotation_processor import RotationProcessor
+from settings_store import get_settings
+import state_bus
+from tune_queue import TuneCoalescer
+from volume_mixer import VolumeMixer
+
+
+# Seesaw registers
+GPIO_BASE = 0x01
+GPIO_BULK = 0x04
+ENCODER_BASE = 0x11
+ENCODER_POSITION = 0x30
+ENCODER_DELTA = 0x40
+
+# Register select -> read wait. The library default (8 ms) is far longer than
+# the ANO needs; encoder-radio-control.py has used 1 ms reliably.
+READ_DELAY = 0.001
+
+# Read validation
+MAX_RETRIES = 2         # Extra attempts after an I2C error or a vote mismatch
+MAX_RAW_DELTA = 1000    # Larger encoder deltas are corrupt reads, not movement
+BUS_GLITCH = b'\xff\xff\xff\xff'  # Released-SDA read; also a valid -1, so it is verified
+READ_COUNTERS = ('reads', 'io_errors', 'rejected')
+
+# Preset buttons
+LONG_PRESS = 1.5        # Seconds held to save instead of recall
+RELEASE_BOUNCE = 0.05   # Releases sooner than this after a press are contact bounce
+
+# Interrupt mode
+INT_PIN = 22            # BCM pin wired to the ANO INT output
+SAFETY_POLL = 0.5       # Seconds; poll anyway if no edge arrives
 
 
 class RelaxedSeesaw(seesaw.Seesaw):
@@ -36,6 +90,10 @@ class RelaxedSeesaw(seesaw.Seesaw):
     The Raspberry Pi has a clock-stretching bug that causes the hardware ID
     to be read incorrectly (0x07 instead of 0x87). This class manually sets
     the correct hardware ID to prevent initialization errors.
+
+    The same bug corrupts ordinary reads now and then, so the GPIO and
+    encoder reads used for polling are validated (vote or retry) and
+    counted per register in read_stats.
     """
 
     def __init__(self, i2c_bus, addr=0x49):
@@ -63,89 +121,304 @@ class RelaxedSeesaw(seesaw.Seesaw):
         self._i2c_device = I2CDevice(i2c_bus, addr)
         self._addr = addr
 
+        # Read validation state
+        self.read_stats = {}      # register name -> {'reads', 'io_errors', 'rejected'}
+        self._last_gpio = {}      # pin mask -> last accepted levels
+        self._position = None     # encoder position implied by accepted deltas
+
+    def _read_register(self, name, reg_base, reg, length, delay=READ_DELAY):
+        """
+        Read a register, retrying I2C errors up to MAX_RETRIES times.
+
+        Args:
+            name: Key for the error counters
+            reg_base: Seesaw module base address
+            reg: Register within the module
+            length: Bytes to read
+            delay: Wait between register select and read (seconds)
+
+        Returns:
+            bytearray with the register contents
+        """
+        counters = self.read_stats.setdefault(name, dict.fromkeys(READ_COUNTERS, 0))
+        buf = bytearray(length)
+        for attempt in range(MAX_RETRIES + 1):
+            counters['reads'] += 1
+            try:
+                self.read(reg_base, reg, buf, delay=delay)
+                return buf
+            except OSError:
+                counters['io_errors'] += 1
+                if attempt == MAX_RETRIES:
+                    raise
+
+    def _reject(self, name):
+        self.read_stats[name]['rejected'] += 1
+
+    def read_gpio_bulk(self, pins, delay=READ_DELAY):
+        """
+        Read several GPIO pins with glitch rejection.
+
+        Normally a single I2C transaction. Only when the pin levels differ
+        from the last accepted value is the read repeated: two matching
+        reads confirm the change, otherwise a third read decides by vote
+        and a three-way disagreement keeps the previous value.
+
+        Args:
+            pins: Bit mask of pins to read
+            delay: Wait between register select and read (seconds)
+
+        Returns:
+            Pin levels as a bit mask (1 = high)
+        """
+        def read():
+            buf = self._read_register('gpio', GPIO_BASE, GPIO_BULK, 4, delay)
+            return struct.unpack(">I", buf)[0] & pins
+
+        value = read()
+        last = self._last_gpio.get(pins)
+        if value == last:
+            return value
+
+        votes = [value, read()]
+        if votes[0] != votes[1]:
+            votes.append(read())
+            winners = [v for v in votes if votes.count(v) >= 2]
+            if not winners:
+                self._reject('gpio')
+                return last if last is not None else pins  # pull-ups: all released
+            if winners[0] != value:
+                self._reject('gpio')
+            value = winners[0]
+
+        self._last_gpio[pins] = value
+        return value
+
+    def _encoder_value(self, name, reg, delay):
+        buf = self._read_register(name, ENCODER_BASE, reg, 4, delay)
+        return struct.unpack(">i", buf)[0], buf
+
+    def read_encoder_position(self, delay=READ_DELAY):
+        """
+        Read the absolute encoder position, confirmed by two matching reads.
+
+        Returns:
+            Position in detents, or None if MAX_RETRIES extra reads never agree
+        """
+        previous, _ = self._encoder_value('position', ENCODER_POSITION, delay)
+        for _ in range(MAX_RETRIES):
+            value, _ = self._encoder_value('position', ENCODER_POSITION, delay)
+            if value == previous:
+                return value
+            self._reject('position')
+            previous = value
+        return None
+
+    def sync_encoder(self):
+        """Clear the delta register and take the position as the reference."""
+        self._encoder_value('delta', ENCODER_DELTA, READ_DELAY)
+        self._position = self.read_encoder_position()
+
+    def read_encoder_delta(self, delay=READ_DELAY):
+        """
+        Read and clear the encoder's accumulated delta, rejecting glitches.
+
+        The delta register is read-and-clear, so it cannot be re-read. A
+        corrupted value (not a sign-extended small number) is instead
+        recovered from the absolute position register, which is read
+        (twice, voted) only in that case. All-ones is ambiguous: it is both
+        a -1 detent and the classic bus glitch, so it is only accepted if
+        the position register confirms it.
+
+        Returns:
+            Signed detents since the last read (0 if unrecoverable)
+        """
+        delta, buf = self._encoder_value('delta', ENCODER_DELTA, delay)
+
+        # Valid deltas are small: the top two bytes are pure sign extension
+        sign = 0xFF if delta < 0 else 0x00
+        plausible = buf[0] == sign and buf[1] == sign and abs(delta) <= MAX_RAW_DELTA
+        if plausible and bytes(buf) != BUS_GLITCH:
+            if self._position is not None:
+                self._position += delta
+            return delta
+
+        position = self.read_encoder_position()
+        if position is None or self._position is None:
+            # Nothing to verify against: drop it rather than move by itself
+            self._reject('delta')
+            self._position = position
+            return 0
+        recovered, self._position = position - self._position, position
+        if recovered != delta:
+            self._reject('delta')
+        return recovered if abs(recovered) <= MAX_RAW_DELTA else 0
+
+    def read_interrupt_flags(self, delay=READ_DELAY):
+        """
+        Read and clear the GPIO interrupt flags (releases INT).
+
+        Returns:
+            Bit mask of pins that changed since the last read
+        """
+        return self.get_GPIO_interrupt_flag(delay=delay)
+
 
 class ANOEncoder:
     """
     High-level interface for the Adafruit ANO Rotary Encoder.
 
     Features:
-    - Noise filtering for rotary encoder (ignores jumps > +/- 10 steps)
+    - Noise filtering for rotary encoder (rejects jumps > +/- 10 steps
+      unless they continue a fast spin)
+    - Velocity-aware volume acceleration
     - Button debouncing
     - Volume control via rotation
-    - Radio tuning via buttons
+    - Radio tuning and presets via buttons
     """
 
     # Button pin mapping
     BUTTON_UP = 1      # Scan radio up
     BUTTON_DOWN = 2    # Scan radio down
-    BUTTON_LEFT = 3    # Scan radio down (same as down)
-    BUTTON_RIGHT = 4   # Scan radio up (same as up)
-
-    # Noise filtering threshold
-    MAX_ROTATION_DELTA = 10
-
-    def __init__(self, i2c_address=0x49, volume_step=5):
+    BUTTON_LEFT = 3    # Preset 1
+    BUTTON_RIGHT = 4   # Preset 2
+    BUTTON_SELECT = 5  # Center button
+    ALL_BUTTONS = (BUTTON_UP, BUTTON_DOWN, BUTTON_LEFT, BUTTON_RIGHT, BUTTON_SELECT)
+    PRESET_BUTTONS = {BUTTON_LEFT: 1, BUTTON_RIGHT: 2}  # pin -> preset slot
+
+    def __init__(self, i2c_address=0x49, volume_step=5, bulk_read=True, interrupt_pin=None,
+                 i2c=None, tune_queue=None):
         """
         Initialize the ANO Encoder.
 
         Args:
             i2c_address: I2C address of the encoder (default 0x49)
             volume_step: Volume change per rotation step (default 5%)
+            bulk_read: Read all buttons in one I2C transaction per poll
+                       (False = one read per pin)
+            interrupt_pin: BCM pin wired to the ANO INT output (e.g. INT_PIN)
+                           to enable wait_for_event(); None = poll only
+            i2c: Shared busio.I2C handle (default: open the board bus)
+            tune_queue: Caller's TuneCoalescer for scan presses (default: own
+                        queue stepping via radio_step(), stopped by close())
         """
-        # Create I2C bus
-        self.i2c = busio.I2C(board.SCL, board.SDA)
+        # Create I2C bus (or share the caller's)
+        self.i2c = i2c if i2c is not None else busio.I2C(board.SCL, board.SDA)
 
         # Initialize RelaxedSeesaw
         print("Initializing ANO Encoder with RelaxedSeesaw...")
         self.seesaw = RelaxedSeesaw(self.i2c, addr=i2c_address)
 
-        # Initialize rotary encoder
-        self.encoder = rotaryio.IncrementalEncoder(self.seesaw)
+        self.bulk_read = bulk_read
+        self.button_mask = sum(1 << pin for pin in self.ALL_BUTTONS)
+
+        # Initialize rotary encoder (discards movement from before startup)
         self.last_position = 0
+        self.seesaw.sync_encoder()
 
         # Initialize buttons with pull-up resistors
         self.buttons = {}
-        for pin in [self.BUTTON_UP, self.BUTTON_DOWN, self.BUTTON_LEFT, self.BUTTON_RIGHT]:
-            button = digitalio.DigitalIO(self.seesaw, pin)
-            button.direction = Direction.INPUT
-            button.pull = Pull.UP
-            self.buttons[pin] = button
+        if bulk_read:
+            self.seesaw.pin_mode_bulk(self.button_mask, self.seesaw.INPUT_PULLUP)
+        else:
+            for pin in self.ALL_BUTTONS:
+                button = digitalio.DigitalIO(self.seesaw, pin)
+                button.direction = Direction.INPUT
+                button.pull = Pull.UP
+                self.buttons[pin] = button
 
         # Button state tracking for debouncing
-        self.button_states = {pin: True for pin in self.buttons.keys()}  # True = not pressed (pull-up)
-        self.last_button_time = {pin: 0 for pin in self.buttons.keys()}
+        self.button_states = {pin: True for pin in self.ALL_BUTTONS}  # True = not pressed (pull-up)
+        self.last_button_time = {pin: 0 for pin in self.ALL_BUTTONS}
         self.debounce_time = 0.2  # 200ms debounce
+        self.press_started = {}   # preset pin -> press time, until released
 
-        # Volume settings
-        self.volume_step = volume_step
-        self.current_volume = self._get_system_volume()
+        # Interrupt mode
+        self.interrupt_pin = interrupt_pin
+        if interrupt_pin is not None:
+            self._enable_interrupts()
 
-        # Radio script path
-        self.radio_script = "/home/radioassistant/Desktop/Cogito/hardware-service/python/radio-control.py"
+        # Volume settings (mixer events keep current_volume in sync)
+        self.volume_step = volume_step
+        self.settings = get_settings()   # last volume survives reboots (coalesced writes)
+        self.mixer = VolumeMixer(on_change=self._on_external_volume)
+        self.current_volume = self.mixer.volume
+        state_bus.publish(volume=self.current_volume)
+        self.rotation = RotationProcessor(self.set_volume, lambda: self.current_volume,
+                                          step=volume_step)
+
+        # In-process tuner, opened on first use if the radio daemon is down
+        # (one caller at a time: scan and preset fallbacks run on different workers)
+        self.tuner = None
+        self.tuner_lock = threading.Lock()
+
+        # Bursts of scan presses are folded into a single tune
+        self.owns_tune_queue = tune_queue is None
+        self.tune_queue = tune_queue if tune_queue is not None else TuneCoalescer(self.radio_step)
 
         print(f"✓ ANO Encoder initialized at 0x{i2c_address:02X}")
         print(f"✓ Current volume: {self.current_volume}%")
 
-    def _get_system_volume(self):
-        """Get current system volume using amixer."""
+    def _enable_interrupts(self):
+        """Route button and encoder changes to the INT line."""
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setup(self.interrupt_pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+
+        self.seesaw.set_GPIO_interrupts(self.button_mask, True)
+        self.seesaw.enable_encoder_interrupt()
+
+        # Release INT if something fired before we were listening
+        self.seesaw.read_interrupt_flags()
+        print(f"✓ Interrupt mode on GPIO {self.interrupt_pin}")
+
+    def wait_for_event(self, timeout=SAFETY_POLL):
+        """
+        Block until the encoder asserts INT or the timeout expires.
+
+        Without an interrupt pin this just sleeps for the timeout.
+
+        Args:
+            timeout: Longest wait in seconds (the safety poll interval)
+
+        Returns:
+            True if INT is asserted, False on timeout
+        """
+        if self.interrupt_pin is None:
+            time.sleep(timeout)
+            return False
+
+        # INT is level-triggered: already low means an unread event
+        if GPIO.input(self.interrupt_pin) == GPIO.LOW:
+            return True
+        edge = GPIO.wait_for_edge(self.interrupt_pin, GPIO.FALLING,
+                                  timeout=max(1, int(timeout * 1000)))
+        return edge is not None
+
+    def close(self):
+        """Stop own workers, release the mixer, write pending settings, release the INT pin."""
+        if self.owns_tune_queue:
+            self.tune_queue.stop()
+        self.rotation.stop()
+        self.mixer.close()
+        with self.tuner_lock:
+            if self.tuner is not None:
+                self.tuner.close()
+                self.tuner = None
+        self.settings.flush()
+        if self.interrupt_pin is None:
+            return
         try:
-            result = subprocess.run(
-                ['amixer', 'get', 'Master'],
-                capture_output=True,
-                text=True,
-                timeout=1
-            )
-            # Parse output to get volume percentage
-            for line in result.stdout.split('\n'):
-                if 'Front Left:' in line or 'Mono:' in line:
-                    # Extract percentage from [XX%]
-                    import re
-                    match = re.search(r'\[(\d+)%\]', line)
-                    if match:
-                        return int(match.group(1))
-        except Exception as e:
-            print(f"Warning: Could not read system volume: {e}")
-        return 50  # Default
+            self.seesaw.set_GPIO_interrupts(self.button_mask, False)
+            self.seesaw.disable_encoder_interrupt()
+        except (OSError, RuntimeError):
+            pass
+        GPIO.cleanup(self.interrupt_pin)
+
+    def _on_external_volume(self, volume):
+        """Mixer event callback: volume was changed outside this encoder."""
+        self.current_volume = volume
+        state_bus.publish(volume=volume)
+        self.settings.update(volume=volume)
 
     def set_volume(self, volume):
         """
@@ -157,105 +430,164 @@ class ANOEncoder:
         Returns:
             Actual volume set (clamped to valid range)
         """
-        volume = max(0, min(100, volume))
-        try:
-            subprocess.run(
-                ['amixer', 'set', 'Master', f'{volume}%'],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                timeout=1
-            )
-            self.current_volume = volume
-        except Exception as e:
-            print(f"Error setting volume: {e}")
+        self.current_volume = self.mixer.set_volume(volume)
+        state_bus.publish(volume=self.current_volume)
+        self.settings.update(volume=self.current_volume)
         return self.current_volume
 
-    def scan_radio_up(self):
-        """Scan radio up by 0.1 MHz."""
+    def _with_tuner(self, action):
+        """Run action(tuner) on the in-process tuner, opening it on first use."""
+        with self.tuner_lock:
+            if self.tuner is None:
+                self.tuner = RadioTuner()
+            return action(self.tuner)
+
+    def radio_step(self, delta):
+        """
+        Move the tuner by delta channels now, via the radio daemon or in-process.
+
+        Args:
+            delta: Channel steps (positive = up)
+
+        Returns:
+            True if the tuner accepted the command
+        """
+        resp = send_command('step', delta=delta)
+        if resp is not None:
+            # The daemon may still apply it, so never retry in-process
+            if not resp.get('ok'):
+                print(f"Error stepping radio {delta:+d}: {resp.get('error')}")
+            return resp.get('ok', False)
+
+        def step(tuner):
+            # Another process may have tuned since our last command
+            tuner.frequency = tuner.load_state()
+            return tuner.step(delta)['ok']
+
         try:
-            subprocess.run(
-                ['python3', self.radio_script, 'up'],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                timeout=1
-            )
-            return True
-        except Exception as e:
-            print(f"Error scanning radio up: {e}")
+            return self._with_tuner(step)
+        except OSError as e:
+            print(f"Error stepping radio {delta:+d}: {e}")
             return False
 
-    def scan_radio_down(self):
-        """Scan radio down by 0.1 MHz."""
+    def _preset_command(self, cmd, slot):
+        """Run a preset command via the radio daemon or the in-process tuner."""
+        resp = send_command(cmd, slot=slot)
+        if resp is not None:
+            if not resp.get('ok'):
+                print(f"Error with preset {slot}: {resp.get('error')}")
+            return resp.get('ok', False)
+
+        def run(tuner):
+            if cmd == 'preset':
+                return tuner.recall_preset(slot)['ok']
+            # Save what is playing now, which another process may have tuned
+            tuner.frequency = tuner.load_state()
+            return tuner.save_preset(slot)['ok']
+
         try:
-            subprocess.run(
-                ['python3', self.radio_script, 'down'],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                timeout=1
-            )
-            return True
-        except Exception as e:
-            print(f"Error scanning radio down: {e}")
+            return self._with_tuner(run)
+        except OSError as e:
+            print(f"Error with preset {slot}: {e}")
             return False
 
+    def recall_preset(self, slot):
+        """Tune to a preset now (one I2C write). Returns True on success."""
+        return self._preset_command('preset', slot)
+
+    def save_preset(self, slot):
+        """Store the current station in a preset. Returns True on success."""
+        return self._preset_command('save_preset', slot)
+
+    def scan_radio_up(self):
+        """Queue a scan up by one channel (coalesced with other fast presses)."""
+        self.tune_queue.step(1)
+        return True
+
+    def scan_radio_down(self):
+        """Queue a scan down by one channel (coalesced with other fast presses)."""
+        self.tune_queue.step(-1)
+        return True
+
     def read_rotation(self):
         """
-        Read rotary encoder position with noise filtering.
+        Read the encoder delta with noise filtering.
+
+        Corrupt register reads are rejected by RelaxedSeesaw; deltas that
+        are valid on the wire but implausible as movement are filtered by
+        the rotation processor.
 
         Returns:
             Delta (change in position) or 0 if no change/noise detected
         """
-        current_position = self.encoder.position
-
-        # Check for garbage values (common I2C noise patterns)
-        if current_position in [16777215, 65535, -1, 0xFFFFFF, 0xFFFF]:
-            return 0
-
-        delta = current_position - self.last_position
-
-        # Filter out huge jumps (I2C noise)
-        if abs(delta) > self.MAX_ROTATION_DELTA:
-            print(f"⚠️  Noise filtered: delta={delta} (ignoring)")
-            # Reset to current position to avoid accumulation
-            self.last_position = current_position
+        delta = self.seesaw.read_encoder_delta()
+        if not self.rotation.plausible(delta):
             return 0
-
-        # Valid rotation detected
-        if delta != 0:
-            self.last_position = current_position
-
+        self.last_position += delta
         return delta
 
     def read_buttons(self):
         """
         Read all button states with debouncing.
 
+        Preset buttons report on release instead: 'short' or 'long'
+        depending on how long they were held.
+
         Returns:
-            Dict of {pin: pressed} where pressed is True if button was just pressed
+            Dict of {pin: event}: True if the button was just pressed,
+            'short'/'long' if a preset button was just released, else False
         """
         pressed = {}
         current_time = time.monotonic()
 
-        for pin, button in self.buttons.items():
-            current_state = button.value  # False = pressed (pull-up)
+        if self.bulk_read:
+            levels = self.seesaw.read_gpio_bulk(self.button_mask)
+            states = {pin: bool(levels & (1 << pin)) for pin in self.ALL_BUTTONS}
+        else:
+            states = {pin: button.value for pin, button in self.buttons.items()}
+
+        for pin, current_state in states.items():
+            # current_state False = pressed (pull-up)
             last_state = self.button_states[pin]
 
+            pressed[pin] = False
+
             # Button press detected (transition from True to False)
             if last_state and not current_state:
                 # Check debounce
                 if current_time - self.last_button_time[pin] > self.debounce_time:
-                    pressed[pin] = True
                     self.last_button_time[pin] = current_time
-                else:
-                    pressed[pin] = False
-            else:
-                pressed[pin] = False
+                    if pin in self.PRESET_BUTTONS:
+                        self.press_started[pin] = current_time
+                    else:
+                        pressed[pin] = True
+
+            # Preset button released (ignoring bounce right after the press)
+            elif not last_state and current_state and pin in self.press_started:
+                held = current_time - self.press_started[pin]
+                if held >= RELEASE_BOUNCE:
+                    del self.press_started[pin]
+                    pressed[pin] = 'long' if held >= LONG_PRESS else 'short'
 
             # Update state
             self.button_states[pin] = current_state
 
         return pressed
 
+    def poll(self):
+        """
+        Read rotation and buttons together.
+
+        In interrupt mode the GPIO flags are read (and cleared) first, so a
+        change during the reads re-asserts INT instead of being lost.
+
+        Returns:
+            (delta, button_events) as from read_rotation() and read_buttons()
+        """
+        if self.interrupt_pin is not None:
+            self.seesaw.read_interrupt_flags()
+        return self.read_rotation(), self.read_buttons()
+
     def handle_rotation(self, delta):
         """
         Handle rotation event (adjust volume).
@@ -263,6 +595,9 @@ class ANOEncoder:
         Args:
             delta: Change in encoder position (positive = clockwise)
 
+        The change is accelerated by spin speed and committed to the mixer
+        in batches, so the returned level may be applied a few ms later.
+
         Returns:
             New volume level
         """
@@ -270,14 +605,11 @@ class ANOEncoder:
             return self.current_volume
 
         # Clockwise = volume up, Counter-clockwise = volume down
-        volume_change = delta * self.volume_step
-        new_volume = self.current_volume + volume_change
-
-        return self.set_volume(new_volume)
+        return self.rotation.feed(delta)
 
     def handle_buttons(self, button_events):
         """
-        Handle button press events (scan radio stations).
+        Handle button press events (scan radio stations, recall/save presets).
 
         Args:
             button_events: Dict of {pin: pressed} from read_buttons()
@@ -285,16 +617,28 @@ class ANOEncoder:
         Returns:
             Action taken as string, or None
         """
-        # Up or Right button = scan up
-        if button_events.get(self.BUTTON_UP) or button_events.get(self.BUTTON_RIGHT):
+        if button_events.get(self.BUTTON_UP):
             self.scan_radio_up()
             return "scan_up"
 
-        # Down or Left button = scan down
-        if button_events.get(self.BUTTON_DOWN) or button_events.get(self.BUTTON_LEFT):
+        if button_events.get(self.BUTTON_DOWN):
             self.scan_radio_down()
             return "scan_down"
 
+        # Left/Right = presets: short press recalls, long press saves
+        for pin, slot in self.PRESET_BUTTONS.items():
+            event = button_events.get(pin)
+            if event == 'long':
+                self.save_preset(slot)
+                return "preset_save"
+            if event == 'short':
+                self.recall_preset(slot)
+                return "preset"
+
+        # Center button has no radio action of its own; callers decide
+        if button_events.get(self.BUTTON_SELECT):
+            return "select"
+
         return None
 
 
@@ -306,7 +650,8 @@ def main():
     print("🎛️  ANO Encoder - Volume & Radio Control")
     print("="*60)
     print("ROTATE:  Adjust volume (clockwise = up, counter-clockwise = down)")
-    print("BUTTONS: Up/Right = scan up, Down/Left = scan down")
+    print("BUTTONS: Up = scan up, Down = scan down, Center = select")
+    print(f"PRESETS: Left = 1, Right = 2 (press = tune, hold {LONG_PRESS}s = save)")
     print("="*60)
     print()
 
@@ -323,29 +668,44 @@ def main():
 
     print(f"Initial Volume: {encoder.current_volume}%\n")
 
+    scheduler = PollScheduler()
+
     try:
         while True:
+            delta, button_events = encoder.poll()
+
             # Check rotation
-            delta = encoder.read_rotation()
             if delta != 0:
                 new_volume = encoder.handle_rotation(delta)
                 direction = "UP" if delta > 0 else "DOWN"
                 print(f"🔊 Volume {direction}: {new_volume}%")
 
             # Check buttons
-            button_events = encoder.read_buttons()
             action = encoder.handle_buttons(button_events)
             if action == "scan_up":
                 print("📻 Scanning UP ▲")
             elif action == "scan_down":
                 print("📻 Scanning DOWN ▼")
-
-            # Small delay to avoid CPU spinning
-            time.sleep(0.01)
+            elif action == "preset":
+                print("📻 Preset recalled")
+            elif action == "preset_save":
+                print("💾 Preset saved")
+            elif action == "select":
+                print("🔘 Select")
+
+            # Poll fast while in use, back off when idle
+            if delta != 0 or action is not None:
+                scheduler.activity()
+            scheduler.wait()
 
     except KeyboardInterrupt:
+        encoder.close()
         print("\n\n🛑 Encoder control stopped")
         print(f"Final Volume: {encoder.current_volume}%")
+        print(f"Tunes: {encoder.tune_queue.stats()}")
+        print(f"Rotation: {encoder.rotation.stats()}")
+        print(f"I2C reads: {encoder.seesaw.read_stats}")
+        print(f"Poll loop: {scheduler.report()}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Client for the Hardware Services
+
+Module-level requests.get/post open a new TCP connection per event, and
+while the backend is down every event waits out the full timeout before
+falling back. BackendClient sends through one pooled keep-alive Session per
+process (shared by every base URL, see get_session()) with tight
+connect/read timeouts, plus:
+
+- Circuit breaker: after FAILURE_THRESHOLD consecutive failures (connection
+  error, timeout or 5xx) the circuit opens and calls raise CircuitOpenError
+  immediately, so callers go straight to their local fallback. A background
+  thread probes the health endpoint every PROBE_INTERVAL and closes the
+  circuit once it answers.
+- Latency histograms per endpoint (see stats()).
+
+CircuitOpenError subclasses requests' ConnectionError, so existing
+`except requests.exceptions.RequestException` handlers keep working.
+
+Usage:
+    client = get_client("http://localhost:3001")
+    resp = client.post("/api/mode/set", json={'mode': 'ai'})
+"""
+
+import logging
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+CONNECT_TIMEOUT = 0.25    # seconds; the backends are on localhost
+READ_TIMEOUT = 1.0        # seconds, default per request
+POOL_SIZE = 4             # keep-alive connections per host
+POOL_HOSTS = 4            # hosts with their own connection pool
+FAILURE_THRESHOLD = 3     # consecutive failures that open the circuit
+PROBE_INTERVAL = 2.0      # seconds between health probes while open
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+logger = logging.getLogger('backend-client')
+
+_clients = {}
+_clients_lock = threading.Lock()
+_session = None
+_session_lock = threading.Lock()
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of making a request while the backend is unhealthy."""
+
+
+class BackendClient:
+    """
+    Pooled HTTP session with a circuit breaker and latency histograms.
+    """
+
+    def __init__(self, base_url, health_url=None, connect_timeout=CONNECT_TIMEOUT,
+                 read_timeout=READ_TIMEOUT, failure_threshold=FAILURE_THRESHOLD,
+                 probe_interval=PROBE_INTERVAL, session=None):
+        """
+        Initialize the client.
+
+        Args:
+            base_url: Prefix for relative paths (e.g. "http://localhost:4000/api")
+            health_url: Probed while the circuit is open (default <host>/health)
+            connect_timeout: TCP connect timeout (seconds)
+            read_timeout: Default response timeout (seconds)
+            failure_threshold: Consecutive failures that open the circuit
+            probe_interval: Seconds between recovery probes
+            session: requests.Session to send through (default get_session())
+        """
+        self.base_url = base_url.rstrip('/')
+        if health_url is None:
+            parts = urlsplit(self.base_url)
+            health_url = f"{parts.scheme}://{parts.netloc}/health"
+        self.health_url = health_url
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+
+        self.session = session if session is not None else get_session()
+
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open = False
+        self._probe_thread = None
+        self._closed = threading.Event()
+
+        # Counters
+        self.short_circuited = 0
+        self.latency = {}   # endpoint -> {'count', 'errors', 'buckets'}
+
+    @property
+    def healthy(self):
+        """False while the circuit is open."""
+        return not self._open
+
+    def get(self, path, **kwargs):
+        """GET a path (relative to base_url) or absolute URL."""
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path, json=None, **kwargs):
+        """POST JSON to a path (relative to base_url) or absolute URL."""
+        return self.request('POST', path, json=json, **kwargs)
+
+    def request(self, method, path, timeout=None, **kwargs):
+        """
+        Make a request through the circuit breaker.
+
+        Args:
+            method: HTTP method
+            path: Path relative to base_url, or an absolute URL
+            timeout: Read timeout in seconds (default read_timeout)
+            **kwargs: Passed to requests.Session.request
+
+        Returns:
+            requests.Response (any status)
+
+        Raises:
+            CircuitOpenError: Backend is marked unhealthy; no request was made
+            requests.exceptions.RequestException: Request failed
+        """
+        if self._open:
+            with self._lock:
+                self.short_circuited += 1
+            raise CircuitOpenError(f"Backend circuit open: {path}")
+
+        url = path if path.startswith('http') else f"{self.base_url}{path}"
+        started = time.monotonic()
+        try:
+            response = self.session.request(
+                method, url,
+                timeout=(self.connect_timeout, timeout or self.read_timeout),
+                **kwargs
+            )
+        except requests.exceptions.RequestException:
+            self._record(path, started, ok=False)
+            raise
+
+        self._record(path, started, ok=response.status_code < 500)
+        return response
+
+    def _record(self, path, started, ok):
+        """Update the latency histogram and the circuit state."""
+        elapsed_ms = (time.monotonic() - started) * 1000
+        with self._lock:
+            entry = self.latency.setdefault(path, {
+                'count': 0, 'errors': 0,
+                'buckets': [0] * (len(LATENCY_BUCKETS_MS) + 1),
+            })
+            entry['count'] += 1
+            index = next((i for i, limit in enumerate(LATENCY_BUCKETS_MS) if elapsed_ms <= limit),
+                         len(LATENCY_BUCKETS_MS))
+            entry['buckets'][index] += 1
+
+            if ok:
+                self._failures = 0
+                return
+            entry['errors'] += 1
+            self._failures += 1
+            if self._failures < self.failure_threshold or self._open:
+                return
+            self._open = True
+
+        logger.warning(f"⚠️  {self.base_url} unhealthy after {self._failures} failures, "
+                       f"failing fast until it recovers")
+        self._probe_thread = threading.Thread(target=self._probe, name='backend-probe', daemon=True)
+        self._probe_thread.start()
+
+    def _probe(self):
+        """Poll the health endpoint until it answers, then close the circuit."""
+        while not self._closed.wait(self.probe_interval):
+            try:
+                response = self.session.get(self.health_url,
+                                            timeout=(self.connect_timeout, self.read_timeout))
+            except requests.exceptions.RequestException:
+                continue
+            if response.ok:
+                with self._lock:
+                    self._open = False
+                    self._failures = 0
+                logger.info(f"✓ {self.base_url} recovered")
+                return
+
+    def stats(self):
+        """
+        Circuit state and per-endpoint latency histograms.
+
+        Returns:
+            Dict with 'healthy', 'short_circuited' and 'endpoints'
+            ({path: {'count', 'errors', 'buckets': {'<=5ms': n, ..., '>2500ms': n}}})
+        """
+        labels = [f"<={limit}ms" for limit in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        with self._lock:
+            return {
+                'healthy': not self._open,
+                'short_circuited': self.short_circuited,
+                'endpoints': {
+                    path: {
+                        'count': entry['count'],
+                        'errors': entry['errors'],
+                        'buckets': dict(zip(labels, entry['buckets'])),
+                    }
+                    for path, entry in self.latency.items()
+                },
+            }
+
+    def close(self):
+        """Stop the recovery probe (the shared session stays open)."""
+        self._closed.set()
+
+
+def get_session():
+    """
+    Shared keep-alive Session for the process, created on first use.
+
+    Returns:
+        requests.Session with a pool of POOL_SIZE connections per host
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_SIZE,
+                                  max_retries=0)
+            _session.mount('http://', adapter)
+            _session.mount('https://', adapter)
+        return _session
+
+
+def get_client(base_url, **kwargs):
+    """
+    Shared BackendClient for a base URL (one per process).
+
+    Args:
+        base_url: Backend base URL
+        **kwargs: BackendClient options, used only when the client is created
+
+    Returns:
+        BackendClient
+    """
+    with _clients_lock:
+        client = _clients.get(base_url)
+        if client is None:
+            client = _clients[base_url] = BackendClient(base_url, **kwargs)
+        return client
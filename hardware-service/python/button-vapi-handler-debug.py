@@ -6,6 +6,7 @@ With extensive logging for troubleshooting
 
 import RPi.GPIO as GPIO
 import requests
+from backend_client import get_client
 import time
 import threading
 import sys
@@ -15,6 +16,7 @@ from datetime import datetime
 # Configuration
 BUTTON_PIN = 17  # GPIO 17 (BCM numbering)
 HARDWARE_SERVICE_URL = "http://localhost:3001"
+hardware_service = get_client(HARDWARE_SERVICE_URL)  # Pooled keep-alive session
 DEBOUNCE_TIME = 0.3  # seconds
 AI_TIMEOUT = 10  # seconds
 ACTIVITY_CHECK_INTERVAL = 1.0  # seconds
@@ -49,8 +51,8 @@ def check_speech_activity():
     while not stop_activity_check.is_set():
         if current_mode == 'ai':
             try:
-                resp = requests.get(
-                    f"{HARDWARE_SERVICE_URL}/api/ai/activity",
+                resp = hardware_service.get(
+                    "/api/ai/activity",
                     timeout=1.5
                 )
                 data = resp.json()
@@ -84,8 +86,8 @@ def set_mode(mode):
     log(f"🔄 Attempting to switch mode: {current_mode} → {mode}", "INFO")
 
     try:
-        resp = requests.post(
-            f"{HARDWARE_SERVICE_URL}/api/mode/set",
+        resp = hardware_service.post(
+            "/api/mode/set",
             json={'mode': mode},
             timeout=2
         )
@@ -155,7 +157,7 @@ def test_hardware_service():
     log("🧪 Testing hardware service connection...", "INFO")
 
     try:
-        resp = requests.get(f"{HARDWARE_SERVICE_URL}/health", timeout=2)
+        resp = hardware_service.get("/health", timeout=2)
         if resp.ok:
             log(f"✅ Hardware service is running: {resp.json()}", "SUCCESS")
             return True
@@ -1,123 +1,277 @@
 #!/usr/bin/env python3
 """
 Cogito Button Handler for Vapi Integration
-- Press button: Toggle Radio <-> AI Mode
+- Press button: Toggle Radio <-> AI Mode (kernel edge detection, no polling)
 - AI Mode: Frontend (Chromium) handles Vapi conversation
-- Auto-return to radio after 60s of silence
+- Auto-return to radio after 60s of silence (local deadline re-armed by
+  speech-activity events; no polling while the push channel is up)
+- Mode changes travel over a persistent push channel to hardware-service.js
+  (HTTP only while it is down); mode changes made in the UI come back on it
+- Presses switch the local mode immediately; the server confirms in the
+  background and a failed switch is rolled back (see mode_state.py)
+- Local feedback on every switch before the server round trip: a short tone
+  (feedback.py) and an optional mode LED (COGITO_MODE_LED_PIN, lit in AI mode)
+- start()/stop() let hardware_daemon.py host it as a plugin
 """
 
 import RPi.GPIO as GPIO
 import requests
+import os
+from backend_client import get_client
 import time
 import threading
 import sys
 import signal
+from push_channel import PushChannel
+from mode_state import ModeStateMachine
+from settings_store import get_settings
+from feedback import play_tone, prepare_tones
+import state_bus
 
 # Configuration
 BUTTON_PIN = 17  # GPIO 17 (BCM numbering)
+MODE_LED_PIN = int(os.environ.get("COGITO_MODE_LED_PIN", "0")) or None  # BCM, lit in AI mode (optional)
 HARDWARE_SERVICE_URL = "http://localhost:3001"
-DEBOUNCE_TIME = 0.3  # seconds
+hardware_service = get_client(HARDWARE_SERVICE_URL)  # Pooled keep-alive session
+DEBOUNCE_TIME = 0.3  # seconds (kernel-side bouncetime)
 AI_TIMEOUT = 60  # seconds - increased to allow Vapi connection time
-ACTIVITY_CHECK_INTERVAL = 1.0  # seconds
+ACTIVITY_CHECK_INTERVAL = 1.0  # seconds, HTTP fallback while the push channel is down
 
 # State
-current_mode = 'radio'
 stop_activity_check = threading.Event()
+activity_changed = threading.Event()  # Wakes the inactivity timer
+activity_resync = threading.Event()  # Ask the timer to fetch /api/ai/activity once
+ai_deadline = None  # time.monotonic() at which AI mode times out (None = not armed)
+activity_thread = None
+push = None  # PushChannel, set by start()
+owns_push = False  # False when shared with other hardware_daemon.py plugins
+modes = None  # ModeStateMachine, set by start()
 
-# Setup GPIO
-GPIO.setmode(GPIO.BCM)
-GPIO.setup(BUTTON_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+def arm_inactivity_timer(seconds_since_speech=0.0):
+    """(Re)start the AI-mode silence deadline"""
+    global ai_deadline
+    ai_deadline = time.monotonic() + AI_TIMEOUT - seconds_since_speech
+    activity_changed.set()
+
+def disarm_inactivity_timer():
+    """Stop the AI-mode silence deadline (radio mode, or Vapi not connected yet)"""
+    global ai_deadline
+    ai_deadline = None
+    activity_changed.set()
+
+def poll_speech_activity():
+    """HTTP fallback while the push channel is down: re-arm from the server's view"""
+    try:
+        resp = hardware_service.get(
+            "/api/ai/activity",
+            timeout=1.5
+        )
+        data = resp.json()
+    except (requests.exceptions.RequestException, ValueError):
+        return  # Silently ignore connection errors
+
+    # Only start timeout AFTER Vapi has connected
+    if data.get('vapi_connected', False):
+        arm_inactivity_timer(data.get('seconds_since_speech', 0))
+    else:
+        disarm_inactivity_timer()
 
 def check_speech_activity():
-    """Background thread to check for speech activity and auto-timeout"""
-    global current_mode
+    """
+    Background thread that returns to radio after AI_TIMEOUT of silence.
 
+    The deadline is re-armed by speech-activity / vapi-connected events on
+    the push channel, so this thread sleeps until the deadline (or the next
+    event) and makes no requests. Only while the channel is down does it
+    fall back to polling /api/ai/activity.
+    """
     while not stop_activity_check.is_set():
-        if current_mode == 'ai':
-            try:
-                resp = requests.get(
-                    f"{HARDWARE_SERVICE_URL}/api/ai/activity",
-                    timeout=1.5
-                )
-                data = resp.json()
-                
-                # Only start timeout AFTER Vapi has connected
-                vapi_connected = data.get('vapi_connected', False)
-                seconds_since = data.get('seconds_since_speech', AI_TIMEOUT + 1)
-
-                if not vapi_connected:
-                    # Vapi hasn't connected yet - wait patiently
-                    # Don't start the timeout timer until connection is established
-                    # This prevents premature timeout while Vapi is still connecting
-                    pass
-                elif seconds_since >= AI_TIMEOUT:
-                    # Vapi is connected AND we've had silence for AI_TIMEOUT seconds
-                    print(f"\n⏱️  Timeout ({AI_TIMEOUT}s) reached, returning to RADIO mode")
-                    set_mode('radio')
-                # If vapi_connected is True but seconds_since < AI_TIMEOUT, continue waiting
-
-            except requests.exceptions.RequestException:
-                pass  # Silently ignore connection errors
-
-        time.sleep(ACTIVITY_CHECK_INTERVAL)
+        activity_changed.clear()
 
-def set_mode(mode):
-    """Set the current mode (radio or ai)"""
-    global current_mode
+        if modes.mode == 'ai' and (not push.connected or activity_resync.is_set()):
+            activity_resync.clear()
+            poll_speech_activity()
+            activity_changed.clear()
+
+        deadline = ai_deadline
+        timeout = None if deadline is None else deadline - time.monotonic()
+        if timeout is not None and timeout <= 0:
+            disarm_inactivity_timer()
+            if modes.mode == 'ai':
+                # Vapi is connected AND we've had silence for AI_TIMEOUT seconds
+                print(f"\n⏱️  Timeout ({AI_TIMEOUT}s) reached, returning to RADIO mode")
+                set_mode('radio')
+            continue
+
+        if modes.mode == 'ai' and not push.connected:
+            timeout = ACTIVITY_CHECK_INTERVAL if timeout is None else min(timeout, ACTIVITY_CHECK_INTERVAL)
+        activity_changed.wait(timeout)
+
+def show_mode(mode, reason):
+    """
+    Feedback for a mode change (runs under the mode lock, so local work only)
+
+    Args:
+        mode: New mode
+        reason: 'local' (button press), 'remote' (changed elsewhere) or
+                'rollback' (the server did not accept a local change)
+    """
+    # Tell the user first: the server only confirms later
+    if MODE_LED_PIN is not None:
+        GPIO.output(MODE_LED_PIN, GPIO.HIGH if mode == 'ai' else GPIO.LOW)
+    play_tone('rollback' if reason == 'rollback' else mode)
+
+    # The timer starts on vapi-connected, not on entering AI mode
+    disarm_inactivity_timer()
+    state_bus.publish(mode=mode)
+    get_settings().update(mode=mode)
+
+    if reason == 'rollback':
+        print(f"\n↩️  Mode change not confirmed, back to {mode.upper()} mode")
 
-    if mode == current_mode:
-        return
+    if mode == 'ai':
+        print("\n" + "="*50)
+        print("🎤 AI MODE")
+        print("="*50)
+        print("  Radio muted")
+        print("  Vapi conversation started in Chromium")
+        print(f"  Auto-return after {AI_TIMEOUT}s of silence")
+        print("="*50)
+
+    else:
+        print("\n" + "="*50)
+        print("📻 RADIO MODE")
+        print("="*50)
+        print("  Radio resumed")
+        print("  Vapi conversation stopped")
+        print("  Press button to talk to AI")
+        print("="*50)
+
+def on_push_event(name, data):
+    """Events broadcast by hardware-service (push channel thread)"""
+    if name == 'mode-changed' and data:
+        mode = data.get('mode')
+        if not modes.confirm(mode) and mode == 'ai' and modes.mode == 'ai':
+            # Initial state after a (re)connect: events may have been missed
+            activity_resync.set()
+            activity_changed.set()
+    elif name in ('vapi-connected', 'speech-activity') and modes.mode == 'ai':
+        arm_inactivity_timer()
+
+def commit_mode(mode):
+    """
+    Send a mode change to hardware-service (mode-state worker thread)
+
+    Returns:
+        True/False for an HTTP answer, None when sent over the push channel
+        (confirmed by the 'mode-changed' broadcast that comes back)
+    """
+    if push.connected:
+        push.send('mode', mode=mode)
+        return None
 
     try:
-        resp = requests.post(
-            f"{HARDWARE_SERVICE_URL}/api/mode/set",
+        resp = hardware_service.post(
+            "/api/mode/set",
             json={'mode': mode},
             timeout=2
         )
-
-        if resp.ok:
-            current_mode = mode
-
-            if mode == 'ai':
-                print("\n" + "="*50)
-                print("🎤 AI MODE")
-                print("="*50)
-                print("  Radio muted")
-                print("  Vapi conversation started in Chromium")
-                print(f"  Auto-return after {AI_TIMEOUT}s of silence")
-                print("="*50)
-
-            else:
-                print("\n" + "="*50)
-                print("📻 RADIO MODE")
-                print("="*50)
-                print("  Radio resumed")
-                print("  Vapi conversation stopped")
-                print("  Press button to talk to AI")
-                print("="*50)
-        else:
-            print(f"\n❌ Mode change failed: {resp.text}")
-
     except requests.exceptions.RequestException as e:
         print(f"\n❌ Error connecting to hardware-service: {e}")
         print("  Is hardware-service.js running on port 3001?")
+        return False
+
+    if not resp.ok:
+        print(f"\n❌ Mode change failed: {resp.text}")
+        return False
+    return True
+
+def current_server_mode():
+    """Mode hardware-service is in now ('radio' if it cannot be reached)"""
+    try:
+        resp = hardware_service.get("/api/mode/current", timeout=1)
+        return resp.json().get('mode', 'radio')
+    except (requests.exceptions.RequestException, ValueError):
+        return 'radio'
+
+def set_mode(mode):
+    """Set the current mode (radio or ai); returns without waiting for the server"""
+    modes.request(mode)
 
 def toggle_mode():
     """Toggle between radio and AI mode"""
-    new_mode = 'ai' if current_mode == 'radio' else 'radio'
-    set_mode(new_mode)
+    modes.toggle()
 
-def cleanup(signum=None, frame=None):
-    """Cleanup on exit"""
-    print("\n\n🧹 Cleaning up...")
+def on_button_press(channel):
+    """Falling-edge callback (RPi.GPIO event thread)"""
+    print(f"\n🔘 Button pressed! (GPIO {channel})")
+    toggle_mode()
+
+def start(shared_push=None):
+    """
+    Set up the button, mode state, push channel and inactivity timer
+    (returns immediately; also the hardware_daemon.py plugin entry point)
+
+    Args:
+        shared_push: PushChannel to share (default: open our own)
+    """
+    global activity_thread, push, owns_push, modes
+
+    GPIO.setmode(GPIO.BCM)
+    GPIO.setup(BUTTON_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+    prepare_tones()
+
+    # Start from the server's mode: after a restart it may already be AI
+    modes = ModeStateMachine(commit=commit_mode, on_change=show_mode,
+                             initial=current_server_mode())
+    state_bus.publish(mode=modes.mode)
+    if MODE_LED_PIN is not None:
+        GPIO.setup(MODE_LED_PIN, GPIO.OUT,
+                   initial=GPIO.HIGH if modes.mode == 'ai' else GPIO.LOW)
+
+    owns_push = shared_push is None
+    if owns_push:
+        push = PushChannel(HARDWARE_SERVICE_URL, on_event=on_push_event)
+    else:
+        push = shared_push
+        push.subscribe(on_push_event)
+
+    # Start activity monitoring thread (fetches the activity state once)
+    stop_activity_check.clear()
+    activity_resync.set()
+    activity_thread = threading.Thread(target=check_speech_activity, daemon=True)
+    activity_thread.start()
+
+    # Button press = HIGH -> LOW with pull-up resistor; debounced by the kernel
+    GPIO.add_event_detect(BUTTON_PIN, GPIO.FALLING, callback=on_button_press,
+                          bouncetime=int(DEBOUNCE_TIME * 1000))
+
+def stop():
+    """Return to radio mode, stop the timer and release the button pin"""
+    GPIO.remove_event_detect(BUTTON_PIN)
 
     # Return to radio mode before exiting
-    if current_mode == 'ai':
+    if modes.mode == 'ai':
         print("  Returning to radio mode...")
         set_mode('radio')
+    modes.stop()  # Waits for the pending mode change to be sent
+    get_settings().flush()
 
     stop_activity_check.set()
-    GPIO.cleanup()
+    activity_changed.set()
+    activity_thread.join(timeout=2)
+    if owns_push:
+        push.close()  # Flushes the mode change above
+    else:
+        push.unsubscribe(on_push_event)
+    GPIO.cleanup(BUTTON_PIN)
+    if MODE_LED_PIN is not None:
+        GPIO.cleanup(MODE_LED_PIN)
+
+def cleanup(signum=None, frame=None):
+    """Cleanup on exit"""
+    print("\n\n🧹 Cleaning up...")
+    stop()
     print("✅ Cleanup complete")
     sys.exit(0)
 
@@ -126,6 +280,7 @@ def main():
     print("COGITO BUTTON HANDLER - Vapi Integration")
     print("=" * 60)
     print(f"Button Pin:     GPIO {BUTTON_PIN} (BCM)")
+    print(f"Mode LED:       {f'GPIO {MODE_LED_PIN} (BCM)' if MODE_LED_PIN else 'none'}")
     print(f"Service URL:    {HARDWARE_SERVICE_URL}")
     print(f"AI Timeout:     {AI_TIMEOUT}s")
     print("=" * 60)
@@ -134,7 +289,7 @@ def main():
 
     # Test connection to hardware service
     try:
-        resp = requests.get(f"{HARDWARE_SERVICE_URL}/health", timeout=2)
+        resp = hardware_service.get("/health", timeout=2)
         if resp.ok:
             print(f"✅ Connected to hardware service: {resp.json()}")
         else:
@@ -148,32 +303,13 @@ def main():
     signal.signal(signal.SIGINT, cleanup)
     signal.signal(signal.SIGTERM, cleanup)
 
-    # Start activity monitoring thread
-    activity_thread = threading.Thread(target=check_speech_activity, daemon=True)
-    activity_thread.start()
-
-    last_state = GPIO.HIGH
-    last_press_time = 0.0
+    start()
 
     print("\n👂 Listening for button press...\n")
 
-    try:
-        while True:
-            state = GPIO.input(BUTTON_PIN)
-            now = time.time()
-
-            # Detect button press (HIGH -> LOW with pull-up resistor)
-            if state == GPIO.LOW and last_state == GPIO.HIGH:
-                if now - last_press_time > DEBOUNCE_TIME:
-                    print(f"\n🔘 Button pressed! (GPIO {BUTTON_PIN})")
-                    toggle_mode()
-                    last_press_time = now
-
-            last_state = state
-            time.sleep(0.01)  # 10ms polling
-
-    except KeyboardInterrupt:
-        cleanup()
+    # Nothing to do here: presses arrive as callbacks, exit via cleanup()
+    while True:
+        signal.pause()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Pre-Reboot Checkpoint
+
+Before an emergency reboot, every hardware service is asked to checkpoint at
+the same time, and all acks share one hard deadline:
+
+    radio   - radio daemon 'checkpoint' command: fsyncs the station index and
+              reports frequency / mute state
+    mode    - hardware-service.js POST /api/checkpoint: reports radio/AI mode
+    volume  - ALSA mixer level, plus `alsactl store` so ALSA restores it too
+
+The replies are merged into one snapshot that is written with fsync (temp
+file, fsync, rename, fsync the directory), so a reboot right afterwards can
+neither lose it nor leave it half-written on the SD card. Services that miss
+the deadline are listed under 'missing' and do not delay the reboot; the
+last values they published on the state bus (state_bus.py) are saved under
+'bus' and used instead at restore.
+
+At boot, start-radio.sh runs `checkpoint.py restore`, which prints the saved
+station and volume as shell assignments and removes the snapshot (it is
+one-shot; normal boots use the station index).
+
+Usage:
+    snapshot = take_checkpoint()        # before rebooting
+    python3 checkpoint.py restore       # at boot
+"""
+
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+
+from backend_client import get_session
+from radio_daemon import send_command
+import state_bus
+import state_files
+
+
+SNAPSHOT_FILE = os.environ.get(
+    "COGITO_SNAPSHOT",
+    os.path.expanduser("~/.cogito/snapshot.json")
+)
+CHECKPOINT_DEADLINE = 2.0   # seconds for all services to ack
+HARDWARE_SERVICE_URL = "http://localhost:3001"
+
+logger = logging.getLogger('checkpoint')
+
+
+def checkpoint_radio():
+    """Radio daemon: persist the station index and report the tuner state."""
+    response = send_command('checkpoint', timeout=CHECKPOINT_DEADLINE)
+    if not response or not response.get('ok'):
+        raise RuntimeError(response.get('error') if response else "radio daemon not running")
+    return {'frequency': response['frequency'], 'muted': response['muted']}
+
+
+def checkpoint_mode():
+    """hardware-service.js: report the current mode."""
+    response = get_session().post(f"{HARDWARE_SERVICE_URL}/api/checkpoint",
+                                  timeout=(0.25, CHECKPOINT_DEADLINE))
+    response.raise_for_status()
+    return response.json()['mode']
+
+
+def checkpoint_volume():
+    """ALSA: store mixer levels for alsa-restore and report the volume."""
+    from volume_mixer import VolumeMixer
+    mixer = VolumeMixer()
+    try:
+        volume = mixer.get_volume()
+    finally:
+        mixer.close()
+    subprocess.run(['sudo', '-n', 'alsactl', 'store'], stdout=subprocess.DEVNULL,
+                   stderr=subprocess.DEVNULL, timeout=CHECKPOINT_DEADLINE)
+    return volume
+
+
+CHECKPOINT_HOOKS = {
+    'radio': checkpoint_radio,
+    'mode': checkpoint_mode,
+    'volume': checkpoint_volume,
+}
+
+
+def write_snapshot(snapshot, path=SNAPSHOT_FILE):
+    """
+    Write the snapshot durably (temp file + fsync + rename + directory fsync).
+
+    Args:
+        snapshot: JSON-serializable dict
+        path: Destination file
+    """
+    state_files.write_json(path, snapshot, sync_dir=True)
+
+
+def take_checkpoint(hooks=CHECKPOINT_HOOKS, deadline=CHECKPOINT_DEADLINE, path=SNAPSHOT_FILE):
+    """
+    Ask every service to checkpoint in parallel and fsync one snapshot.
+
+    Args:
+        hooks: Dict of name -> callable returning that service's state
+        deadline: Seconds for all hooks together; late ones are left behind
+        path: Snapshot file
+
+    Returns:
+        The snapshot dict ({name: state, ..., 'saved_at', 'missing', 'elapsed'})
+    """
+    started = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=len(hooks), thread_name_prefix='checkpoint')
+    futures = {executor.submit(hook): name for name, hook in hooks.items()}
+    done, _ = wait(futures, timeout=deadline)
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    snapshot = {'saved_at': time.time(), 'missing': []}
+    for future, name in futures.items():
+        if future not in done:
+            logger.warning(f"⚠️  {name}: no checkpoint ack within {deadline}s")
+            snapshot['missing'].append(name)
+            continue
+        try:
+            snapshot[name] = future.result()
+        except (OSError, RuntimeError, ValueError, KeyError,
+                requests.exceptions.RequestException, subprocess.SubprocessError) as e:
+            logger.warning(f"⚠️  {name}: checkpoint failed: {e}")
+            snapshot['missing'].append(name)
+
+    bus = state_bus.get_bus()
+    if bus is not None:
+        snapshot['bus'] = bus.read()._asdict()
+
+    snapshot['elapsed'] = round(time.monotonic() - started, 3)
+    try:
+        write_snapshot(snapshot, path)
+    except OSError as e:
+        logger.error(f"❌ Could not write snapshot {path}: {e}")
+    else:
+        logger.info(f"💾 Snapshot saved in {snapshot['elapsed']:.2f}s "
+                    f"({len(hooks) - len(snapshot['missing'])}/{len(hooks)} services)")
+    return snapshot
+
+
+def read_snapshot(path=SNAPSHOT_FILE):
+    """
+    Load the snapshot.
+
+    Returns:
+        Snapshot dict, or None if there is none (or it is unreadable)
+    """
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def restore_lines(snapshot):
+    """
+    Shell assignments for start-radio.sh (numbers only, so eval is safe).
+
+    Args:
+        snapshot: Snapshot dict
+
+    Returns:
+        List of 'SNAPSHOT_FREQUENCY=99.1' / 'SNAPSHOT_VOLUME=40' lines
+    """
+    radio = snapshot.get('radio') or {}
+    bus = snapshot.get('bus') or {}
+    volume = snapshot.get('volume')
+    return state_files.restore_lines(
+        'SNAPSHOT',
+        frequency=radio.get('frequency') or bus.get('frequency'),
+        volume=volume if volume is not None else bus.get('volume'),
+    )
+
+
+def main():
+    """
+    CLI: `restore` prints the saved values and removes the snapshot;
+    `show` prints the snapshot; `take` checkpoints now.
+    """
+    command = sys.argv[1] if len(sys.argv) > 1 else 'show'
+    if command == 'take':
+        logging.basicConfig(level=logging.INFO, format='%(message)s')
+        print(json.dumps(take_checkpoint(), indent=2))
+    elif command == 'show':
+        print(json.dumps(read_snapshot(), indent=2))
+    elif command == 'restore':
+        snapshot = read_snapshot()
+        if snapshot is None:
+            return
+        print("\n".join(restore_lines(snapshot)))
+        try:
+            os.remove(SNAPSHOT_FILE)
+        except OSError:
+            pass
+    else:
+        print(f"Usage: {sys.argv[0]} [take|show|restore]", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Bounded Dispatch Queue
+
+Keeps hardware polling decoupled from backend I/O. The polling loop submits
+jobs (e.g. "scan +3 channels") and returns immediately; a small pool of
+worker threads runs them. While a job waits in the queue:
+
+- A job is coalesced into the last queued job with the same key and the
+  same function: the new arguments replace the queued ones (latest wins) or
+  are combined by a merge function (e.g. summing scan steps), so a slow
+  backend sees one request instead of a backlog. Jobs submitted with
+  coalesce=False (e.g. saves) are never merged, in either direction.
+- Keyed jobs never run concurrently and run in submission order.
+- The queue is bounded; when full the oldest queued job is dropped.
+
+Usage:
+    dispatch = DispatchQueue(workers=2)
+    dispatch.submit(send_scan, +1, key='scan', merge=lambda old, new: (old[0] + new[0],))
+    ...
+    dispatch.stop()
+"""
+
+import collections
+import logging
+import threading
+
+
+MAX_QUEUED = 16   # jobs waiting to run
+WORKERS = 2
+
+logger = logging.getLogger('dispatch-queue')
+
+
+class _Job:
+    __slots__ = ('fn', 'args', 'key', 'merge', 'coalesce')
+
+    def __init__(self, fn, args, key, merge, coalesce):
+        self.fn = fn
+        self.args = args
+        self.key = key
+        self.merge = merge
+        self.coalesce = coalesce
+
+
+class DispatchQueue:
+    """
+    Non-blocking job queue drained by a worker pool.
+    """
+
+    def __init__(self, workers=WORKERS, maxsize=MAX_QUEUED, name='dispatch'):
+        """
+        Initialize and start the workers.
+
+        Args:
+            workers: Number of worker threads
+            maxsize: Most jobs allowed to wait; older ones are dropped
+            name: Thread name prefix
+        """
+        self.maxsize = maxsize
+        self._cond = threading.Condition()
+        self._jobs = collections.deque()
+        self._running_keys = set()
+        self._active = 0
+        self._running = True
+
+        # Counters
+        self.submitted = 0
+        self.completed = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.errors = 0
+
+        self._threads = [
+            threading.Thread(target=self._run, name=f"{name}-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, fn, *args, key=None, merge=None, coalesce=True):
+        """
+        Queue fn(*args). Never blocks.
+
+        Args:
+            fn: Callable to run on a worker
+            *args: Arguments for fn
+            key: Ordering and coalescing key; if the last queued job with
+                 this key runs the same fn, it is updated instead of adding
+                 a new one
+            merge: Callable (queued_args, new_args) -> args used when
+                   coalescing (default: new args replace the queued ones)
+            coalesce: False to keep this job's order by key but never merge
+                      it with another job
+        """
+        with self._cond:
+            self.submitted += 1
+            if key is not None and coalesce:
+                last = next((job for job in reversed(self._jobs) if job.key == key), None)
+                if last is not None and last.coalesce and last.fn == fn:
+                    last.args = merge(last.args, args) if merge else args
+                    self.coalesced += 1
+                    return
+
+            if len(self._jobs) >= self.maxsize:
+                stale = self._jobs.popleft()
+                self.dropped += 1
+                logger.warning(f"⚠️  Queue full, dropped stale job {stale.key or stale.fn.__name__}")
+
+            self._jobs.append(_Job(fn, args, key, merge, coalesce))
+            self._cond.notify()
+
+    def stats(self):
+        """Counters as a dict."""
+        with self._cond:
+            return {
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'coalesced': self.coalesced,
+                'dropped': self.dropped,
+                'errors': self.errors,
+                'queued': len(self._jobs),
+            }
+
+    def stop(self, flush=True, timeout=2.0):
+        """
+        Stop the workers.
+
+        Args:
+            flush: Run jobs that are already queued before stopping
+            timeout: Longest to wait for each worker (seconds)
+        """
+        with self._cond:
+            self._running = False
+            if not flush:
+                self._jobs.clear()
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+
+    def _take(self):
+        """Next runnable job (its key not already running), or None on stop."""
+        with self._cond:
+            while True:
+                for job in self._jobs:
+                    if job.key is None or job.key not in self._running_keys:
+                        self._jobs.remove(job)
+                        if job.key is not None:
+                            self._running_keys.add(job.key)
+                        return job
+                if not self._running and not self._jobs:
+                    return None
+                self._cond.wait()
+
+    def _run(self):
+        while True:
+            job = self._take()
+            if job is None:
+                return
+            try:
+                job.fn(*job.args)
+                ok = True
+            except Exception as e:
+                ok = False
+                logger.error(f"❌ Job {job.key or job.fn.__name__} failed: {e}")
+            with self._cond:
+                if ok:
+                    self.completed += 1
+                else:
+                    self.errors += 1
+                self._running_keys.discard(job.key)
+                self._cond.notify_all()
@@ -1,17 +1,31 @@
 #!/usr/bin/env python3
 """
-Emergency Reboot Button Handler
+Emergency Recovery Button Handler
 
 Hardware:
 - Button: Red button module (same type as mode button)
 - GPIO: GPIO 27 (Pin 13)
 - Mode: INPUT with PULL_UP (Active LOW)
 
+Recovery tiers (by how long the button is held):
+- Release after 1.5s: restart the Node/Python services in parallel (PM2) and
+                      the other hardware_daemon.py plugins in-process
+- Release after 3s:   relaunch the Chromium kiosk
+- Hold for 5s:        clean reboot - checkpoint all services into one fsynced
+                      snapshot, stop services concurrently, reboot
+While holding, each tier beeps as it is reached (1/2/3 beeps, feedback.py);
+on release the beeps of the tier that runs play again. Each tier logs how
+long recovery took; after a reboot the time until the services answer again
+is logged on the next start.
+
 Safety Features:
-- Requires holding button for 5 seconds (prevents accidental reboots)
-- Debouncing
-- Logging all reboot attempts
-- Visual countdown feedback
+- Shorter holds than SERVICE_HOLD do nothing (prevents accidental triggers)
+- Debouncing (kernel-side bouncetime)
+- Logging all recovery attempts
+- No polling: timers are armed on the press edge and cancelled on release;
+  every tier timer re-checks that its press is the latest and the button is
+  still down (a release edge lost inside the bouncetime cancels the hold,
+  and a new press re-arms it from that edge)
 
 Wiring:
   VCC (3.3V)  →  Pin 17 (3.3V)
@@ -20,27 +34,64 @@ Wiring:
 """
 
 import RPi.GPIO as GPIO
+import requests
+import json
 import time
 import os
+import signal
 import logging
+import subprocess
+import threading
 from datetime import datetime
+from backend_client import get_session
+from checkpoint import take_checkpoint
+from feedback import play_tone, prepare_tones
+from radio_daemon import send_command
 
 # Configuration
 REBOOT_BUTTON = 27  # GPIO 27 (BCM numbering)
+SERVICE_HOLD = 1.5  # Release after this long: restart services
+KIOSK_HOLD = 3.0    # Release after this long: restart the kiosk browser
 HOLD_TIME = 5.0     # Seconds to hold for reboot (safety feature)
 DEBOUNCE_TIME = 0.1 # Debounce delay in seconds
-CHECK_INTERVAL = 0.05  # How often to check button state
 
-# Logging setup
+# PM2 apps (short hold). Not hardware-daemon: it hosts this handler, so its
+# other plugins are restarted in-process instead (see restart_plugins)
+SERVICE_APPS = ('radio-daemon', 'hardware-service', 'backend')
+SHUTDOWN_APPS = SERVICE_APPS + ('frontend',)  # PM2 apps stopped before a reboot
+HEALTH_URLS = {
+    'hardware-service': "http://localhost:3001/health",
+    'backend': "http://localhost:4000/health",
+}
+KIOSK_SCRIPT = os.environ.get(
+    "COGITO_KIOSK_SCRIPT",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'start-chromium-vapi.sh')
+)
+KIOSK_URL = "http://localhost:5173"  # Page opened by start-chromium-vapi.sh
+PM2_TIMEOUT = 30.0        # seconds for the parallel pm2 commands
+RECOVERY_TIMEOUT = 90.0   # seconds to wait for services / kiosk to come back
+HEALTH_POLL = 0.5         # seconds between health checks while recovering
+REBOOT_MARKER = '/var/tmp/cogito-emergency-reboot'  # /var/tmp survives the reboot
+
+# Logging setup (the audit log is attached to this logger, so it is kept
+# when the handler runs inside hardware_daemon.py with its own logging)
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('/tmp/emergency-reboot.log')
-    ]
+    format=LOG_FORMAT,
+    handlers=[logging.StreamHandler()]
 )
 logger = logging.getLogger('emergency-reboot')
+audit_log = logging.FileHandler('/tmp/emergency-reboot.log')
+audit_log.setFormatter(logging.Formatter(LOG_FORMAT))
+logger.addHandler(audit_log)
+
+# Hold state (edge callbacks and the timers run on different threads)
+hold_lock = threading.Lock()
+hold_timers = []        # threading.Timers armed while the button is held
+press_start_time = 0.0  # time.monotonic() of the press edge
+recovery_lock = threading.Lock()  # One service/kiosk recovery at a time
+restart_plugins = None  # Callable restarting the other hardware_daemon.py plugins (set by start())
 
 
 def init_gpio():
@@ -48,7 +99,8 @@ def init_gpio():
     GPIO.setmode(GPIO.BCM)
     GPIO.setup(REBOOT_BUTTON, GPIO.IN, pull_up_down=GPIO.PUD_UP)
     logger.info("🚨 Emergency Reboot Button initialized on GPIO %d", REBOOT_BUTTON)
-    logger.info("⏱️  Hold button for %.1f seconds to trigger reboot", HOLD_TIME)
+    logger.info("⏱️  Hold %.1fs: restart services, %.1fs: restart kiosk, %.1fs: reboot",
+                SERVICE_HOLD, KIOSK_HOLD, HOLD_TIME)
 
 
 def is_button_pressed():
@@ -56,24 +108,220 @@ def is_button_pressed():
     return GPIO.input(REBOOT_BUTTON) == GPIO.LOW
 
 
-def wait_for_button_release():
-    """Wait until button is released."""
-    while is_button_pressed():
-        time.sleep(0.01)
+def run_parallel(commands, timeout=PM2_TIMEOUT):
+    """
+    Start all commands at once and wait for them together.
+
+    Args:
+        commands: Dict of name -> argv list
+        timeout: Longest to wait for all of them (seconds)
+
+    Returns:
+        Dict of name -> exit code (None if it timed out or could not start)
+    """
+    processes = {}
+    results = {}
+    for name, argv in commands.items():
+        try:
+            processes[name] = subprocess.Popen(argv, stdout=subprocess.DEVNULL,
+                                               stderr=subprocess.DEVNULL)
+        except OSError as e:
+            logger.error("❌ %s: %s", ' '.join(argv), e)
+            results[name] = None
+
+    deadline = time.monotonic() + timeout
+    for name, process in processes.items():
+        try:
+            results[name] = process.wait(max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            process.kill()
+            results[name] = None
+    return results
+
+
+def service_healthy(name):
+    """Check whether a service answers again."""
+    if name == 'radio-daemon':
+        return (send_command('ping', timeout=0.5) or {}).get('ok', False)
+    url = HEALTH_URLS.get(name)
+    if url is None:
+        return True
+    try:
+        return get_session().get(url, timeout=1.0).ok
+    except requests.exceptions.RequestException:
+        return False
+
+
+def wait_for_services(names, started, timeout=RECOVERY_TIMEOUT):
+    """
+    Wait until every service answers.
+
+    Args:
+        names: Service (PM2 app) names
+        started: time.monotonic() the recovery started
+        timeout: Longest to wait from `started` (seconds)
+
+    Returns:
+        Dict of name -> seconds from `started` until it answered (None = never)
+    """
+    pending = list(names)
+    ready = {}
+    while pending and time.monotonic() - started < timeout:
+        for name in list(pending):
+            if service_healthy(name):
+                ready[name] = time.monotonic() - started
+                pending.remove(name)
+        if pending:
+            time.sleep(HEALTH_POLL)
+    ready.update((name, None) for name in pending)
+    return ready
+
+
+def log_service_recovery(tier, ready, started):
+    """Log per-service and total recovery time."""
+    for name, seconds in ready.items():
+        if seconds is None:
+            logger.error("❌ %s not answering after %.0fs", name, RECOVERY_TIMEOUT)
+        else:
+            logger.info("   %s answering after %.1fs", name, seconds)
+    elapsed = time.monotonic() - started
+    if None in ready.values():
+        logger.error("❌ RECOVERY (%s) INCOMPLETE after %.1fs", tier, elapsed)
+    else:
+        logger.warning("✅ RECOVERY (%s) complete in %.1fs", tier, elapsed)
+
+
+def restart_services():
+    """
+    Tier 1: restart the PM2 services in parallel, together with the other
+    hardware_daemon.py plugins, and wait until they answer.
+    """
+    started = time.monotonic()
+    logger.warning("🔄 RECOVERY (services): restarting %s", ', '.join(SERVICE_APPS))
+
+    plugins = {}
+    plugin_thread = None
+    if restart_plugins is not None:
+        # The daemon restarts the plugins on its loop; this thread only waits
+        plugin_thread = threading.Thread(target=lambda: plugins.update(restart_plugins()),
+                                         name='plugin-restart', daemon=True)
+        plugin_thread.start()
+    else:
+        logger.info("   Not hosted by hardware_daemon.py - no hardware plugins to restart")
+
+    results = run_parallel({app: ['pm2', 'restart', app] for app in SERVICE_APPS})
+    for app, code in results.items():
+        if code != 0:
+            logger.error("❌ pm2 restart %s failed (exit %s)", app, code)
+    logger.info("   pm2 restarts returned after %.1fs", time.monotonic() - started)
+
+    ready = wait_for_services(SERVICE_APPS, started)
+    if plugin_thread is not None:
+        plugin_thread.join(PM2_TIMEOUT)
+        ready.update(plugins)   # plugin name -> seconds until it ran again
+    log_service_recovery('services', ready, started)
+
+
+def kiosk_pids():
+    """PIDs of browser processes showing the kiosk page."""
+    try:
+        output = subprocess.run(['pgrep', '-f', KIOSK_URL], capture_output=True,
+                                text=True, timeout=2).stdout
+    except (OSError, subprocess.TimeoutExpired):
+        return set()
+    return {int(pid) for pid in output.split()}
+
+
+def restart_kiosk():
+    """Tier 2: relaunch the Chromium kiosk and wait until it shows the page."""
+    started = time.monotonic()
+    logger.warning("🔄 RECOVERY (kiosk): relaunching %s", KIOSK_SCRIPT)
+
+    old_pids = kiosk_pids()
+    env = dict(os.environ)
+    env.setdefault('DISPLAY', ':0')
+    try:
+        # The script kills the old browser itself; detach so it outlives us
+        subprocess.Popen(['bash', KIOSK_SCRIPT], env=env, start_new_session=True,
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except OSError as e:
+        logger.error("❌ RECOVERY (kiosk) failed to start: %s", e)
+        return
+
+    while time.monotonic() - started < RECOVERY_TIMEOUT:
+        if kiosk_pids() - old_pids:
+            logger.warning("✅ RECOVERY (kiosk) complete in %.1fs", time.monotonic() - started)
+            return
+        time.sleep(HEALTH_POLL)
+    logger.error("❌ RECOVERY (kiosk) INCOMPLETE: no browser after %.0fs", RECOVERY_TIMEOUT)
+
+
+def run_recovery(action):
+    """Run a recovery tier on its own thread (one at a time)."""
+    if not recovery_lock.acquire(blocking=False):
+        logger.warning("⏳ Recovery already in progress - ignored")
+        return
+
+    def worker():
+        try:
+            action()
+        except Exception as e:
+            logger.error("❌ Recovery failed: %s", e)
+        finally:
+            recovery_lock.release()
+
+    threading.Thread(target=worker, name='recovery', daemon=True).start()
+
+
+def report_reboot_recovery():
+    """After an emergency reboot: log how long until the services answered."""
+    try:
+        with open(REBOOT_MARKER) as f:
+            marker = json.load(f)
+        os.remove(REBOOT_MARKER)
+    except (OSError, ValueError):
+        return
+
+    since_reboot = time.time() - marker.get('started', time.time())
+    logger.warning("🔁 Back from emergency reboot: handler up %.0fs after the button", since_reboot)
+    started = time.monotonic()
+    ready = wait_for_services(SERVICE_APPS, started)
+    for name, seconds in ready.items():
+        if seconds is not None:
+            ready[name] = seconds + since_reboot
+    log_service_recovery('reboot', ready, started - since_reboot)
 
 
 def trigger_reboot():
-    """Trigger system reboot with logging."""
+    """Tier 3: checkpoint state, stop services concurrently, then reboot."""
     logger.critical("🚨 EMERGENCY REBOOT TRIGGERED!")
     logger.critical("⏰ Reboot time: %s", datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    started = time.monotonic()
+
+    # Recovery time is measured across the reboot (see report_reboot_recovery)
+    try:
+        with open(REBOOT_MARKER, 'w') as f:
+            json.dump({'started': time.time()}, f)
+    except OSError as e:
+        logger.error("❌ Could not write %s: %s", REBOOT_MARKER, e)
+
+    # Station / mode / volume acks in parallel, one fsynced snapshot
+    snapshot = take_checkpoint()
+    if snapshot['missing']:
+        logger.error("❌ No checkpoint from: %s", ', '.join(snapshot['missing']))
+    logger.critical("💾 Checkpoint done in %.1fs", time.monotonic() - started)
+
+    # Stop services together now, so systemd has nothing left to wait for
+    results = run_parallel({app: ['pm2', 'stop', app] for app in SHUTDOWN_APPS})
+    stopped = [app for app, code in results.items() if code == 0]
+    logger.critical("🛑 Stopped %d/%d services in %.1fs", len(stopped), len(SHUTDOWN_APPS),
+                    time.monotonic() - started)
+    os.sync()
 
     # Flush logs
     for handler in logger.handlers:
         handler.flush()
 
-    # Give logs time to write
-    time.sleep(0.5)
-
     # Trigger reboot
     print("\n" + "="*60)
     print("🚨 EMERGENCY REBOOT ACTIVATED")
@@ -84,90 +332,162 @@ def trigger_reboot():
     os.system('sudo reboot')
 
 
-def countdown_display(elapsed, total):
-    """Display countdown progress."""
-    remaining = total - elapsed
-    progress = int((elapsed / total) * 20)
-    bar = "█" * progress + "░" * (20 - progress)
-
-    print(f"\r🚨 HOLD TO REBOOT: [{bar}] {remaining:.1f}s ", end="", flush=True)
+def on_button_edge(channel):
+    """Press/release callback (RPi.GPIO event thread, both edges)."""
+    if is_button_pressed():
+        on_press()
+    else:
+        on_release()
+
+
+def disarm():
+    """Cancel the tier timers. Returns (timers, press start) of the hold, if any."""
+    global hold_timers
+
+    with hold_lock:
+        timers, hold_timers = hold_timers, []
+        started = press_start_time
+    for timer in timers:
+        timer.cancel()
+    return timers, started
+
+
+def still_held(started):
+    """
+    True if the press that began at `started` is the latest one and the
+    button is still down.
+
+    RPi.GPIO drops edges inside the bouncetime, so a short tap can lose its
+    release edge. That shows up here as the button being up while the
+    timers are armed: the hold is disarmed instead of carrying on.
+    """
+    with hold_lock:
+        if not hold_timers or started != press_start_time:
+            return False  # Released, or superseded by a newer press
+        if is_button_pressed():
+            return True
+    disarm()
+    logger.info("✋ Button is up but no release was seen - hold cancelled")
+    return False
+
+
+def announce_tier(started, tier, message):
+    """Hold timer: tell the user which tier a release would trigger now."""
+    if not still_held(started):
+        return
+    play_tone(f'tier-{tier}')
+    logger.warning("⏱️  %s", message)
+
+
+def on_press():
+    """Falling edge: (re)arm the tier timers, measuring from this edge."""
+    global hold_timers, press_start_time
+
+    # The kernel already debounced this edge, so a press while armed means
+    # the release edge before it was lost: start the hold over from now
+    rearmed, _ = disarm()
+
+    with hold_lock:
+        press_start_time = started = time.monotonic()
+        hold_timers = [
+            threading.Timer(SERVICE_HOLD, announce_tier, (started, 1, "Release now to restart services")),
+            threading.Timer(KIOSK_HOLD, announce_tier, (started, 2, "Release now to restart the kiosk")),
+            threading.Timer(HOLD_TIME, on_hold_complete, (started,)),
+        ]
+        for timer in hold_timers:
+            timer.daemon = True
+            timer.start()
+
+    if rearmed:
+        logger.info("🔁 Pressed again without a release edge - hold restarted")
+    logger.info("🔴 Emergency button PRESSED - hold %.1fs/%.1fs/%.1fs for services/kiosk/reboot",
+                SERVICE_HOLD, KIOSK_HOLD, HOLD_TIME)
+
+
+def on_release():
+    """Rising edge: cancel the timers and run the tier for the hold duration."""
+    timers, started = disarm()
+    if not timers:
+        return  # Not armed, or the reboot already fired
+
+    hold_duration = time.monotonic() - started
+    if hold_duration >= KIOSK_HOLD:
+        logger.warning("✋ Released after %.1fs - restarting kiosk", hold_duration)
+        play_tone('tier-2')
+        run_recovery(restart_kiosk)
+    elif hold_duration >= SERVICE_HOLD:
+        logger.warning("✋ Released after %.1fs - restarting services", hold_duration)
+        play_tone('tier-1')
+        run_recovery(restart_services)
+    else:
+        logger.info("✋ Button released early (%.1fs) - nothing done", hold_duration)
+
+
+def on_hold_complete(started):
+    """Hold timer fired: the latest press has been down for HOLD_TIME."""
+    if not still_held(started):
+        return
+    held = time.monotonic() - started
+    disarm()  # The reboot is final; a release from now on does nothing
+
+    logger.warning("⚠️  REBOOT THRESHOLD REACHED! (held %.1fs)", held)
+    play_tone('tier-3')
+    trigger_reboot()
+
+
+def start(restart_plugins_hook=None):
+    """
+    Set up the button and listen for edges (returns immediately).
+
+    Also the plugin entry point used by hardware_daemon.py.
+
+    Args:
+        restart_plugins_hook: Callable restarting the other daemon plugins
+                              (blocking; returns name -> seconds or None)
+    """
+    global restart_plugins
+    restart_plugins = restart_plugins_hook
+    init_gpio()
+    prepare_tones()
 
+    # Both edges: falling arms the hold timer, rising cancels it
+    GPIO.add_event_detect(REBOOT_BUTTON, GPIO.BOTH, callback=on_button_edge,
+                          bouncetime=int(DEBOUNCE_TIME * 1000))
 
-def monitor_button():
-    """Main monitoring loop with hold-to-confirm logic."""
     logger.info("✅ Monitoring emergency reboot button...")
     logger.info("📍 Listening on GPIO %d (Pin 13)", REBOOT_BUTTON)
     logger.info("")
 
-    button_pressed = False
-    press_start_time = 0
-    last_check_time = 0
+    threading.Thread(target=report_reboot_recovery, name='reboot-report', daemon=True).start()
+
+
+def stop():
+    """Cancel a hold in progress and release the button pin."""
+    disarm()
+    cleanup_gpio()
+
+
+def monitor_button():
+    """Wait for button edges; the hold-to-confirm logic runs on timers."""
+    start()
 
     try:
         while True:
-            current_time = time.time()
-
-            # Check button state
-            if is_button_pressed():
-                if not button_pressed:
-                    # Button just pressed
-                    button_pressed = True
-                    press_start_time = current_time
-                    logger.info("🔴 Emergency button PRESSED - hold for %.1fs to reboot", HOLD_TIME)
-                    print("")  # New line for countdown
-
-                # Calculate how long button has been held
-                hold_duration = current_time - press_start_time
-
-                # Show countdown every 0.1s
-                if current_time - last_check_time >= 0.1:
-                    countdown_display(hold_duration, HOLD_TIME)
-                    last_check_time = current_time
-
-                # Check if held long enough
-                if hold_duration >= HOLD_TIME:
-                    print("\n")  # New line after countdown
-                    logger.warning("⚠️  REBOOT THRESHOLD REACHED!")
-
-                    # Double-check button is still pressed
-                    time.sleep(0.1)
-                    if is_button_pressed():
-                        trigger_reboot()
-                        # Function above calls reboot, but just in case:
-                        break
-                    else:
-                        logger.info("✋ Button released just before reboot - cancelled")
-                        button_pressed = False
-                        print("")
-
-            else:
-                # Button not pressed or released
-                if button_pressed:
-                    # Button was just released
-                    hold_duration = current_time - press_start_time
-                    print("\n")  # New line after countdown
-
-                    if hold_duration < HOLD_TIME:
-                        logger.info("✋ Button released early (%.1fs) - reboot cancelled", hold_duration)
-
-                    button_pressed = False
-                    press_start_time = 0
-
-            # Small delay to prevent CPU spinning
-            time.sleep(CHECK_INTERVAL)
+            signal.pause()
 
     except KeyboardInterrupt:
         print("\n")
         logger.info("🛑 Emergency reboot handler stopped by user")
 
     finally:
-        cleanup_gpio()
+        stop()
 
 
 def cleanup_gpio():
-    """Clean up GPIO on exit."""
+    """Clean up the button pin on exit (other pins may belong to other handlers)."""
     logger.info("🧹 Cleaning up GPIO...")
-    GPIO.cleanup()
+    GPIO.remove_event_detect(REBOOT_BUTTON)
+    GPIO.cleanup(REBOOT_BUTTON)
 
 
 def main():
@@ -176,14 +496,11 @@ def main():
     print("🚨 EMERGENCY REBOOT BUTTON HANDLER")
     print("="*60)
     print(f"GPIO Pin: {REBOOT_BUTTON} (Pin 13)")
-    print(f"Hold Time: {HOLD_TIME} seconds")
+    print(f"Hold Times: {SERVICE_HOLD}s services / {KIOSK_HOLD}s kiosk / {HOLD_TIME}s reboot")
     print(f"Log File: /tmp/emergency-reboot.log")
     print("="*60)
     print()
 
-    # Initialize
-    init_gpio()
-
     # Log startup
     logger.info("="*60)
     logger.info("🚀 Emergency Reboot Handler Started")
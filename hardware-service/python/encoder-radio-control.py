@@ -10,7 +10,11 @@ import RPi.GPIO as GPIO
 import board
 import busio
 from adafruit_bus_device.i2c_device import I2CDevice
-import subprocess
+from radio_daemon import send_command
+from radio_tuner import GRID, RadioTuner
+from rotation_processor import RotationProcessor
+from tune_queue import TuneCoalescer
+from volume_mixer import VolumeMixer
 
 # I2C Setup
 i2c = busio.I2C(board.SCL, board.SDA)
@@ -19,15 +23,18 @@ device = I2CDevice(i2c, 0x49)
 GPIO_BASE = 0x01
 GPIO_BULK = 0x04
 
-# Radio control
-RADIO_SCRIPT = "/home/radioassistant/Desktop/Cogito/hardware-service/python/radio-control.py"
+# Radio control (in-process fallback, opened only if radio_daemon.py is not running)
+tuner = None
+
+# Volume control (one ALSA handle, amixer only as a fallback)
+mixer = VolumeMixer()
 
 # State
 mode = "VOLUME"  # or "TUNING"
-volume = 50  # 0-100
-frequency = 99.1  # FM frequency
+volume = mixer.volume  # 0-100
+channel = GRID.channel(99.1)  # Tuned channel on the grid (integer, never drifts)
 volume_step = 5
-freq_step = 0.2
+channel_step = max(1, round(200 / GRID.spacing_khz))  # 0.2 MHz per detent
 
 def read_gpio():
     try:
@@ -42,19 +49,33 @@ def read_gpio():
 
 def set_volume(vol):
     """Set system volume"""
-    vol = max(0, min(100, vol))
-    subprocess.run(['amixer', 'set', 'Master', f'{vol}%'], 
-                   stdout=subprocess.DEVNULL, 
-                   stderr=subprocess.DEVNULL)
-    return vol
-
-def tune_radio(freq):
-    """Tune radio to frequency"""
-    freq = max(87.5, min(108.0, freq))
-    subprocess.run(['python3', RADIO_SCRIPT, 'set', str(freq)],
-                   stdout=subprocess.DEVNULL,
-                   stderr=subprocess.DEVNULL)
-    return freq
+    return mixer.set_volume(vol)
+
+def get_tuner():
+    """In-process tuner for when the radio daemon is not running"""
+    global tuner
+    if tuner is None:
+        tuner = RadioTuner()
+    return tuner
+
+def run_radio(cmd, fallback, **params):
+    """Send a command to the radio daemon, or run fallback(tuner) if it is not running"""
+    resp = send_command(cmd, **params)
+    if resp is None:
+        resp = fallback(get_tuner())
+    if not resp.get('ok'):
+        print(f"❌ Radio {cmd} failed: {resp.get('error')}")
+    return resp
+
+def tune_radio(ch):
+    """Tune radio to a grid channel"""
+    return run_radio('set', lambda t: t.tune_channel(ch), freq=GRID.freq(ch))
+
+# Volume steps accelerate with spin speed; mixer writes are batched
+rotation = RotationProcessor(set_volume, lambda: mixer.volume, step=volume_step)
+
+# Detents during a fast spin are coalesced: only the latest frequency is tuned
+tune_queue = TuneCoalescer(lambda delta: tune_radio(channel))
 
 print("="*60)
 print("🎛️  COGITO ENCODER CONTROL (Polling Mode)")
@@ -64,12 +85,12 @@ print("PRESS:  Toggle Volume ↔ Tuning mode")
 print("="*60)
 print(f"\nMode: {mode}")
 print(f"Volume: {volume}%")
-print(f"Frequency: {frequency} MHz\n")
 
-# Start radio
-subprocess.run(['python3', RADIO_SCRIPT, 'on'], 
-               stdout=subprocess.DEVNULL, 
-               stderr=subprocess.DEVNULL)
+# Start radio (at the last tuned station)
+resp = run_radio('on', lambda t: t.radio_on())
+if resp.get('ok'):
+    channel = GRID.channel(resp['frequency'])
+print(f"Frequency: {GRID.freq(channel):.1f} MHz\n")
 
 last_value = read_gpio()
 position = 0
@@ -97,13 +118,12 @@ try:
                     last_position = position
                     
                     if mode == "VOLUME":
-                        volume += delta * volume_step
-                        volume = set_volume(volume)
+                        volume = rotation.feed(delta)
                         print(f"🔊 Volume: {volume}%")
                     elif mode == "TUNING":
-                        frequency += delta * freq_step
-                        frequency = tune_radio(frequency)
-                        print(f"📻 Frequency: {frequency:.1f} MHz")
+                        channel = min(max(channel + delta * channel_step, 0), GRID.count - 1)
+                        tune_queue.step(delta)
+                        print(f"📻 Frequency: {GRID.freq(channel):.1f} MHz")
             
             # BUTTON PRESSED
             if xor & 0x000040FE:
@@ -113,9 +133,9 @@ try:
                     print(f"🔄 MODE: {mode}")
                     print(f"{'='*60}")
                     if mode == "VOLUME":
-                        print(f"🔊 Volume: {volume}%")
+                        print(f"🔊 Volume: {mixer.volume}%")
                     else:
-                        print(f"📻 Frequency: {frequency:.1f} MHz")
+                        print(f"📻 Frequency: {GRID.freq(channel):.1f} MHz")
                     print()
             
             last_value = current
@@ -123,5 +143,11 @@ try:
         time.sleep(0.01)  # Poll every 10ms
 
 except KeyboardInterrupt:
+    tune_queue.stop()
+    rotation.stop()
+    mixer.close()
+    if tuner is not None:
+        tuner.close()
     print("\n\n🛑 Encoder control stopped")
+    print(f"Tunes: {tune_queue.stats()}")
 
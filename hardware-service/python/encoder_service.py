@@ -8,36 +8,46 @@ communicates with the Node.js backend API to control volume and radio.
 
 Features:
 - Rotary encoder: Volume control (clockwise = up, counter-clockwise = down)
-- Buttons: Radio station scanning (Up/Right = scan up, Down/Left = scan down)
-- HTTP API integration with backend
+- Buttons: Radio station scanning (Up = scan up, Down = scan down) and
+  presets (Left/Right: press to tune preset 1/2, hold to save it)
+- HTTP API integration with backend over a pooled keep-alive session that
+  fails fast to the local fallback while the backend is down (non-blocking: calls run on a small
+  worker pool fed by a bounded queue, so a slow backend never stalls polling)
 - Noise filtering and debouncing
 - Auto-recovery from I2C errors
+- Persistent push channel to hardware-service.js: scans go out batched over
+  one Socket.io connection and radio/mode changes come back as events (HTTP
+  to the backend is only used while the channel is down)
+- Interrupt mode: sleeps on the ANO INT line (GPIO 22) instead of polling
+  I2C every 10ms, with a slow safety poll for missed edges
 
 Run as a service:
     sudo systemctl start cogito-encoder
     sudo systemctl enable cogito-encoder  # Start on boot
+
+Logs: standalone runs log to stderr and /tmp/encoder-service.log; hosted by
+hardware_daemon.py (the PM2 default) they go to `pm2 logs hardware-daemon`.
 """
 
+import os
 import time
 import requests
 import logging
-from ano_encoder import ANOEncoder
+from ano_encoder import ANOEncoder, INT_PIN, SAFETY_POLL
+from backend_client import CircuitOpenError, get_client
+from dispatch_queue import DispatchQueue
+from poll_scheduler import PollScheduler
+from push_channel import HARDWARE_SERVICE_URL, PushChannel
+from tune_queue import TuneCoalescer
 
 
 # Configuration
 BACKEND_URL = "http://localhost:4000/api"
-POLL_INTERVAL = 0.01  # 10ms polling interval
+USE_INTERRUPT = os.environ.get("COGITO_ENCODER_INTERRUPT", "1") != "0"
 RETRY_DELAY = 5  # Seconds to wait before retrying on error
+BACKEND_WORKERS = 2  # Threads making backend calls
+LOG_FILE = '/tmp/encoder-service.log'  # Standalone runs only (see main())
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('/tmp/encoder-service.log')
-    ]
-)
 logger = logging.getLogger('encoder-service')
 
 
@@ -46,20 +56,46 @@ class EncoderService:
     Main service class that bridges hardware encoder with backend API.
     """
 
-    def __init__(self, backend_url=BACKEND_URL):
+    def __init__(self, backend_url=BACKEND_URL, use_interrupt=USE_INTERRUPT,
+                 hardware_url=HARDWARE_SERVICE_URL, push=None, i2c=None):
         """
         Initialize the encoder service.
 
         Args:
             backend_url: Base URL for backend API
+            use_interrupt: Wait on the ANO INT line instead of polling
+            hardware_url: hardware-service.js URL for the push channel
+            push: Shared PushChannel (default: open one to hardware_url)
+            i2c: Shared busio.I2C handle (default: the encoder opens its own)
         """
         self.backend_url = backend_url
+        self.use_interrupt = use_interrupt
+        self.i2c = i2c
+        self.scheduler = PollScheduler()  # Pacing when interrupt mode is off
         self.encoder = None
         self.running = False
 
+        # Fast scan presses are coalesced into one backend call / tune
+        self.scan_queue = TuneCoalescer(self.apply_scan)
+
+        # Backend calls run here, never on the polling loop
+        self.dispatch = DispatchQueue(workers=BACKEND_WORKERS, name='backend')
+
+        # Pooled HTTP session with circuit breaker
+        self.client = get_client(backend_url)
+
         # API timeout (seconds)
         self.api_timeout = 1.0
 
+        # Persistent connection to hardware-service.js (events both ways)
+        self.mode = None
+        self.frequency = None
+        self.owns_push = push is None
+        if push is None:
+            push = PushChannel(hardware_url)
+        self.push = push
+        self.push.subscribe(self.on_push_event)
+
         logger.info("="*60)
         logger.info("🎛️  Cogito Encoder Service")
         logger.info("="*60)
@@ -73,7 +109,19 @@ class EncoderService:
         """
         try:
             logger.info("Initializing ANO Encoder...")
-            self.encoder = ANOEncoder(volume_step=5)
+            if self.encoder is not None:
+                self.encoder.close()
+                self.encoder = None
+            interrupt_pin = INT_PIN if self.use_interrupt else None
+            try:
+                self.encoder = ANOEncoder(volume_step=5, interrupt_pin=interrupt_pin, i2c=self.i2c,
+                                          tune_queue=self.scan_queue)
+            except RuntimeError as e:
+                # INT pin unavailable (e.g. in use by another process)
+                if interrupt_pin is None:
+                    raise
+                logger.warning(f"⚠️  Interrupt mode unavailable ({e}), polling instead")
+                self.encoder = ANOEncoder(volume_step=5, i2c=self.i2c, tune_queue=self.scan_queue)
             logger.info("✓ Encoder initialized successfully")
             return True
         except Exception as e:
@@ -96,13 +144,11 @@ class EncoderService:
         Returns:
             Response data or None on error
         """
-        url = f"{self.backend_url}{endpoint}"
-
         try:
             if method == 'POST':
-                response = requests.post(url, json=data, timeout=self.api_timeout)
+                response = self.client.post(endpoint, json=data, timeout=self.api_timeout)
             else:
-                response = requests.get(url, timeout=self.api_timeout)
+                response = self.client.get(endpoint, timeout=self.api_timeout)
 
             if response.status_code == 200:
                 return response.json()
@@ -110,6 +156,8 @@ class EncoderService:
                 logger.warning(f"API call failed: {response.status_code} - {response.text}")
                 return None
 
+        except CircuitOpenError:
+            return None  # Backend known to be down: go straight to the fallback
         except requests.exceptions.Timeout:
             logger.warning(f"API timeout: {endpoint}")
             return None
@@ -127,39 +175,92 @@ class EncoderService:
         Args:
             delta: Change in encoder position (positive = clockwise)
         """
-        # Update local volume (encoder handles amixer internally)
+        # Update local volume (encoder drives the ALSA mixer directly)
         new_volume = self.encoder.handle_rotation(delta)
 
         direction = "UP ⬆" if delta > 0 else "DOWN ⬇"
         logger.info(f"🔊 Volume {direction}: {new_volume}%")
 
-    def handle_scan_up(self):
-        """Handle radio scan up button press."""
-        logger.info("📻 Scanning UP ▲")
+    def on_push_event(self, name, data):
+        """
+        Handle an event broadcast by hardware-service.js (push channel thread).
+
+        Args:
+            name: Socket.io event name
+            data: Event payload
+        """
+        if name == 'radio-state-update' and data and data.get('frequency'):
+            self.frequency = data['frequency']
+            logger.info(f"📻 Now on {self.frequency} MHz")
+        elif name == 'mode-changed' and data:
+            self.mode = data.get('mode')
+            logger.info(f"🔄 Mode: {self.mode}")
+
+    def apply_scan(self, delta):
+        """
+        Send a coalesced scan over the push channel, or to the backend workers.
+
+        While an earlier scan is still waiting for a worker, the steps are
+        added to it, so a slow backend gets one request with the net delta.
+
+        Args:
+            delta: Net channel steps from a burst of presses (positive = up)
+        """
+        if self.push.connected:
+            self.push.send('scan', steps=delta)
+            return
+        self.dispatch.submit(self.send_scan, delta, key='scan',
+                             merge=lambda queued, new: (queued[0] + new[0],))
+
+    def send_scan(self, delta):
+        """
+        Send a scan to the backend (runs on a dispatch worker).
+
+        Args:
+            delta: Net channel steps (positive = up)
+        """
+        if delta == 0:
+            return  # Queued presses cancelled out
+
+        endpoint = '/radio/scan-up' if delta > 0 else '/radio/scan-down'
 
         # Call backend API
-        result = self.call_api('/radio/scan-up')
+        result = self.call_api(endpoint, data={'steps': abs(delta)})
 
         if result:
-            logger.info(f"✓ {result.get('message', 'Scan up successful')}")
+            logger.info(f"✓ {result.get('message', 'Scan successful')} ({delta:+d} steps)")
         else:
             logger.warning("⚠️  Backend API call failed, using local fallback")
             # Fallback to direct radio control
-            self.encoder.scan_radio_up()
+            self.encoder.radio_step(delta)
+
+    def handle_preset(self, slot, save):
+        """
+        Recall or save a preset: over the push channel, else straight to the
+        radio daemon on a dispatch worker (queued recalls: latest wins).
+
+        Args:
+            slot: Preset number
+            save: Store the current station instead of tuning
+        """
+        logger.info(f"📻 {'Saving' if save else 'Tuning to'} preset {slot}")
+        if self.push.connected:
+            self.push.send('preset', slot=slot, save=save)
+            return
+        action = self.encoder.save_preset if save else self.encoder.recall_preset
+        # Recalls coalesce (latest wins); a save is never merged away or
+        # turned into a save of another slot
+        self.dispatch.submit(action, slot, key='preset', coalesce=not save)
+
+    def handle_scan_up(self):
+        """Handle radio scan up button press."""
+        logger.info("📻 Scanning UP ▲")
+        self.scan_queue.step(1)
 
     def handle_scan_down(self):
         """Handle radio scan down button press."""
         logger.info("📻 Scanning DOWN ▼")
-
-        # Call backend API
-        result = self.call_api('/radio/scan-down')
-
-        if result:
-            logger.info(f"✓ {result.get('message', 'Scan down successful')}")
-        else:
-            logger.warning("⚠️  Backend API call failed, using local fallback")
-            # Fallback to direct radio control
-            self.encoder.scan_radio_down()
+        self.scan_queue.step(-1)
 
     def run(self):
         """
@@ -170,11 +271,17 @@ class EncoderService:
         # Initialize encoder
         if not self.initialize_encoder():
             logger.error("Failed to initialize encoder. Exiting.")
+            self.push.unsubscribe(self.on_push_event)
             return
 
         self.running = True
         logger.info("🚀 Service started - monitoring encoder events...")
-        logger.info(f"   Polling interval: {POLL_INTERVAL*1000:.1f}ms")
+        if self.encoder.interrupt_pin is not None:
+            logger.info(f"   Interrupt: GPIO {self.encoder.interrupt_pin} "
+                        f"(safety poll {SAFETY_POLL*1000:.0f}ms)")
+        else:
+            logger.info(f"   Polling: {self.scheduler.fast*1000:.0f}ms active, "
+                        f"{self.scheduler.idle*1000:.0f}ms idle")
         logger.info(f"   Backend: {self.backend_url}")
         logger.info("")
 
@@ -184,29 +291,42 @@ class EncoderService:
         try:
             while self.running:
                 try:
+                    # Rotation and all buttons in two I2C transactions
+                    delta, button_events = self.encoder.poll()
+
                     # Check rotation
-                    delta = self.encoder.read_rotation()
                     if delta != 0:
                         self.handle_volume_change(delta)
                         error_count = 0  # Reset error counter on successful read
 
-                    # Check buttons
-                    button_events = self.encoder.read_buttons()
-
-                    # Handle scan up (Up or Right button)
-                    if button_events.get(ANOEncoder.BUTTON_UP) or \
-                       button_events.get(ANOEncoder.BUTTON_RIGHT):
+                    # Handle scan up / down
+                    if button_events.get(ANOEncoder.BUTTON_UP):
                         self.handle_scan_up()
                         error_count = 0
 
-                    # Handle scan down (Down or Left button)
-                    if button_events.get(ANOEncoder.BUTTON_DOWN) or \
-                       button_events.get(ANOEncoder.BUTTON_LEFT):
+                    if button_events.get(ANOEncoder.BUTTON_DOWN):
                         self.handle_scan_down()
                         error_count = 0
 
-                    # Small delay
-                    time.sleep(POLL_INTERVAL)
+                    # Presets (Left/Right): reported on release, held = save
+                    for pin, slot in ANOEncoder.PRESET_BUTTONS.items():
+                        if button_events.get(pin):
+                            self.handle_preset(slot, save=button_events[pin] == 'long')
+                            error_count = 0
+
+                    # Center button (no radio action yet; reported to the hub)
+                    if button_events.get(ANOEncoder.BUTTON_SELECT):
+                        logger.info("🔘 Select pressed")
+                        self.push.send('select')
+                        error_count = 0
+
+                    # Sleep until INT asserts (or the safety poll), else poll
+                    if self.encoder.interrupt_pin is not None:
+                        self.encoder.wait_for_event()
+                    else:
+                        if delta != 0 or any(button_events.values()):
+                            self.scheduler.activity()
+                        self.scheduler.wait()
 
                 except Exception as e:
                     error_count += 1
@@ -237,6 +357,36 @@ class EncoderService:
             raise
         finally:
             self.running = False
+            if self.encoder is not None:
+                self.encoder.close()
+            self.scan_queue.stop()
+            self.push.unsubscribe(self.on_push_event)
+            if self.owns_push:
+                self.push.close()
+            self.dispatch.stop()
+            stats = self.scan_queue.stats()
+            logger.info(f"Scan presses: {stats['requests']}, tunes: {stats['applied']}, "
+                        f"elided: {stats['elided']}")
+            stats = self.dispatch.stats()
+            logger.info(f"Backend jobs: {stats['completed']} done, {stats['coalesced']} coalesced, "
+                        f"{stats['dropped']} dropped, {stats['errors']} failed")
+            stats = self.push.stats()
+            logger.info(f"Push channel: {stats['sent']} events in {stats['batches']} batches, "
+                        f"{stats['received']} received, {stats['reconnects']} reconnects")
+            stats = self.client.stats()
+            logger.info(f"Backend calls short-circuited: {stats['short_circuited']}")
+            for endpoint, latency in stats['endpoints'].items():
+                logger.info(f"Latency {endpoint}: {latency['count']} calls, "
+                            f"{latency['errors']} errors, {latency['buckets']}")
+            if self.encoder is not None and self.encoder.interrupt_pin is None:
+                logger.info(f"Poll loop: {self.scheduler.report()}")
+            if self.encoder is not None:
+                stats = self.encoder.rotation.stats()
+                logger.info(f"Detents: {stats['detents']}, volume writes: {stats['commits']}, "
+                            f"glitches: {stats['glitches']}")
+                for register, counters in self.encoder.seesaw.read_stats.items():
+                    logger.info(f"I2C {register}: {counters['reads']} reads, "
+                                f"{counters['io_errors']} errors, {counters['rejected']} rejected")
             logger.info("Service shutdown complete")
 
     def stop(self):
@@ -247,11 +397,22 @@ class EncoderService:
 
 def main():
     """
-    Main entry point.
+    Main entry point (standalone). Under hardware_daemon.py the daemon sets
+    up logging instead, so its output goes to `pm2 logs hardware-daemon`.
     """
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(),
+            logging.FileHandler(LOG_FILE)
+        ]
+    )
+
     # Check if backend is reachable
     try:
-        response = requests.get(f"{BACKEND_URL.replace('/api', '')}/health", timeout=2)
+        client = get_client(BACKEND_URL)
+        response = client.get(client.health_url, timeout=2)
         if response.status_code == 200:
             logger.info("✓ Backend is reachable")
         else:
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Local User Feedback - short tones through the speaker
+
+Mode switches and emergency-recovery tiers were only reported in logs that
+nobody sees on the device. play_tone() plays a short cue through ALSA with
+`aplay`, started in the background, so callers (including ones holding a
+lock, like ModeStateMachine.on_change) never wait for the sound.
+
+Cues are rendered once as small WAV files in TONE_DIR (tmpfs) on first use,
+or up front with prepare_tones().
+
+Cues (name -> notes of (frequency Hz, seconds), 0 Hz = pause):
+    ai        rising two-note: AI is listening
+    radio     falling two-note: back to the radio
+    rollback  two low notes: the mode change did not go through
+    tier-1/2/3  one/two/three beeps: emergency recovery tier reached
+
+Disable with COGITO_TONES=0.
+
+Usage:
+    from feedback import play_tone
+    play_tone('ai')
+"""
+
+import logging
+import math
+import os
+import struct
+import subprocess
+import wave
+
+
+TONE_DIR = os.environ.get("COGITO_TONE_DIR", "/tmp/cogito-tones")
+TONES_ENABLED = os.environ.get("COGITO_TONES", "1") != "0"
+SAMPLE_RATE = 22050
+AMPLITUDE = 0.4    # fraction of full scale
+FADE = 0.005       # seconds of fade in/out per note (avoids clicks)
+
+BEEP = (880, 0.09)
+GAP = (0, 0.06)
+TONES = {
+    'ai': [(660, 0.08), (880, 0.12)],
+    'radio': [(880, 0.08), (660, 0.12)],
+    'rollback': [(330, 0.15), GAP, (330, 0.15)],
+    'tier-1': [BEEP],
+    'tier-2': [BEEP, GAP, BEEP],
+    'tier-3': [BEEP, GAP, BEEP, GAP, BEEP],
+}
+
+logger = logging.getLogger('feedback')
+
+
+def _render(notes, path):
+    """Write notes as a 16-bit mono WAV (temp file + rename)."""
+    frames = bytearray()
+    for freq, seconds in notes:
+        count = int(SAMPLE_RATE * seconds)
+        fade = max(1, int(SAMPLE_RATE * FADE))
+        for i in range(count):
+            envelope = min(1.0, i / fade, (count - i) / fade)
+            value = math.sin(2 * math.pi * freq * i / SAMPLE_RATE) if freq else 0.0
+            frames += struct.pack('<h', int(32767 * AMPLITUDE * envelope * value))
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with wave.open(tmp_path, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(bytes(frames))
+    os.replace(tmp_path, path)
+
+
+def tone_path(name):
+    """WAV file for a cue, rendered on first use."""
+    path = os.path.join(TONE_DIR, f"{name}.wav")
+    if not os.path.exists(path):
+        _render(TONES[name], path)
+    return path
+
+
+def prepare_tones():
+    """Render all cues now, so the first play_tone() only starts aplay."""
+    for name in TONES:
+        try:
+            tone_path(name)
+        except OSError as e:
+            logger.warning(f"⚠️  Could not render tone {name}: {e}")
+
+
+def play_tone(name):
+    """
+    Start playing a cue and return immediately.
+
+    Args:
+        name: Key of TONES
+
+    Returns:
+        True if playback was started
+    """
+    global TONES_ENABLED
+    if not TONES_ENABLED:
+        return False
+    try:
+        subprocess.Popen(['aplay', '-q', tone_path(name)], stdin=subprocess.DEVNULL,
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return True
+    except FileNotFoundError as e:
+        TONES_ENABLED = False   # no aplay (or no tone dir): warn once
+        logger.warning(f"⚠️  Tones disabled: {e}")
+        return False
+    except OSError as e:
+        logger.warning(f"⚠️  Could not play tone {name}: {e}")
+        return False
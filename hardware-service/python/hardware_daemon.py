@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Cogito Hardware Daemon - all Python hardware handlers in one process
+
+PM2 used to run button-vapi-handler.py, encoder_service.py and
+emergency-reboot-handler.py as three interpreters, each importing RPi.GPIO,
+requests and Blinka and opening its own connections. This daemon hosts them
+as plugins in one process around one asyncio event loop, and shares:
+
+- GPIO: BCM numbering set up once; plugins release only their own pins
+- I2C: one Blinka busio.I2C handle, opened when a plugin first needs it
+- HTTP: one keep-alive session (backend_client.get_session())
+- Push channel: one Socket.io connection to hardware-service.js, running on
+  the daemon's event loop; each plugin subscribes its own handler
+
+Plugin setup and blocking work run on executor threads, so the loop stays
+free for the push channel. A plugin that raises (or whose run() returns
+while the daemon is up) is stopped and restarted in-process with exponential
+backoff; the other plugins keep running. Plugins can also be restarted on
+request (HardwareContext.restart_plugins(), used by the emergency button's
+service tier, since PM2 restarting this process would restart that plugin too).
+
+Plugins (COGITO_PLUGINS, comma-separated, default all):
+    button   - button-vapi-handler.py (mode button, AI inactivity timeout)
+    encoder  - encoder_service.py (ANO rotary encoder)
+    reboot   - emergency-reboot-handler.py (hold-to-reboot button)
+
+Run:
+    python3 hardware_daemon.py
+"""
+
+import asyncio
+import importlib.util
+import logging
+import os
+import resource
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import RPi.GPIO as GPIO
+
+from backend_client import get_session
+from push_channel import HARDWARE_SERVICE_URL, PushChannel
+from settings_store import get_settings
+
+
+# Configuration
+RESTART_MIN = 1.0     # seconds before the first restart of a crashed plugin
+RESTART_MAX = 60.0    # backoff cap
+STABLE_TIME = 60.0    # seconds of uptime after which the backoff resets
+STOP_TIMEOUT = 5.0    # seconds to wait for a plugin to stop
+RESTART_TIMEOUT = 15.0  # seconds to wait for a requested restart (stop + start)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+logger = logging.getLogger('hardware-daemon')
+
+
+def load_script(filename):
+    """
+    Import a handler script by file name (the dashed names are not importable).
+
+    Args:
+        filename: Script in this directory, e.g. 'button-vapi-handler.py'
+
+    Returns:
+        The module (loaded once per process)
+    """
+    name = os.path.splitext(filename)[0].replace('-', '_')
+    module = sys.modules.get(name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(SCRIPT_DIR, filename))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+    return module
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class HardwareContext:
+    """
+    Resources shared by all plugins.
+    """
+
+    def __init__(self, loop, hardware_url=HARDWARE_SERVICE_URL):
+        """
+        Set up GPIO numbering and open the push channel on the loop.
+
+        Args:
+            loop: The daemon's running event loop
+            hardware_url: hardware-service.js base URL
+        """
+        self.loop = loop
+        GPIO.setmode(GPIO.BCM)
+        self.session = get_session()
+        self.push = PushChannel(hardware_url, loop=loop)
+        self.supervisors = []   # set by serve()
+        self._i2c = None
+        self._lock = threading.Lock()
+
+    @property
+    def i2c(self):
+        """Shared busio.I2C handle (Blinka is imported on first use)."""
+        with self._lock:
+            if self._i2c is None:
+                import board
+                import busio
+                self._i2c = busio.I2C(board.SCL, board.SDA)
+            return self._i2c
+
+    def restart_plugins(self, exclude=(), timeout=RESTART_TIMEOUT):
+        """
+        Restart plugins in-process and wait until they are up again. Called
+        from plugin threads, never from the loop.
+
+        Args:
+            exclude: Plugin names to leave alone (e.g. the caller)
+            timeout: Longest to wait for all of them (seconds)
+
+        Returns:
+            Dict of name -> seconds until it was running again (None = not in time)
+        """
+        started = time.monotonic()
+        futures = {supervisor.name: asyncio.run_coroutine_threadsafe(supervisor.restart(), self.loop)
+                   for supervisor in self.supervisors if supervisor.name not in exclude}
+        results = {}
+        for name, future in futures.items():
+            try:
+                future.result(max(0.0, started + timeout - time.monotonic()))
+                results[name] = time.monotonic() - started
+            except Exception as e:
+                logger.error(f"❌ Plugin {name} did not restart: {e!r}")
+                future.cancel()
+                results[name] = None
+        return results
+
+    def close(self):
+        """Close the push channel (flushing it), write pending settings, close I2C and GPIO."""
+        self.push.close()
+        get_settings().stop()
+        if self._i2c is not None:
+            self._i2c.deinit()
+        self.session.close()
+        GPIO.cleanup()
+
+
+class Plugin:
+    """
+    A hosted handler. start(), run() and stop() are called on executor
+    threads; run() blocks until stop() and returning early counts as a crash.
+    """
+
+    name = 'plugin'
+
+    def __init__(self, context):
+        self.context = context
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Set up the handler (may raise)."""
+
+    def run(self):
+        """Block until stop() (callback-driven handlers have nothing to do)."""
+        self._stopped.wait()
+
+    def stop(self):
+        """Stop the handler and release its resources."""
+        self._stopped.set()
+
+
+class ButtonPlugin(Plugin):
+    """Mode button and AI inactivity timeout (button-vapi-handler.py)."""
+
+    name = 'button'
+    module = None
+
+    def start(self):
+        self.module = load_script('button-vapi-handler.py')
+        self.module.start(shared_push=self.context.push)
+
+    def stop(self):
+        super().stop()
+        if self.module is not None:
+            self.module.stop()
+
+
+class EncoderPlugin(Plugin):
+    """ANO rotary encoder (encoder_service.py)."""
+
+    name = 'encoder'
+    service = None
+
+    def start(self):
+        from encoder_service import EncoderService
+        self.service = EncoderService(push=self.context.push, i2c=self.context.i2c)
+
+    def run(self):
+        if not self._stopped.is_set():
+            self.service.run()
+
+    def stop(self):
+        super().stop()
+        if self.service is not None:
+            self.service.stop()
+
+
+class RebootPlugin(Plugin):
+    """Hold-to-reboot button (emergency-reboot-handler.py)."""
+
+    name = 'reboot'
+    module = None
+
+    def start(self):
+        self.module = load_script('emergency-reboot-handler.py')
+        self.module.start(restart_plugins_hook=lambda: self.context.restart_plugins(exclude=(self.name,)))
+
+    def stop(self):
+        super().stop()
+        if self.module is not None:
+            self.module.stop()
+
+
+PLUGINS = {plugin.name: plugin for plugin in (ButtonPlugin, EncoderPlugin, RebootPlugin)}
+
+
+class PluginSupervisor:
+    """
+    Runs one plugin and restarts it in-process when it crashes.
+    """
+
+    def __init__(self, plugin_class, context):
+        """
+        Initialize the supervisor.
+
+        Args:
+            plugin_class: Plugin subclass; a fresh instance is made per start
+            context: HardwareContext passed to the plugin
+        """
+        self.plugin_class = plugin_class
+        self.name = plugin_class.name
+        self.context = context
+        self.plugin = None
+        self.stopping = False
+        self._restarting = False
+        self._wake = asyncio.Event()      # ends a backoff wait early (stop/restart)
+        self._started = asyncio.Event()   # set after every successful start
+        self._task = None
+
+        # Counters
+        self.starts = 0
+        self.crashes = 0
+        self.restarts = 0
+
+    def start(self):
+        """Start supervising on the running loop."""
+        self._task = asyncio.ensure_future(self._supervise())
+
+    async def _call(self, fn):
+        return await self.context.loop.run_in_executor(None, fn)
+
+    async def _stop_plugin(self, plugin):
+        try:
+            await asyncio.wait_for(self._call(plugin.stop), STOP_TIMEOUT)
+        except Exception as e:
+            logger.error(f"❌ Plugin {self.name} did not stop cleanly: {e!r}")
+
+    async def _supervise(self):
+        delay = RESTART_MIN
+        while not self.stopping:
+            plugin = self.plugin = self.plugin_class(self.context)
+            started = time.monotonic()
+            try:
+                await self._call(plugin.start)
+                self.starts += 1
+                self._started.set()
+                logger.info(f"✓ Plugin {self.name} started in {time.monotonic() - started:.2f}s")
+                await self._call(plugin.run)
+                if not (self.stopping or self._restarting):
+                    raise RuntimeError("run() returned")
+            except Exception as e:
+                if self.stopping:
+                    return
+                if not self._restarting:
+                    self.crashes += 1
+                    logger.exception(f"❌ Plugin {self.name} crashed: {e}")
+                    await self._stop_plugin(plugin)
+            finally:
+                self.plugin = None
+
+            if self.stopping:
+                return
+            if self._restarting:
+                self._restarting = False
+                logger.info(f"🔄 Restarting plugin {self.name} on request")
+                continue
+            if time.monotonic() - started > STABLE_TIME:
+                delay = RESTART_MIN
+            logger.warning(f"⚠️  Restarting plugin {self.name} in {delay:.1f}s")
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+            if self.stopping:
+                return
+            delay = min(delay * 2, RESTART_MAX)
+
+    async def restart(self):
+        """Stop the plugin and start a fresh instance now (no backoff); returns once it is up."""
+        if self.stopping:
+            raise RuntimeError("supervisor is stopping")
+        self.restarts += 1
+        self._started.clear()
+        plugin = self.plugin
+        if plugin is None:
+            self._wake.set()   # crashed and backing off: start it now
+        else:
+            self._restarting = True
+            await self._stop_plugin(plugin)
+        await self._started.wait()
+        if self.stopping:
+            raise RuntimeError("supervisor stopped")
+
+    async def stop(self):
+        """Stop the plugin and the supervisor."""
+        self.stopping = True
+        self._wake.set()
+        self._started.set()   # release restart() waiters
+        plugin = self.plugin
+        if plugin is not None:
+            await self._stop_plugin(plugin)
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._task, STOP_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.error(f"❌ Plugin {self.name} still running after stop")
+
+
+async def serve(names):
+    """
+    Run the named plugins until SIGINT/SIGTERM.
+
+    Args:
+        names: Plugin names (keys of PLUGINS)
+    """
+    loop = asyncio.get_running_loop()
+    # Each plugin's run() holds a thread; leave room for start/stop calls
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=2 * len(names) + 2,
+                                                 thread_name_prefix='plugin'))
+
+    started = time.monotonic()
+    context = HardwareContext(loop)
+    supervisors = context.supervisors = [PluginSupervisor(PLUGINS[name], context) for name in names]
+    for supervisor in supervisors:
+        supervisor.start()
+
+    stop = asyncio.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    logger.info(f"🚀 Hosting {', '.join(names)} ({time.monotonic() - started:.2f}s, "
+                f"peak RSS {peak_rss_mb():.0f} MB)")
+    await stop.wait()
+
+    logger.info("🛑 Stopping plugins...")
+    await asyncio.gather(*(supervisor.stop() for supervisor in supervisors))
+    await loop.run_in_executor(None, context.close)
+
+    for supervisor in supervisors:
+        logger.info(f"Plugin {supervisor.name}: {supervisor.starts} starts, "
+                    f"{supervisor.crashes} crashes, {supervisor.restarts} requested restarts")
+    stats = context.push.stats()
+    logger.info(f"Push channel: {stats['sent']} events in {stats['batches']} batches, "
+                f"{stats['received']} received, {stats['reconnects']} reconnects")
+    logger.info(f"Peak RSS: {peak_rss_mb():.0f} MB")
+
+
+def main():
+    """
+    Main entry point.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler()]
+    )
+
+    names = [name.strip() for name in
+             os.environ.get("COGITO_PLUGINS", ",".join(PLUGINS)).split(",") if name.strip()]
+    unknown = [name for name in names if name not in PLUGINS]
+    if unknown:
+        logger.error(f"❌ Unknown plugin(s): {', '.join(unknown)} "
+                     f"(available: {', '.join(PLUGINS)})")
+        sys.exit(1)
+
+    logger.info("="*60)
+    logger.info("🧩 Cogito Hardware Daemon")
+    logger.info("="*60)
+
+    asyncio.run(serve(names))
+    logger.info("Hardware daemon stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -154,7 +154,7 @@ else
     echo -e "   ${BLUE}pm2 status${NC}"
     echo ""
     echo "5. View encoder logs:"
-    echo -e "   ${BLUE}pm2 logs encoder-service${NC}"
+    echo -e "   ${BLUE}pm2 logs hardware-daemon${NC}"
     echo ""
     echo -e "${YELLOW}💡 Tip: Run 'pm2 monit' for live monitoring of all services${NC}"
 fi
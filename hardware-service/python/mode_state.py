@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Optimistic Mode State Machine
+
+A button press used to block the GPIO thread on an HTTP round trip before
+anything happened locally, and the mode lived in an unlocked global touched
+from several threads. ModeStateMachine separates the two halves:
+
+- Local: request()/toggle() switch the local mode and fire on_change
+  immediately, so press-to-feedback latency is local work only.
+- Remote: a worker thread commits the latest requested mode to the server,
+  one request at a time. Presses made while a commit is in flight coalesce
+  into a single follow-up (latest wins); a follow-up that ends where the
+  server already is is dropped without a request.
+- Rollback: if a commit fails (error, rejection, or no confirmation within
+  CONFIRM_TIMEOUT) and no newer press superseded it, the local mode reverts
+  to the last confirmed mode and on_change fires again.
+
+Mode changes made elsewhere (e.g. in the UI) arrive through confirm().
+
+Usage:
+    modes = ModeStateMachine(commit=send_mode, on_change=show_mode)
+    modes.toggle()              # returns immediately
+    modes.confirm('ai')         # from the server's mode-changed broadcast
+"""
+
+import logging
+import threading
+import time
+
+
+MODES = ('radio', 'ai')
+CONFIRM_TIMEOUT = 2.0   # seconds to wait for an asynchronous confirmation
+
+logger = logging.getLogger('mode-state')
+
+
+class ModeStateMachine:
+    """
+    Locally-applied mode with asynchronous, serialized server commits.
+    """
+
+    def __init__(self, commit, on_change=None, initial=MODES[0], modes=MODES,
+                 confirm_timeout=CONFIRM_TIMEOUT):
+        """
+        Initialize and start the commit thread.
+
+        Args:
+            commit: Callable (mode) run on the worker. Returns True when the
+                    server accepted the mode, False when it refused, or None
+                    when confirmation will arrive later through confirm().
+                    Exceptions count as failure.
+            on_change: Callable (mode, reason) with reason 'local', 'remote'
+                       or 'rollback'. Runs under the state lock, so it must be
+                       quick and must not block on the network.
+            initial: Mode assumed (and treated as confirmed) at startup
+            modes: Valid modes; toggle() cycles through them in order
+            confirm_timeout: Longest wait for an asynchronous confirmation
+        """
+        self.commit = commit
+        self.on_change = on_change
+        self.modes = tuple(modes)
+        self.confirm_timeout = confirm_timeout
+
+        # RLock: on_change may read `mode` while the lock is held
+        self._cond = threading.Condition(threading.RLock())
+        self._mode = initial        # what the user sees
+        self._confirmed = initial   # what the server last reported
+        self._target = None         # mode waiting to be committed
+        self._inflight = None       # mode being committed
+        self._confirm_seq = 0       # bumped by every confirm()
+        self._running = True
+
+        # Counters
+        self.requests = 0
+        self.commits = 0
+        self.coalesced = 0
+        self.skipped = 0
+        self.failures = 0
+        self.rollbacks = 0
+
+        self._thread = threading.Thread(target=self._run, name='mode-state', daemon=True)
+        self._thread.start()
+
+    @property
+    def mode(self):
+        """Current local mode (may be ahead of the server)."""
+        return self._mode
+
+    @property
+    def confirmed(self):
+        """Last mode confirmed by the server."""
+        return self._confirmed
+
+    @property
+    def pending(self):
+        """True while a local change has not been confirmed yet."""
+        with self._cond:
+            return self._target is not None or self._inflight is not None
+
+    def request(self, mode):
+        """
+        Switch to a mode now and commit it in the background. Never blocks
+        on the network.
+
+        Args:
+            mode: One of `modes`
+
+        Returns:
+            True if the local mode changed
+        """
+        if mode not in self.modes:
+            raise ValueError(f"Unknown mode: {mode}")
+        with self._cond:
+            self.requests += 1
+            if mode == self._mode:
+                return False
+            self._mode = mode
+            if self._target is not None:
+                self.coalesced += 1
+            self._target = mode   # latest press wins
+            self._cond.notify_all()
+            self._notify(mode, 'local')
+            return True
+
+    def toggle(self):
+        """
+        Switch to the next mode (atomically with respect to other presses).
+
+        Returns:
+            The new local mode
+        """
+        with self._cond:
+            index = self.modes.index(self._mode)
+            mode = self.modes[(index + 1) % len(self.modes)]
+            self.request(mode)
+            return mode
+
+    def confirm(self, mode):
+        """
+        Record the server's mode (its mode-changed broadcast or reply).
+
+        While no local change is pending, a mode that differs from the local
+        one was changed elsewhere and is applied with reason 'remote'.
+
+        Args:
+            mode: Mode reported by the server
+
+        Returns:
+            True if this changed the confirmed mode
+        """
+        if mode not in self.modes:
+            return False
+        with self._cond:
+            changed = mode != self._confirmed
+            self._confirmed = mode
+            self._confirm_seq += 1
+            self._cond.notify_all()
+            if self._target is None and self._inflight is None and mode != self._mode:
+                self._mode = mode
+                self._notify(mode, 'remote')
+            return changed
+
+    def stats(self):
+        """Counters as a dict."""
+        with self._cond:
+            return {
+                'mode': self._mode,
+                'confirmed': self._confirmed,
+                'requests': self.requests,
+                'commits': self.commits,
+                'coalesced': self.coalesced,
+                'skipped': self.skipped,
+                'failures': self.failures,
+                'rollbacks': self.rollbacks,
+            }
+
+    def stop(self, flush=True, timeout=None):
+        """
+        Stop the commit thread.
+
+        Args:
+            flush: Commit a pending local change before stopping
+            timeout: Longest to wait (default confirm_timeout plus a margin)
+        """
+        with self._cond:
+            self._running = False
+            if not flush:
+                self._target = None
+            self._cond.notify_all()
+        self._thread.join(timeout=timeout or self.confirm_timeout + 1.0)
+
+    def _notify(self, mode, reason):
+        if self.on_change is None:
+            return
+        try:
+            self.on_change(mode, reason)
+        except Exception as e:
+            logger.error(f"❌ Mode change handler failed ({mode}, {reason}): {e}")
+
+    def _take(self):
+        """Next mode to commit, or None on stop."""
+        with self._cond:
+            while True:
+                if self._target is not None:
+                    mode, self._target = self._target, None
+                    if mode == self._confirmed:
+                        self.skipped += 1   # presses cancelled out
+                        continue
+                    self._inflight = mode
+                    return mode
+                if not self._running:
+                    return None
+                self._cond.wait()
+
+    def _await_confirm(self, mode, seq):
+        """Wait for a confirm() after `seq`; True if it reported `mode`."""
+        deadline = time.monotonic() + self.confirm_timeout
+        with self._cond:
+            while self._confirm_seq == seq:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(f"⚠️  No confirmation for mode {mode} "
+                                   f"within {self.confirm_timeout}s")
+                    return False
+                self._cond.wait(remaining)
+            return self._confirmed == mode
+
+    def _run(self):
+        while True:
+            mode = self._take()
+            if mode is None:
+                return
+
+            with self._cond:
+                seq = self._confirm_seq
+            try:
+                ok = self.commit(mode)
+                if ok is None:
+                    ok = self._await_confirm(mode, seq)
+            except Exception as e:
+                logger.error(f"❌ Mode commit failed ({mode}): {e}")
+                ok = False
+
+            with self._cond:
+                self._inflight = None
+                if ok:
+                    self._confirmed = mode
+                    self.commits += 1
+                    continue
+
+                self.failures += 1
+                if self._target is not None or self._mode != mode:
+                    continue   # a newer press supersedes this one
+                self._mode = self._confirmed
+                self.rollbacks += 1
+                logger.warning(f"⚠️  Mode {mode} not confirmed, rolling back to {self._mode}")
+                self._notify(self._mode, 'rollback')
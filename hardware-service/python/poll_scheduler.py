@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Adaptive Poll-Rate Scheduler
+
+The encoder and button loops used to sleep a fixed 10 ms (50 ms for the
+reboot button) after each pass, 24/7, on a device that is idle most of the
+day. PollScheduler polls fast while someone is interacting and backs off
+step by step to a slow idle rate:
+
+    activity -> FAST_INTERVAL for ACTIVE_HOLD seconds
+             -> interval doubles every BACKOFF_STEP seconds
+             -> capped at IDLE_INTERVAL
+
+Ticks are scheduled on monotonic deadlines (deadline += interval) rather
+than sleeping after the work, so loop time does not stretch the period.
+Wake-up lateness is recorded as jitter.
+
+Usage:
+    scheduler = PollScheduler()
+    while True:
+        if poll_hardware():
+            scheduler.activity()
+        scheduler.wait()
+    print(scheduler.report())
+"""
+
+import time
+
+
+FAST_INTERVAL = 0.005   # seconds between polls while active
+IDLE_INTERVAL = 0.1     # slowest poll rate
+ACTIVE_HOLD = 3.0       # seconds at the fast rate after the last activity
+BACKOFF_STEP = 1.0      # seconds per doubling of the interval after the hold
+
+
+class PollScheduler:
+    """
+    Monotonic-deadline loop pacing with activity-based backoff.
+    """
+
+    def __init__(self, fast=FAST_INTERVAL, idle=IDLE_INTERVAL,
+                 hold=ACTIVE_HOLD, step=BACKOFF_STEP):
+        """
+        Initialize the scheduler (starts in the active state).
+
+        Args:
+            fast: Poll interval right after activity (seconds)
+            idle: Poll interval when idle (seconds)
+            hold: How long to stay at the fast rate after activity (seconds)
+            step: Time per interval doubling during backoff (seconds)
+        """
+        self.fast = fast
+        self.idle = idle
+        self.hold = hold
+        self.step = step
+
+        now = time.monotonic()
+        self._last_activity = now
+        self._deadline = now
+
+        # Jitter statistics (seconds)
+        self.loops = 0
+        self.overruns = 0
+        self._jitter_total = 0.0
+        self._jitter_max = 0.0
+
+    def activity(self):
+        """Mark user activity: return to the fast rate immediately."""
+        now = time.monotonic()
+        self._last_activity = now
+        # Do not wait out a long idle interval that is already scheduled
+        self._deadline = min(self._deadline, now + self.fast)
+
+    @property
+    def interval(self):
+        """Current poll interval (seconds)."""
+        quiet = time.monotonic() - self._last_activity
+        if quiet < self.hold:
+            return self.fast
+        doublings = int((quiet - self.hold) / self.step) + 1
+        return min(self.idle, self.fast * (2 ** doublings))
+
+    def wait(self):
+        """
+        Sleep until the next deadline.
+
+        If the loop body overran the deadline, no sleep happens and the
+        schedule restarts from now (no burst of catch-up polls).
+        """
+        self._deadline += self.interval
+        now = time.monotonic()
+        if self._deadline <= now:
+            self.overruns += 1
+            self._deadline = now
+            return
+
+        time.sleep(self._deadline - now)
+        late = time.monotonic() - self._deadline
+        self.loops += 1
+        self._jitter_total += late
+        self._jitter_max = max(self._jitter_max, late)
+
+    def stats(self):
+        """Loop and jitter statistics as a dict (times in ms)."""
+        return {
+            'interval_ms': self.interval * 1000,
+            'loops': self.loops,
+            'overruns': self.overruns,
+            'jitter_avg_ms': self._jitter_total / self.loops * 1000 if self.loops else 0.0,
+            'jitter_max_ms': self._jitter_max * 1000,
+        }
+
+    def report(self):
+        """One-line summary of stats()."""
+        s = self.stats()
+        return (f"{s['loops']} loops, {s['overruns']} overruns, "
+                f"jitter avg {s['jitter_avg_ms']:.2f}ms / max {s['jitter_max_ms']:.2f}ms")
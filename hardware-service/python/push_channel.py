@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Persistent Push Channel to hardware-service.js
+
+The hardware services used to make one HTTP POST per event and to poll for
+state. PushChannel keeps a single Socket.io connection (Engine.IO v4 over a
+WebSocket, via the `websockets` library) open to hardware-service.js:
+
+- Outgoing: send() queues a hardware event and returns immediately. Events
+  are sent in batches as one "hardware-events" message (after BATCH_WINDOW),
+  and consecutive scan events are merged into one with the net steps.
+- Incoming: every Socket.io event the server broadcasts (mode-changed,
+  radio-state-update, speech-activity, ...) is passed to on_event, so
+  changes made in the UI arrive without polling.
+- While disconnected, events are buffered (up to MAX_BUFFER, oldest dropped)
+  and the connection is retried with exponential backoff plus jitter.
+
+Delivery is at most once: a batch already written to a connection that then
+drops is not re-sent. Callers check `connected` and use their HTTP path otherwise.
+
+The channel runs on its own thread and event loop by default; pass `loop` to
+run it on an existing asyncio loop instead (hardware_daemon.py shares one
+channel between its plugins, each registering a handler with subscribe()).
+
+Usage:
+    push = PushChannel(on_event=lambda name, data: print(name, data))
+    push.send('scan', steps=+2)
+    push.close()
+"""
+
+import asyncio
+import collections
+import json
+import logging
+import random
+import threading
+from urllib.parse import urlsplit
+
+import websockets
+
+
+HARDWARE_SERVICE_URL = "http://localhost:3001"
+EVENT_NAME = "hardware-events"
+BATCH_WINDOW = 0.02      # seconds to collect events into one message
+MAX_BUFFER = 256         # events kept while disconnected
+RECONNECT_MIN = 0.5      # seconds, first retry delay
+RECONNECT_MAX = 30.0     # seconds, backoff cap
+OPEN_TIMEOUT = 5.0       # seconds for connect + Socket.io handshake
+
+# Engine.IO / Socket.IO packet prefixes
+EIO_OPEN, EIO_CLOSE, EIO_PING, EIO_PONG, EIO_MESSAGE = '0', '1', '2', '3', '4'
+SIO_CONNECT, SIO_DISCONNECT, SIO_EVENT, SIO_CONNECT_ERROR = '0', '1', '2', '4'
+
+logger = logging.getLogger('push-channel')
+
+
+class PushChannel:
+    """
+    Batched, buffered, auto-reconnecting Socket.io client on its own thread.
+    """
+
+    def __init__(self, url=HARDWARE_SERVICE_URL, on_event=None, loop=None):
+        """
+        Initialize and start connecting in the background.
+
+        Args:
+            url: hardware-service.js base URL
+            on_event: Callable (name, data) for events from the server. Runs
+                      on the channel's loop, so it must not block.
+            loop: Running asyncio loop to use (default: own thread and loop)
+        """
+        self.ws_url = f"ws://{urlsplit(url).netloc}/socket.io/?EIO=4&transport=websocket"
+        self._listeners = [on_event] if on_event is not None else []
+
+        self._lock = threading.Lock()
+        self._buffer = collections.deque()
+        self._connected = False
+        self._stopping = False
+        self._wake = None     # asyncio.Events, created on the loop
+        self._stop = None
+
+        # Counters
+        self.sent = 0
+        self.batches = 0
+        self.merged = 0
+        self.dropped = 0
+        self.received = 0
+        self.reconnects = 0
+
+        if loop is not None:
+            self._loop = loop
+            self._thread = None
+            self._task = asyncio.run_coroutine_threadsafe(self._main(), loop)
+            return
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._thread_main, name='push-channel', daemon=True)
+        self._thread.start()
+
+    @property
+    def connected(self):
+        """True while the Socket.io session is established."""
+        return self._connected
+
+    def subscribe(self, on_event):
+        """
+        Add a handler for events from the server.
+
+        Args:
+            on_event: Callable (name, data); runs on the channel's loop
+        """
+        with self._lock:
+            self._listeners = self._listeners + [on_event]
+
+    def unsubscribe(self, on_event):
+        """Remove a handler added with subscribe() (or passed as on_event)."""
+        with self._lock:
+            self._listeners = [f for f in self._listeners if f != on_event]
+
+    def send(self, event_type, **data):
+        """
+        Queue a hardware event. Never blocks.
+
+        Args:
+            event_type: Event type, e.g. 'scan', 'mode', 'select'
+            **data: Event fields, e.g. steps=1 or mode='ai'
+        """
+        event = dict(data, type=event_type)
+        with self._lock:
+            last = self._buffer[-1] if self._buffer else None
+            if event_type == 'scan' and last is not None and last['type'] == 'scan':
+                last['steps'] += event['steps']
+                self.merged += 1
+            else:
+                if len(self._buffer) >= MAX_BUFFER:
+                    self._buffer.popleft()
+                    self.dropped += 1
+                self._buffer.append(event)
+        try:
+            self._loop.call_soon_threadsafe(self._kick)
+        except RuntimeError:
+            pass  # Channel closed; the event stays buffered
+
+    def stats(self):
+        """Counters as a dict."""
+        with self._lock:
+            return {
+                'connected': self._connected,
+                'sent': self.sent,
+                'batches': self.batches,
+                'merged': self.merged,
+                'dropped': self.dropped,
+                'received': self.received,
+                'reconnects': self.reconnects,
+                'buffered': len(self._buffer),
+            }
+
+    def close(self, timeout=1.0):
+        """
+        Flush buffered events if connected, then disconnect.
+
+        Must not be called from the loop the channel runs on.
+
+        Args:
+            timeout: Longest to wait for the flush (seconds)
+        """
+        self._stopping = True
+        try:
+            self._loop.call_soon_threadsafe(self._kick, True)
+        except RuntimeError:
+            return  # Already closed
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            return
+        try:
+            self._task.result(timeout=timeout)
+        except Exception:
+            self._task.cancel()
+
+    def _kick(self, stop=False):
+        """Wake the writer (and the backoff wait on stop); runs on the loop."""
+        if self._wake is not None:
+            self._wake.set()
+        if stop and self._stop is not None:
+            self._stop.set()
+
+    def _thread_main(self):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._main())
+        finally:
+            self._loop.close()
+
+    async def _main(self):
+        self._wake = asyncio.Event()
+        self._stop = asyncio.Event()
+        if self._buffer:
+            self._wake.set()   # sent before the loop picked us up
+        delay = RECONNECT_MIN
+        while not self._stopping:
+            try:
+                async with websockets.connect(self.ws_url, open_timeout=OPEN_TIMEOUT) as ws:
+                    await asyncio.wait_for(self._handshake(ws), OPEN_TIMEOUT)
+                    self._connected = True
+                    delay = RECONNECT_MIN
+                    logger.info(f"✓ Push channel connected ({self.ws_url})")
+                    await self._session(ws)
+                    if not self._stopping:
+                        logger.warning("⚠️  Push channel closed by server")
+            except (OSError, asyncio.TimeoutError, ConnectionError, ValueError,
+                    websockets.exceptions.WebSocketException) as e:
+                if self._connected:
+                    logger.warning(f"⚠️  Push channel lost: {e}")
+                else:
+                    logger.debug(f"Push channel connect failed: {e}")
+            finally:
+                self._connected = False
+
+            if self._stopping:
+                return
+
+            # Exponential backoff with jitter; only close() cuts it short
+            try:
+                await asyncio.wait_for(self._stop.wait(), delay * random.uniform(0.8, 1.2))
+                return
+            except asyncio.TimeoutError:
+                pass
+            delay = min(delay * 2, RECONNECT_MAX)
+            self.reconnects += 1
+
+    async def _handshake(self, ws):
+        """Engine.IO open, then Socket.IO connect to the default namespace."""
+        packet = await ws.recv()
+        if not packet.startswith(EIO_OPEN):
+            raise ValueError(f"Unexpected Engine.IO packet: {packet[:20]}")
+        await ws.send(EIO_MESSAGE + SIO_CONNECT)
+
+        while True:
+            packet = await ws.recv()
+            if packet == EIO_PING:
+                await ws.send(EIO_PONG)
+            elif packet.startswith(EIO_MESSAGE + SIO_CONNECT):
+                return
+            elif packet.startswith(EIO_MESSAGE + SIO_CONNECT_ERROR):
+                raise ConnectionError(f"Socket.io connect refused: {packet[2:]}")
+
+    async def _session(self, ws):
+        """Run reader and writer until either ends; the other is cancelled."""
+        tasks = [asyncio.ensure_future(self._reader(ws)), asyncio.ensure_future(self._writer(ws))]
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            task.result()  # re-raise connection errors
+
+    async def _reader(self, ws):
+        async for packet in ws:
+            if packet == EIO_PING:
+                await ws.send(EIO_PONG)
+            elif packet == EIO_CLOSE or packet.startswith(EIO_MESSAGE + SIO_DISCONNECT):
+                raise ConnectionError("Server closed the session")
+            elif packet.startswith(EIO_MESSAGE + SIO_EVENT):
+                self._dispatch(packet[2:])
+
+    def _dispatch(self, payload):
+        """Decode '["name", data]' (an optional ack id may precede it)."""
+        try:
+            message = json.loads(payload[payload.index('['):])
+        except ValueError:
+            return
+        self.received += 1
+        if not message:
+            return
+        for on_event in self._listeners:
+            try:
+                on_event(message[0], message[1] if len(message) > 1 else None)
+            except Exception as e:
+                logger.error(f"❌ Push event handler failed for {message[0]}: {e}")
+
+    async def _writer(self, ws):
+        while True:
+            if not self._stopping:
+                await self._wake.wait()
+                self._wake.clear()
+                await asyncio.sleep(BATCH_WINDOW)
+
+            with self._lock:
+                batch = list(self._buffer)
+                self._buffer.clear()
+
+            if batch:
+                try:
+                    await ws.send(EIO_MESSAGE + SIO_EVENT + json.dumps([EVENT_NAME, batch]))
+                except websockets.exceptions.ConnectionClosed:
+                    with self._lock:
+                        self._buffer.extendleft(reversed(batch))  # resend after reconnect
+                    raise
+                with self._lock:
+                    self.sent += len(batch)
+                    self.batches += 1
+
+            if self._stopping:
+                return
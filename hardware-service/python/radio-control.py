@@ -1,145 +1,214 @@
 #!/usr/bin/env python3
 """
 TEA5767 FM Radio Control Script
-Commands: on, off, set, up, down, stop, resume, status
+Commands: on, off, set, up, down, preset, save-preset, presets, stop, resume, status
+
+If radio_daemon.py is running, commands are forwarded to it over its Unix
+socket; otherwise the script drives the TEA5767 directly through
+radio_tuner.RadioTuner.
 """
 
 import sys
-import smbus2
-import os
-
-TEA5767_ADDR = 0x60
-I2C_BUS = 1
-DEFAULT_FREQ = 99.1
-FREQ_MIN = 87.5
-FREQ_MAX = 108.0
-STEP = 0.1
-
-STATE_FILE = "/tmp/radio_state.txt"
 
-def freq_to_pll(freq_mhz):
-    """Convert frequency in MHz to PLL word"""
-    return int(4 * (freq_mhz * 1000000 + 225000) / 32768)
+from radio_daemon import SEEK_CLIENT_TIMEOUT, SURVEY_CLIENT_TIMEOUT, send_command
+from radio_tuner import RadioTuner
 
-def pll_to_freq(pll):
-    """Convert PLL word to frequency in MHz"""
-    return ((pll * 32768 / 4) - 225000) / 1000000
-
-def save_state(freq_mhz):
-    """Save current frequency to state file"""
+def _run(action):
+    """Open a tuner, run one action on it and report errors"""
     try:
-        with open(STATE_FILE, 'w') as f:
-            f.write(str(freq_mhz))
-    except:
-        pass
+        with RadioTuner() as tuner:
+            result = action(tuner)
+    except OSError as e:
+        result = {'ok': False, 'error': str(e)}
 
-def load_state():
-    """Load last frequency from state file"""
-    try:
-        if os.path.exists(STATE_FILE):
-            with open(STATE_FILE, 'r') as f:
-                return float(f.read().strip())
-    except:
-        pass
-    return DEFAULT_FREQ
+    if not result['ok']:
+        print(f"❌ Error: {result['error']}")
+    return result
 
 def set_frequency(freq_mhz):
     """Set TEA5767 to specific frequency"""
-    if freq_mhz < FREQ_MIN or freq_mhz > FREQ_MAX:
-        print(f"❌ Frequency {freq_mhz} out of range ({FREQ_MIN}-{FREQ_MAX})")
-        return False
-    
-    pll = freq_to_pll(freq_mhz)
-    
-    data = [
-        (pll >> 8) & 0x3F,
-        pll & 0xFF,
-        0xB0,
-        0x10,
-        0x00
-    ]
-    
-    try:
-        bus = smbus2.SMBus(I2C_BUS)
-        msg = smbus2.i2c_msg.write(TEA5767_ADDR, data)
-        bus.i2c_rdwr(msg)
-        bus.close()
-
-        save_state(freq_mhz)
-        print(f"📻 Tuned to {freq_mhz:.1f} MHz")
-        return True
-
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        return False
+    result = _run(lambda tuner: tuner.set_frequency(freq_mhz))
+    if result['ok']:
+        print(f"📻 Tuned to {result['frequency']:.1f} MHz")
+    return result['ok']
 
 def radio_on():
     """Turn radio ON at last/default frequency"""
-    freq = load_state()
     print(f"📻 RADIO ON")
-    return set_frequency(freq)
+    result = _run(lambda tuner: tuner.radio_on())
+    if result['ok']:
+        print(f"📻 Tuned to {result['frequency']:.1f} MHz")
+    return result['ok']
 
 def radio_off():
     """Turn radio OFF (mute)"""
-    try:
-        bus = smbus2.SMBus(I2C_BUS)
-        data = [0x80, 0x00, 0xB0, 0x10, 0x00]
-        msg = smbus2.i2c_msg.write(TEA5767_ADDR, data)
-        bus.i2c_rdwr(msg)
-        bus.close()
-        
+    result = _run(lambda tuner: tuner.radio_off())
+    if result['ok']:
         print("📻 RADIO OFF")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        return False
+    return result['ok']
+
+def _scan(direction):
+    """Scan one step up or down"""
+    def action(tuner):
+        current_freq = tuner.frequency
+        result = tuner.scan_up() if direction == "up" else tuner.scan_down()
+        if result['ok']:
+            print(f"📻 Scanning {direction}: {current_freq:.1f} → {result['frequency']:.1f} MHz")
+        return result
+
+    result = _run(action)
+    if result['ok']:
+        print(f"📻 Tuned to {result['frequency']:.1f} MHz")
+    return result['ok']
+
+def step(delta):
+    """Move by several channels in one tune"""
+    result = _run(lambda tuner: tuner.step(delta))
+    if result['ok']:
+        print(f"📻 Tuned to {result['frequency']:.1f} MHz")
+    return result['ok']
 
 def scan_up():
     """Scan up by one step"""
-    current_freq = load_state()
-    new_freq = min(current_freq + STEP, FREQ_MAX)
-    print(f"📻 Scanning up: {current_freq:.1f} → {new_freq:.1f} MHz")
-    return set_frequency(new_freq)
+    return _scan("up")
 
 def scan_down():
     """Scan down by one step"""
-    current_freq = load_state()
-    new_freq = max(current_freq - STEP, FREQ_MIN)
-    print(f"📻 Scanning down: {current_freq:.1f} → {new_freq:.1f} MHz")
-    return set_frequency(new_freq)
+    return _scan("down")
+
+def seek(direction):
+    """Seek to the next station up or down"""
+    result = _run(lambda tuner: tuner.seek(direction))
+    if result['ok']:
+        print(f"📻 Seek {direction} ({result['method']}): signal {result['signal']}/15")
+        print(f"📻 Tuned to {result['frequency']:.1f} MHz")
+    return result['ok']
+
+def recall_preset(slot):
+    """Tune to a preset (one I2C write)"""
+    result = _run(lambda tuner: tuner.recall_preset(slot))
+    if result['ok']:
+        print(f"📻 Tuned to {result['frequency']:.1f} MHz")
+    return result['ok']
+
+def save_preset(slot):
+    """Store the current station in a preset"""
+    result = _run(lambda tuner: tuner.save_preset(slot))
+    if result['ok']:
+        print(f"📻 {result['message']}")
+    return result['ok']
+
+def print_presets(presets):
+    """Print the preset bank"""
+    if not presets:
+        print("📻 No presets saved - run: python3 radio-control.py save-preset <n>")
+        return
+    for preset in presets:
+        print(f"📻 Preset {preset['slot']}: {preset['frequency']:.1f} MHz")
+
+def list_presets():
+    """Print the preset bank without touching the tuner"""
+    result = _run(lambda tuner: {'ok': True, 'presets': tuner.list_presets()})
+    if result['ok']:
+        print_presets(result['presets'])
+    return result['ok']
+
+def print_stations(stations):
+    """Print the station list from the index"""
+    if not stations:
+        print("📻 No stations indexed - run: python3 radio-control.py survey")
+        return
+    for station in stations:
+        stereo = "Stereo" if station['stereo'] else "Mono"
+        print(f"📻 {station['frequency']:.1f} MHz  {station['signal']:2d}/15  {stereo}")
+
+def survey(refresh):
+    """Sweep the band and update the station index"""
+    result = _run(lambda tuner: tuner.survey(refresh=refresh))
+    if result['ok']:
+        print(f"📻 Probed {result['probed']} channels in {result['duration']:.1f}s")
+        print_stations(result['stations'])
+    return result['ok']
+
+def list_stations():
+    """Print stations from the index without touching the tuner"""
+    result = _run(lambda tuner: {'ok': True, 'stations': tuner.list_stations()})
+    if result['ok']:
+        print_stations(result['stations'])
+    return result['ok']
+
+def optimize():
+    """Re-run the injection side / AFC pass on the current station"""
+    result = _run(lambda tuner: tuner.optimize())
+    if result['ok']:
+        print(f"📻 {result['message']} (trim {result['trim']:+d})")
+    return result['ok']
 
 def get_status():
     """Read current radio status"""
-    try:
-        bus = smbus2.SMBus(I2C_BUS)
-        msg = smbus2.i2c_msg.read(TEA5767_ADDR, 5)
-        bus.i2c_rdwr(msg)
-        status = list(msg)
-        bus.close()
-
-        ready = (status[0] & 0x80) >> 7
-        band_limit = (status[0] & 0x40) >> 6
-        pll = ((status[0] & 0x3F) << 8) | status[1]
-        freq = pll_to_freq(pll)
-        signal = (status[3] >> 4) & 0x0F
-        stereo = (status[2] & 0x80) >> 7
-
-        print("="*40)
-        print("📻 TEA5767 Radio Status")
-        print("="*40)
-        print(f"Frequency:    {freq:.2f} MHz")
-        print(f"Signal Level: {signal}/15 {'█' * signal}")
-        print(f"Stereo:       {'Yes' if stereo else 'Mono'}")
-        print(f"Ready:        {'Yes' if ready else 'No'}")
-        print(f"Band Limit:   {'Yes' if band_limit else 'No'}")
-        print("="*40)
-        return True
-
-    except Exception as e:
-        print(f"❌ Error: {e}")
+    result = _run(lambda tuner: tuner.get_status())
+    if result['ok']:
+        print_status(
+            freq=result['frequency'],
+            signal=result['signal'],
+            stereo=result['stereo'],
+            ready=result['ready'],
+            band_limit=result['band_limit']
+        )
+    return result['ok']
+
+def print_status(freq, signal, stereo, ready, band_limit):
+    """Print radio status block (parsed by hardware-service.js)"""
+    print("="*40)
+    print("📻 TEA5767 Radio Status")
+    print("="*40)
+    print(f"Frequency:    {freq:.2f} MHz")
+    print(f"Signal Level: {signal}/15 {'█' * signal}")
+    print(f"Stereo:       {'Yes' if stereo else 'Mono'}")
+    print(f"Ready:        {'Yes' if ready else 'No'}")
+    print(f"Band Limit:   {'Yes' if band_limit else 'No'}")
+    print("="*40)
+
+def run_via_daemon(cmd, params, timeout=None):
+    """Forward a command to radio_daemon.py. Returns False if it is not running."""
+    if timeout is not None:
+        params['timeout'] = timeout
+    resp = send_command(cmd, **params)
+    if resp is None:
         return False
 
+    if not resp.get('ok'):
+        print(f"❌ Error: {resp.get('error')}")
+        sys.exit(1)
+
+    if cmd == "status":
+        print_status(
+            freq=resp['frequency'],
+            signal=resp['signal'],
+            stereo=resp['stereo'],
+            ready=resp['ready'],
+            band_limit=resp['band_limit']
+        )
+    elif cmd in ("off", "stop"):
+        print("📻 RADIO OFF")
+    elif cmd == "survey":
+        print(f"📻 Probed {resp['probed']} channels in {resp['duration']:.1f}s")
+        print_stations(resp['stations'])
+    elif cmd == "stations":
+        print_stations(resp['stations'])
+    elif cmd == "optimize":
+        print(f"📻 {resp['message']} (trim {resp['trim']:+d})")
+    elif cmd == "save_preset":
+        print(f"📻 {resp['message']}")
+    elif cmd == "presets":
+        print_presets(resp['presets'])
+    elif cmd == "seek":
+        print(f"📻 Seek {params['direction']} ({resp['method']}): signal {resp['signal']}/15")
+        print(f"📻 Tuned to {resp['frequency']:.1f} MHz")
+    else:
+        print(f"📻 Tuned to {resp['frequency']:.1f} MHz")
+    return True
+
 def show_usage():
     """Show usage information"""
     print("TEA5767 FM Radio Control")
@@ -150,6 +219,15 @@ def show_usage():
     print("  python3 radio-control.py set <freq>    - Tune to frequency")
     print("  python3 radio-control.py up            - Scan up 0.1 MHz")
     print("  python3 radio-control.py down          - Scan down 0.1 MHz")
+    print("  python3 radio-control.py step <n>      - Move n channels (negative = down)")
+    print("  python3 radio-control.py seek up|down  - Seek to next station")
+    print("  python3 radio-control.py survey        - Sweep band, build station index")
+    print("  python3 radio-control.py survey refresh - Re-probe stale/marginal channels")
+    print("  python3 radio-control.py stations      - List indexed stations")
+    print("  python3 radio-control.py optimize      - Pick best injection side for this station")
+    print("  python3 radio-control.py preset <n>    - Tune to preset n")
+    print("  python3 radio-control.py save-preset <n> - Save this station as preset n")
+    print("  python3 radio-control.py presets       - List presets")
     print("  python3 radio-control.py stop          - Mute radio (alias for off)")
     print("  python3 radio-control.py resume        - Resume radio (alias for on)")
     print("  python3 radio-control.py status        - Show radio status")
@@ -158,6 +236,7 @@ def show_usage():
     print("  python3 radio-control.py on")
     print("  python3 radio-control.py set 99.1")
     print("  python3 radio-control.py up")
+    print("  python3 radio-control.py seek up")
     print("  python3 radio-control.py status")
     print("="*40)
 
@@ -167,7 +246,71 @@ def main():
         sys.exit(1)
     
     cmd = sys.argv[1].lower()
-    
+
+    if cmd in ("on", "off", "up", "down", "stop", "resume", "status"):
+        if run_via_daemon(cmd, {}):
+            return
+    elif cmd == "set" and len(sys.argv) >= 3:
+        try:
+            if run_via_daemon(cmd, {'freq': float(sys.argv[2])}):
+                return
+        except ValueError:
+            pass
+    elif cmd == "step":
+        try:
+            delta = int(sys.argv[2])
+        except (IndexError, ValueError):
+            print("❌ Missing or invalid step count!")
+            print("Usage: python3 radio-control.py step -3")
+            sys.exit(1)
+        if run_via_daemon(cmd, {'delta': delta}):
+            return
+        step(delta)
+        return
+    elif cmd == "seek":
+        direction = sys.argv[2].lower() if len(sys.argv) >= 3 else "up"
+        if direction not in ("up", "down"):
+            print(f"❌ Invalid seek direction: {direction}")
+            sys.exit(1)
+        if run_via_daemon(cmd, {'direction': direction}, timeout=SEEK_CLIENT_TIMEOUT):
+            return
+        seek(direction)
+        return
+    elif cmd == "survey":
+        refresh = len(sys.argv) >= 3 and sys.argv[2].lower() == "refresh"
+        if run_via_daemon(cmd, {'refresh': refresh}, timeout=SURVEY_CLIENT_TIMEOUT):
+            return
+        survey(refresh)
+        return
+    elif cmd == "stations":
+        if run_via_daemon(cmd, {}):
+            return
+        list_stations()
+        return
+    elif cmd == "optimize":
+        if run_via_daemon(cmd, {}, timeout=SEEK_CLIENT_TIMEOUT):
+            return
+        optimize()
+        return
+    elif cmd in ("preset", "save-preset"):
+        try:
+            slot = int(sys.argv[2])
+        except (IndexError, ValueError):
+            print("❌ Missing or invalid preset number!")
+            sys.exit(1)
+        action = cmd.replace("-", "_")
+        if not run_via_daemon(action, {'slot': slot}):
+            if action == "preset":
+                recall_preset(slot)
+            else:
+                save_preset(slot)
+        return
+    elif cmd == "presets":
+        if run_via_daemon(cmd, {}):
+            return
+        list_presets()
+        return
+
     if cmd == "on":
         radio_on()
     
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+TEA5767 Radio Daemon - Resident radio control over a Unix socket
+
+Running radio-control.py for every tune forks a fresh interpreter, opens the
+I2C bus, reads the state file, writes 5 bytes and exits. This daemon keeps
+the bus open and the tuner state in memory so a command costs a single
+socket round-trip plus one I2C transaction.
+
+Protocol (newline-delimited JSON over SOCKET_PATH):
+    Request:  {"cmd": "set", "freq": 99.1}
+    Response: {"ok": true, "frequency": 99.1, "message": "Tuned to 99.1 MHz"}
+
+Commands: on, off, set, up, down, step, seek, survey, stations, optimize,
+preset, save_preset, presets, stop, resume, status, checkpoint, ping
+
+A connection may send any number of requests; each gets exactly one
+response line. radio-control.py uses send_command() and falls back to
+direct I2C access only when the daemon is not running; a command the
+daemon may have received is never repeated locally.
+
+Run:
+    python3 radio_daemon.py
+"""
+
+import json
+import logging
+import math
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+from radio_tuner import I2C_BUS, RadioTuner
+
+
+# Configuration
+SOCKET_PATH = os.environ.get("COGITO_RADIO_SOCKET", "/tmp/cogito-radio.sock")
+CLIENT_TIMEOUT = 1.0  # seconds, allows a first-tune quality pass
+SEEK_CLIENT_TIMEOUT = 7.0  # seconds, covers hardware search plus fallback
+SURVEY_CLIENT_TIMEOUT = 30.0  # seconds, full band at maximum dwell
+
+logger = logging.getLogger('radio-daemon')
+
+
+class RadioDaemon:
+    """
+    Serves commands against a single long-lived RadioTuner.
+
+    All hardware access goes through a single lock so concurrent clients
+    never interleave I2C transactions.
+    """
+
+    def __init__(self, tuner=None):
+        """
+        Initialize the daemon.
+
+        Args:
+            tuner: RadioTuner instance (opens the default bus if None)
+        """
+        self.tuner = tuner or RadioTuner()
+        self.lock = threading.Lock()
+
+    def cmd_on(self, request):
+        return self.tuner.radio_on()
+
+    def cmd_off(self, request):
+        return self.tuner.radio_off()
+
+    def cmd_set(self, request):
+        try:
+            freq = float(request['freq'])
+        except (KeyError, TypeError, ValueError):
+            freq = math.nan
+        if not math.isfinite(freq):
+            return {'ok': False, 'error': f"Invalid frequency: {request.get('freq')}"}
+        return self.tuner.set_frequency(freq)
+
+    def cmd_up(self, request):
+        return self.tuner.scan_up()
+
+    def cmd_down(self, request):
+        return self.tuner.scan_down()
+
+    def cmd_step(self, request):
+        try:
+            delta = int(request['delta'])
+        except (KeyError, TypeError, ValueError, OverflowError):
+            return {'ok': False, 'error': f"Invalid step: {request.get('delta')}"}
+        return self.tuner.step(delta)
+
+    def cmd_seek(self, request):
+        return self.tuner.seek(
+            direction=request.get('direction', 'up'),
+            level=request.get('level', 'mid')
+        )
+
+    def cmd_survey(self, request):
+        return self.tuner.survey(refresh=bool(request.get('refresh', False)))
+
+    def cmd_optimize(self, request):
+        return self.tuner.optimize()
+
+    def cmd_stations(self, request):
+        return {'ok': True, 'stations': self.tuner.list_stations()}
+
+    def cmd_preset(self, request):
+        try:
+            slot = int(request['slot'])
+        except (KeyError, TypeError, ValueError, OverflowError):
+            return {'ok': False, 'error': f"Invalid preset: {request.get('slot')}"}
+        return self.tuner.recall_preset(slot)
+
+    def cmd_save_preset(self, request):
+        try:
+            slot = int(request['slot'])
+        except (KeyError, TypeError, ValueError, OverflowError):
+            return {'ok': False, 'error': f"Invalid preset: {request.get('slot')}"}
+        return self.tuner.save_preset(slot)
+
+    def cmd_presets(self, request):
+        return {'ok': True, 'presets': self.tuner.list_presets()}
+
+    def cmd_status(self, request):
+        return self.tuner.get_status()
+
+    def cmd_checkpoint(self, request):
+        self.tuner.save_state(sync=True)
+        return {
+            'ok': True,
+            'frequency': self.tuner.frequency,
+            'muted': self.tuner.muted,
+            'message': "State saved"
+        }
+
+    def cmd_ping(self, request):
+        return {'ok': True, 'frequency': self.tuner.frequency, 'muted': self.tuner.muted}
+
+    # Aliases kept for compatibility with radio-control.py
+    cmd_stop = cmd_off
+    cmd_resume = cmd_on
+
+    def handle(self, request):
+        """
+        Dispatch a single request.
+
+        Args:
+            request: Decoded request (a dict with a 'cmd' key)
+
+        Returns:
+            Response dict (always contains 'ok'; never raises)
+        """
+        if not isinstance(request, dict):
+            return {'ok': False, 'error': "Request must be a JSON object"}
+        cmd = str(request.get('cmd', '')).lower()
+        handler = getattr(self, f"cmd_{cmd}", None)
+        if handler is None:
+            return {'ok': False, 'error': f"Unknown command: {cmd}"}
+
+        try:
+            with self.lock:
+                response = handler(request)
+        except Exception as e:
+            # One bad request must not drop the connection without a reply
+            logger.exception(f"❌ '{cmd}' raised: {e}")
+            return {'ok': False, 'error': str(e)}
+
+        if not response['ok']:
+            logger.error(f"❌ '{cmd}' failed: {response['error']}")
+        return response
+
+    def close(self):
+        """Close the I2C bus."""
+        with self.lock:
+            self.tuner.close()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Reads JSON requests line by line until the client disconnects."""
+
+    def handle(self):
+        for line in self.rfile:
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                request = json.loads(line)
+            except ValueError:
+                response = {'ok': False, 'error': "Malformed request"}
+            else:
+                response = self.server.radio.handle(request)
+
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+
+class RadioServer(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server bound to a RadioDaemon."""
+
+    daemon_threads = True
+
+    def __init__(self, radio, socket_path=SOCKET_PATH):
+        self.radio = radio
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, _RequestHandler)
+        os.chmod(socket_path, 0o666)
+
+
+def send_command(cmd, timeout=CLIENT_TIMEOUT, socket_path=SOCKET_PATH, **params):
+    """
+    Send one command to the running daemon.
+
+    Args:
+        cmd: Command name (on, off, set, up, down, stop, resume, status)
+        timeout: Socket timeout in seconds
+        socket_path: Path of the daemon's Unix socket
+        **params: Extra request fields (e.g. freq=99.1)
+
+    Only a daemon that is not running (no socket, or nobody listening)
+    returns None. Once the request may have reached the daemon, a timeout
+    or a missing/garbled reply is an error response: the daemon may still
+    be running the command (e.g. queued behind a survey), so callers must
+    not run it again themselves.
+
+    Returns:
+        Response dict, or None if the daemon is not running
+    """
+    request = dict(params, cmd=cmd)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return None
+        except OSError as e:
+            return {'ok': False, 'error': f"Radio daemon unreachable: {e}"}
+
+        data = b""
+        try:
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            while not data.endswith(b"\n"):
+                chunk = sock.recv(4096)
+                if not chunk:
+                    break
+                data += chunk
+        except socket.timeout:
+            return {'ok': False, 'error': f"Radio daemon did not answer '{cmd}' within {timeout}s"}
+        except OSError as e:
+            return {'ok': False, 'error': f"Radio daemon connection failed during '{cmd}': {e}"}
+
+    if not data.endswith(b"\n"):
+        return {'ok': False, 'error': f"Radio daemon closed the connection during '{cmd}'"}
+    try:
+        return json.loads(data)
+    except ValueError:
+        return {'ok': False, 'error': f"Malformed reply from radio daemon to '{cmd}'"}
+
+
+def main():
+    """
+    Main entry point.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler()]
+    )
+
+    logger.info("="*60)
+    logger.info("📻 Cogito Radio Daemon")
+    logger.info("="*60)
+
+    try:
+        radio = RadioDaemon()
+    except OSError as e:
+        logger.error(f"❌ Failed to open I2C bus {I2C_BUS}: {e}")
+        sys.exit(1)
+
+    server = RadioServer(radio)
+
+    def shutdown(signum=None, frame=None):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    logger.info(f"✓ Listening on {SOCKET_PATH}")
+    logger.info(f"✓ Last frequency: {radio.tuner.frequency:.1f} MHz")
+
+    started = time.monotonic()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(SOCKET_PATH):
+            os.unlink(SOCKET_PATH)
+        radio.close()
+        logger.info(f"🛑 Radio daemon stopped after {time.monotonic() - started:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,751 @@
+#!/usr/bin/env python3
+"""
+TEA5767 FM Tuner Library
+
+Importable version of the logic in radio-control.py. RadioTuner owns its
+SMBus handle and a shadow copy of the 5-byte write register, so callers can
+tune in-process without forking radio-control.py for every button press.
+
+Frequencies are integer channel indices on a fixed grid (ChannelGrid,
+50/100/200 kHz spacing). PLL words for every channel are precomputed once
+for both high- and low-side injection, so tuning is a table lookup and
+repeated stepping can never drift off the grid.
+
+When a station is first tuned, an optional tune-quality pass measures the
+signal level and IF counter on both injection sides (and small PLL trims
+for AFC), picks the best and caches it per channel. Later tunes to that
+channel are a single I2C write. Presets store the PLL word and injection
+side in use when they were saved, so recalling one is a single write too.
+
+Survey results and per-station tuning are persisted in a
+station_index.StationIndex and the last tuned frequency in the coalescing
+settings_store.py (a scan burst is one SD card write), and the current frequency and
+mute state are published on the shared state bus (state_bus.py).
+
+Every operation returns a dict instead of printing:
+    {'ok': True, 'frequency': 99.1, 'message': 'Tuned to 99.1 MHz'}
+    {'ok': False, 'error': 'Frequency 120.0 out of range (87.5-108.0)'}
+
+Usage:
+    from radio_tuner import RadioTuner
+
+    with RadioTuner() as tuner:
+        tuner.set_frequency(99.1)
+        print(tuner.get_status()['signal'])
+"""
+
+import os
+import time
+
+import smbus2
+
+from settings_store import get_settings
+import state_bus
+from station_index import IF_CENTER, IF_MAX, IF_MIN, INDEX_FILE, STATION_MIN_SIGNAL, StationIndex
+
+
+TEA5767_ADDR = 0x60
+I2C_BUS = 1
+DEFAULT_FREQ = 99.1
+FREQ_MIN = 87.5
+FREQ_MAX = 108.0
+
+# Channel grid
+GRID_KHZ = int(os.environ.get("COGITO_RADIO_GRID_KHZ", "100"))  # 50, 100 or 200
+IF_HZ = 225000   # Intermediate frequency
+REF_HZ = 32768   # Reference crystal
+
+# Write register bits
+MUTE_BIT = 0x80  # Byte 1
+SM_BIT = 0x40    # Byte 1: search mode
+SUD_BIT = 0x80   # Byte 3: search up (1) / down (0)
+SSL_MASK = 0x60  # Byte 3: search stop level
+HLSI_BIT = 0x10  # Byte 3: high-side (1) / low-side (0) injection
+DEFAULT_REGISTER = [0x80, 0x00, 0xB0, 0x10, 0x00]
+
+# Seek settings
+SEARCH_LEVELS = {'low': 0x20, 'mid': 0x40, 'high': 0x60}  # ADC level 5 / 7 / 10
+SEEK_TIMEOUT = 3.0         # seconds, per seek (hardware and fallback each)
+SEEK_POLL_INTERVAL = 0.01  # seconds between READY polls
+SEEK_MIN_SIGNAL = STATION_MIN_SIGNAL  # software fallback stop level (0-15)
+
+# Preset bank (stored in settings_store.py)
+PRESET_SLOTS = 6
+
+# Tune-quality pass (injection side + AFC)
+AUTO_INJECTION = os.environ.get("COGITO_RADIO_AUTO_INJECTION", "1") == "1"
+AFC_TRIMS = (-1, 1, -2, 2)  # PLL word offsets tried when the IF count is off-window
+
+# Survey dwell: short on clear channels, longer when the reading is unsettled
+MIN_DWELL = 0.015  # seconds
+MAX_DWELL = 0.06   # seconds
+DWELL_STEP = 0.015 # seconds
+
+
+def freq_to_pll(freq_mhz, high_side=True):
+    """Convert frequency in MHz to PLL word"""
+    lo_hz = freq_mhz * 1000000 + (IF_HZ if high_side else -IF_HZ)
+    return int(round(4 * lo_hz / REF_HZ))
+
+
+def pll_to_freq(pll, high_side=True):
+    """Convert PLL word to frequency in MHz"""
+    return ((pll * REF_HZ / 4) - (IF_HZ if high_side else -IF_HZ)) / 1000000
+
+
+class ChannelGrid:
+    """
+    Integer channel model of the FM band.
+
+    Channel 0 is FREQ_MIN; channel n is FREQ_MIN + n * spacing. PLL words
+    for every channel are computed once here for both injection sides.
+    """
+
+    def __init__(self, spacing_khz=GRID_KHZ, min_khz=int(FREQ_MIN * 1000), max_khz=int(FREQ_MAX * 1000)):
+        """
+        Build the grid and its PLL tables.
+
+        Args:
+            spacing_khz: Channel spacing (50, 100 or 200)
+            min_khz: Lowest channel in kHz
+            max_khz: Highest allowed frequency in kHz
+        """
+        if spacing_khz not in (50, 100, 200):
+            raise ValueError(f"Unsupported channel spacing: {spacing_khz} kHz")
+
+        self.spacing_khz = spacing_khz
+        self.min_khz = min_khz
+        self.count = (max_khz - min_khz) // spacing_khz + 1
+        self.pll_high = [freq_to_pll(self.freq(ch), True) for ch in range(self.count)]
+        self.pll_low = [freq_to_pll(self.freq(ch), False) for ch in range(self.count)]
+
+    def freq(self, channel):
+        """Channel index to frequency in MHz."""
+        return (self.min_khz + channel * self.spacing_khz) / 1000
+
+    def channel(self, freq_mhz):
+        """Frequency in MHz to the nearest channel index (clamped to the band)."""
+        khz = int(round(freq_mhz * 1000))
+        channel = (khz - self.min_khz + self.spacing_khz // 2) // self.spacing_khz
+        return min(max(channel, 0), self.count - 1)
+
+    def pll(self, channel, high_side=True):
+        """Precomputed PLL word for a channel."""
+        return self.pll_high[channel] if high_side else self.pll_low[channel]
+
+    def channel_from_pll(self, pll, high_side=True):
+        """Decode a PLL word read back from the chip, snapped to the grid."""
+        return self.channel(pll_to_freq(pll, high_side))
+
+
+GRID = ChannelGrid()
+CHANNELS = GRID.count
+
+
+def freq_to_channel(freq_mhz):
+    """Convert frequency in MHz to channel index (0 = FREQ_MIN)"""
+    return GRID.channel(freq_mhz)
+
+
+def channel_to_freq(channel):
+    """Convert channel index to frequency in MHz"""
+    return GRID.freq(channel)
+
+
+class RadioTuner:
+    """
+    In-process TEA5767 tuner.
+
+    The chip has no readable control registers, so the tuner keeps a shadow
+    copy of the last 5 bytes written. Mute/unmute only flip a bit in the
+    shadow and never lose the tuned PLL word.
+    """
+
+    def __init__(self, bus_number=I2C_BUS, address=TEA5767_ADDR, index_file=INDEX_FILE, grid=GRID,
+                 auto_injection=AUTO_INJECTION):
+        """
+        Initialize the tuner and open the I2C bus.
+
+        Args:
+            bus_number: I2C bus number (default 1)
+            address: TEA5767 I2C address (default 0x60)
+            index_file: Station index holding the last tuned frequency
+            grid: ChannelGrid to tune on
+            auto_injection: Run the tune-quality pass on first tune of a station
+        """
+        self.address = address
+        self.grid = grid
+        self.auto_injection = auto_injection
+        self.index = StationIndex(grid.count, (grid.min_khz, grid.spacing_khz), index_file)
+        self.settings = get_settings()
+        self.bus = smbus2.SMBus(bus_number)
+        self.register = list(DEFAULT_REGISTER)
+        self.channel = grid.channel(self.load_state())
+        # Shadow the restored channel (still muted), so the register always
+        # holds a real PLL word even before the first tune
+        self._set_pll(*self._channel_pll(self.channel), muted=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def frequency(self):
+        """Current frequency in MHz (always on the grid)."""
+        return self.grid.freq(self.channel)
+
+    @frequency.setter
+    def frequency(self, freq_mhz):
+        self.channel = self.grid.channel(freq_mhz)
+
+    @property
+    def high_side(self):
+        """True if the shadow register selects high-side injection."""
+        return bool(self.register[2] & HLSI_BIT)
+
+    @property
+    def muted(self):
+        """True if the shadow register has the MUTE bit set."""
+        return bool(self.register[0] & MUTE_BIT)
+
+    def load_state(self):
+        """
+        Return the last tuned frequency, from whichever process tuned last:
+        the state bus (published on every tune), else the settings file and
+        station index re-read from disk (the bus is empty after a reboot).
+        """
+        bus = state_bus.get_bus()
+        frequency = bus.read().frequency if bus is not None else None
+        self.index.load()
+        self.settings.reload()
+        return frequency or self.settings.get('frequency') or self.index.frequency or DEFAULT_FREQ
+
+    def save_state(self, sync=False):
+        """
+        Save the current frequency (coalesced) and the station index if it changed.
+
+        Args:
+            sync: Write and fsync both now (pre-reboot checkpoint)
+        """
+        self.settings.update(frequency=self.frequency)
+        if sync:
+            self.settings.flush(sync=True)
+        if self.index.dirty or sync:
+            self.index.frequency = self.frequency
+            self.index.save(sync=sync)
+
+    def _write(self):
+        """Write the shadow register to the chip."""
+        msg = smbus2.i2c_msg.write(self.address, self.register)
+        self.bus.i2c_rdwr(msg)
+
+    def _error(self, e):
+        return {'ok': False, 'error': str(e)}
+
+    def set_frequency(self, freq_mhz):
+        """
+        Tune to a frequency and unmute.
+
+        Args:
+            freq_mhz: Frequency in MHz (FREQ_MIN-FREQ_MAX)
+
+        Returns:
+            Result dict with 'frequency' on success
+        """
+        if freq_mhz < FREQ_MIN or freq_mhz > FREQ_MAX:
+            return self._error(f"Frequency {freq_mhz} out of range ({FREQ_MIN}-{FREQ_MAX})")
+        return self.tune_channel(self.grid.channel(freq_mhz))
+
+    def tune_channel(self, channel, optimize=None):
+        """
+        Tune to a channel index and unmute (PLL word from the precomputed table).
+
+        Uses the injection side and PLL trim cached for the channel. If none
+        is cached and optimize is set, runs the tune-quality pass first.
+
+        Args:
+            channel: Channel index on self.grid
+            optimize: Run the quality pass if uncached (default: auto_injection
+                      and the channel is an indexed station)
+
+        Returns:
+            Result dict with 'frequency' on success
+        """
+        tuning = self.index.get_tuning(channel)
+        if tuning is None:
+            if optimize is None:
+                optimize = self.auto_injection and self.index.is_station(channel)
+            if optimize:
+                tuning = self._optimize(channel)
+
+        high_side, trim = tuning if tuning is not None else (True, 0)
+        return self._tune_pll(channel, self.grid.pll(channel, high_side) + trim, high_side)
+
+    def _channel_pll(self, channel):
+        """(PLL word, high_side) for a channel from the table and its cached tuning."""
+        high_side, trim = self.index.get_tuning(channel) or (True, 0)
+        return self.grid.pll(channel, high_side) + trim, high_side
+
+    def _set_pll(self, pll, high_side, muted=False):
+        """Put a PLL word and injection side in the shadow register (not written)."""
+        self.register[0] = (MUTE_BIT if muted else 0) | ((pll >> 8) & 0x3F)
+        self.register[1] = pll & 0xFF
+        self.register[2] = (self.register[2] & ~HLSI_BIT) | (HLSI_BIT if high_side else 0)
+
+    def _tune_pll(self, channel, pll, high_side):
+        """Write a PLL word and injection side (unmuted) in one I2C write."""
+        self._set_pll(pll, high_side)
+
+        try:
+            self._write()
+        except OSError as e:
+            return self._error(e)
+
+        self.channel = channel
+        self.save_state()
+        state_bus.publish(frequency=self.frequency, muted=False)
+        return {
+            'ok': True,
+            'frequency': self.frequency,
+            'message': f"Tuned to {self.frequency:.1f} MHz"
+        }
+
+    def radio_on(self):
+        """Turn radio ON at last/default frequency."""
+        return self.tune_channel(self.channel)
+
+    def radio_off(self):
+        """Turn radio OFF (mute), keeping the tuned PLL word."""
+        self.register[0] |= MUTE_BIT
+        try:
+            self._write()
+        except OSError as e:
+            self.register[0] &= ~MUTE_BIT
+            return self._error(e)
+        state_bus.publish(muted=True)
+        return {'ok': True, 'frequency': self.frequency, 'message': "Radio off"}
+
+    def step(self, delta):
+        """
+        Move by a number of channels in one write (clamped to the band).
+
+        Args:
+            delta: Channel steps (positive = up)
+        """
+        return self.tune_channel(min(max(self.channel + delta, 0), self.grid.count - 1))
+
+    def scan_up(self):
+        """Step up one channel."""
+        return self.step(1)
+
+    def scan_down(self):
+        """Step down one channel."""
+        return self.step(-1)
+
+    def read_status(self):
+        """Read the raw 5-byte status block."""
+        msg = smbus2.i2c_msg.read(self.address, 5)
+        self.bus.i2c_rdwr(msg)
+        return list(msg)
+
+    def get_status(self):
+        """
+        Read current radio status.
+
+        Returns:
+            Result dict with frequency, signal (0-15), stereo, ready,
+            band_limit and muted
+        """
+        try:
+            status = self.read_status()
+        except OSError as e:
+            return self._error(e)
+
+        pll = ((status[0] & 0x3F) << 8) | status[1]
+        return {
+            'ok': True,
+            'frequency': self.grid.freq(self.grid.channel_from_pll(pll, self.high_side)),
+            'signal': (status[3] >> 4) & 0x0F,
+            'stereo': bool(status[2] & 0x80),
+            'ready': bool(status[0] & 0x80),
+            'band_limit': bool(status[0] & 0x40),
+            'muted': self.muted,
+        }
+
+    def seek(self, direction='up', level='mid', timeout=SEEK_TIMEOUT):
+        """
+        Seek to the next station.
+
+        Answers from the station index when a survey has been run, then
+        uses the chip's search mode, wrapping around at FREQ_MIN/FREQ_MAX
+        once. Falls back to stepping in
+        software if the hardware search times out, finds nothing or the
+        bus errors.
+
+        Args:
+            direction: 'up' or 'down'
+            level: Search stop level ('low', 'mid' or 'high')
+            timeout: Time budget in seconds for each method
+
+        Returns:
+            Result dict with frequency, signal, stereo, method and wrapped
+        """
+        up = direction == 'up'
+        start = self.channel
+
+        result = self._seek_index(start, up)
+
+        if result is None:
+            try:
+                ssl = SEARCH_LEVELS.get(level, SEARCH_LEVELS['mid'])
+                result = self._seek_hardware(start, up, ssl, timeout)
+            except OSError:
+                result = None
+
+        if result is None:
+            result = self._seek_software(start, up, timeout)
+
+        if result is None:
+            self.tune_channel(start)
+            return self._error(f"No station found {direction} from {self.grid.freq(start):.1f} MHz")
+
+        channel, status, wrapped, method = result
+        self._record(channel, status)
+        tuned = self.tune_channel(channel)
+        if not tuned['ok']:
+            return tuned
+
+        tuned.update({
+            'signal': (status[3] >> 4) & 0x0F,
+            'stereo': bool(status[2] & 0x80),
+            'method': method,
+            'wrapped': wrapped,
+            'message': f"Found station at {tuned['frequency']:.1f} MHz"
+        })
+        return tuned
+
+    def _search_from(self, channel, up, ssl, deadline):
+        """
+        Run one hardware search pass starting at a channel.
+
+        Returns:
+            Raw status bytes once READY is set, or None on timeout
+        """
+        pll = self.grid.pll(channel, self.high_side)
+        register = list(self.register)
+        register[0] = MUTE_BIT | SM_BIT | ((pll >> 8) & 0x3F)
+        register[1] = pll & 0xFF
+        register[2] = (register[2] & ~(SUD_BIT | SSL_MASK)) | ssl | (SUD_BIT if up else 0)
+        self.bus.i2c_rdwr(smbus2.i2c_msg.write(self.address, register))
+
+        while time.monotonic() < deadline:
+            time.sleep(SEEK_POLL_INTERVAL)
+            status = self.read_status()
+            if status[0] & 0x80:  # READY
+                return status
+        return None
+
+    def _seek_index(self, start, up):
+        """Jump to the next indexed station if it still has signal."""
+        channel = self.index.next_station(start, up)
+        if channel is None:
+            return None
+
+        status = self._probe(channel)
+        if status is None:
+            return None
+        if ((status[3] >> 4) & 0x0F) < SEEK_MIN_SIGNAL:
+            # Station has gone; remember that and search for real
+            self._record(channel, status)
+            return None
+
+        wrapped = channel < start if up else channel > start
+        return channel, status, wrapped, 'index'
+
+    def _seek_hardware(self, start, up, ssl, timeout):
+        """Hardware search with a single wrap-around at the band edge."""
+        deadline = time.monotonic() + timeout
+        last = self.grid.count - 1
+        channel = min(max(start + (1 if up else -1), 0), last)
+
+        for wrapped in (False, True):
+            status = self._search_from(channel, up, ssl, deadline)
+            if status is None:
+                return None
+
+            if not status[0] & 0x40:  # Not at band limit: found a station
+                pll = ((status[0] & 0x3F) << 8) | status[1]
+                return self.grid.channel_from_pll(pll, self.high_side), status, wrapped, 'hardware'
+
+            channel = 0 if up else last
+        return None
+
+    def _seek_software(self, start, up, timeout):
+        """Step one channel at a time until the signal level is high enough."""
+        deadline = time.monotonic() + timeout
+        count = self.grid.count
+        channel = start
+
+        for _ in range(count - 1):
+            channel = (channel + (1 if up else -1)) % count
+            if time.monotonic() >= deadline:
+                return None
+
+            status = self._probe(channel)
+            if status is None:
+                return None
+
+            if ((status[3] >> 4) & 0x0F) >= SEEK_MIN_SIGNAL:
+                wrapped = channel < start if up else channel > start
+                return channel, status, wrapped, 'software'
+        return None
+
+    def _probe(self, channel, high_side=None, trim=0):
+        """
+        Tune (muted, without saving state) and read status with adaptive dwell.
+
+        Clear readings return after MIN_DWELL; readings that are not READY
+        yet or sit near the station threshold get more time, up to MAX_DWELL.
+
+        Args:
+            channel: Channel index
+            high_side: Injection side (default: current shadow register)
+            trim: PLL word offset
+
+        Returns:
+            Raw status bytes, or None on bus error
+        """
+        if high_side is None:
+            high_side = self.high_side
+        pll = self.grid.pll(channel, high_side) + trim
+        register = list(self.register)
+        register[0] = MUTE_BIT | ((pll >> 8) & 0x3F)
+        register[1] = pll & 0xFF
+        register[2] = (register[2] & ~HLSI_BIT) | (HLSI_BIT if high_side else 0)
+
+        try:
+            self.bus.i2c_rdwr(smbus2.i2c_msg.write(self.address, register))
+            dwell = MIN_DWELL
+            time.sleep(dwell)
+            status = self.read_status()
+
+            while dwell < MAX_DWELL:
+                signal = (status[3] >> 4) & 0x0F
+                unsettled = not status[0] & 0x80
+                near_threshold = abs(signal - STATION_MIN_SIGNAL) <= 1
+                if not (unsettled or near_threshold):
+                    break
+                time.sleep(DWELL_STEP)
+                dwell += DWELL_STEP
+                status = self.read_status()
+        except OSError:
+            return None
+
+        # The chip stays muted on the probed channel until the next tune
+        self.register[0] |= MUTE_BIT
+        return status
+
+    def _quality(self, status):
+        """Sort key for a probe: IF count in window, then signal, then IF accuracy."""
+        if_count = status[2] & 0x7F
+        return (IF_MIN <= if_count <= IF_MAX, (status[3] >> 4) & 0x0F, -abs(if_count - IF_CENTER))
+
+    def _optimize(self, channel):
+        """
+        Tune-quality pass: pick injection side and PLL trim for a channel.
+
+        Probes both injection sides, keeps the better one, then tries small
+        PLL trims if the IF counter is outside the valid window. The choice
+        is cached in the station index.
+
+        Returns:
+            (high_side, trim), or None if the bus errored
+        """
+        best = None
+        for high_side in (True, False):
+            status = self._probe(channel, high_side)
+            if status is None:
+                return None
+            if best is None or self._quality(status) > self._quality(best[2]):
+                best = (high_side, 0, status)
+
+        high_side = best[0]
+        for trim in AFC_TRIMS:
+            if self._quality(best[2])[0]:
+                break
+            status = self._probe(channel, high_side, trim)
+            if status is None:
+                break
+            if self._quality(status) > self._quality(best[2]):
+                best = (high_side, trim, status)
+
+        self.index.set_tuning(channel, best[0], best[1])
+        return best[0], best[1]
+
+    def optimize(self):
+        """
+        Re-run the tune-quality pass on the current channel and retune.
+
+        Returns:
+            Result dict with high_side and trim
+        """
+        was_muted = self.muted
+        tuning = self._optimize(self.channel)
+        if tuning is None:
+            return self._error("I2C error during tune-quality pass")
+
+        result = self.tune_channel(self.channel)
+        if was_muted:
+            self.radio_off()
+        if result['ok']:
+            result.update({
+                'high_side': tuning[0],
+                'trim': tuning[1],
+                'message': f"Tuned {self.frequency:.1f} MHz with {'high' if tuning[0] else 'low'}-side injection"
+            })
+        return result
+
+    @property
+    def presets(self):
+        """Preset bank: {slot: [frequency, pll, high_side]} (slots as strings)."""
+        return self.settings.get('presets', {})
+
+    def save_preset(self, slot):
+        """
+        Store the current station in a preset slot.
+
+        The PLL word and injection side actually in use (including any AFC
+        trim) are stored with it, so recalling it needs no lookup or pass.
+
+        Args:
+            slot: Preset number (1-PRESET_SLOTS)
+
+        Returns:
+            Result dict with 'slot' and 'frequency'
+        """
+        if not 1 <= slot <= PRESET_SLOTS:
+            return self._error(f"Preset {slot} out of range (1-{PRESET_SLOTS})")
+        pll, high_side = ((self.register[0] & 0x3F) << 8) | self.register[1], self.high_side
+        if self.grid.channel_from_pll(pll, high_side) != self.channel:
+            # Channel moved without a tune (e.g. reloaded from another process)
+            pll, high_side = self._channel_pll(self.channel)
+        presets = dict(self.presets)
+        presets[str(slot)] = [self.frequency, pll, int(high_side)]
+        self.settings.update(presets=presets)
+        return {
+            'ok': True,
+            'slot': slot,
+            'frequency': self.frequency,
+            'message': f"Saved {self.frequency:.1f} MHz to preset {slot}"
+        }
+
+    def recall_preset(self, slot):
+        """
+        Tune to a preset with a single I2C write.
+
+        A preset saved on another channel grid is retuned through the
+        channel table instead.
+
+        Args:
+            slot: Preset number (1-PRESET_SLOTS)
+
+        Returns:
+            Result dict with 'slot' and 'frequency'
+        """
+        preset = self.presets.get(str(slot))
+        if preset is None:
+            return self._error(f"Preset {slot} is empty")
+
+        freq_mhz, pll, high_side = preset
+        channel = self.grid.channel(freq_mhz)
+        if abs(self.grid.freq(channel) - freq_mhz) < 1e-6:
+            result = self._tune_pll(channel, pll, bool(high_side))
+        else:
+            result = self.tune_channel(channel)
+        if result['ok']:
+            result['slot'] = slot
+            result['message'] = f"Preset {slot}: {self.frequency:.1f} MHz"
+        return result
+
+    def list_presets(self):
+        """Presets as [{'slot', 'frequency'}], by slot."""
+        return [
+            {'slot': int(slot), 'frequency': preset[0]}
+            for slot, preset in sorted(self.presets.items(), key=lambda item: int(item[0]))
+        ]
+
+    def _record(self, channel, status, **kwargs):
+        """Store a probe result in the station index (not yet saved)."""
+        self.index.update(
+            channel,
+            signal=(status[3] >> 4) & 0x0F,
+            stereo=status[2] & 0x80,
+            if_count=status[2] & 0x7F,
+            **kwargs
+        )
+
+    def survey(self, refresh=False):
+        """
+        Sweep the band and record every channel in the station index.
+
+        Args:
+            refresh: Only re-probe stale or marginal channels
+
+        Returns:
+            Result dict with probed (channel count), stations (MHz list)
+            and duration (seconds)
+        """
+        started = time.monotonic()
+        start, was_muted = self.channel, self.muted
+        now = time.time()
+        probed = 0
+
+        for channel in range(self.grid.count):
+            if refresh and not self.index.needs_probe(channel, now):
+                continue
+            status = self._probe(channel, high_side=True)
+            if status is None:
+                return self._error(f"I2C error probing {self.grid.freq(channel):.1f} MHz")
+            self._record(channel, status, probed=now, rebuild=False)
+            self.index.tuning[channel] = None
+            probed += 1
+
+        self.index.rebuild()
+
+        if self.auto_injection:
+            for channel in self.index.stations:
+                if self.index.get_tuning(channel) is None:
+                    self._optimize(channel)
+
+        # Restore what the listener had before the sweep
+        result = self.tune_channel(start)
+        if was_muted:
+            self.radio_off()
+        if not result['ok']:
+            return result
+
+        return {
+            'ok': True,
+            'probed': probed,
+            'stations': self.list_stations(),
+            'duration': round(time.monotonic() - started, 2),
+            'message': f"Survey found {len(self.index.stations)} stations"
+        }
+
+    def list_stations(self):
+        """Stations from the index as [{'frequency', 'signal', 'stereo'}]."""
+        return [
+            {
+                'frequency': self.grid.freq(ch),
+                'signal': self.index.records[ch][0],
+                'stereo': bool(self.index.records[ch][1]),
+            }
+            for ch in self.index.stations
+        ]
+
+    def close(self):
+        """Write pending settings and close the I2C bus."""
+        self.settings.flush()
+        self.bus.close()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Velocity-Aware Rotation Processor
+
+Turns raw encoder deltas into volume changes:
+
+- Acceleration: angular velocity is measured over a sliding window and the
+  per-detent step is scaled by ACCEL_CURVE, so a slow turn makes fine
+  adjustments and a fast spin covers the range quickly.
+- Batched application: changes accumulate into a target level that a worker
+  thread commits at most once per COMMIT_INTERVAL, so a fast spin costs a
+  few mixer writes instead of one per detent. The first change of a burst is
+  applied immediately.
+- Glitch rejection: a delta larger than MAX_ROTATION_DELTA is accepted only
+  if it continues motion already seen in the window and is physically
+  reachable in the time since the previous read (MAX_DETENT_RATE). A lone
+  huge jump is an I2C glitch; a big delta mid-spin is a fast hand.
+
+Usage:
+    rotation = RotationProcessor(mixer.set_volume, lambda: mixer.volume)
+    if rotation.plausible(delta):
+        target = rotation.feed(delta)   # returns immediately
+"""
+
+import collections
+import logging
+import threading
+import time
+
+
+VELOCITY_WINDOW = 0.15    # seconds of history used to measure velocity
+COMMIT_INTERVAL = 0.03    # seconds; at most one apply() per interval
+MAX_ROTATION_DELTA = 10   # detents per read accepted without supporting motion
+MAX_DETENT_RATE = 120     # detents/s; ~5 rev/s on the 24-detent ANO wheel
+
+# (velocity in detents/s, step multiplier), ascending
+ACCEL_CURVE = ((0, 1), (8, 2), (20, 3), (40, 5))
+
+logger = logging.getLogger('rotation')
+
+
+class RotationProcessor:
+    """
+    Accelerated, rate-limited mapping from encoder detents to a level.
+    """
+
+    def __init__(self, apply, get_level, step=5, minimum=0, maximum=100,
+                 window=VELOCITY_WINDOW, interval=COMMIT_INTERVAL):
+        """
+        Initialize and start the commit thread.
+
+        Args:
+            apply: Callable taking the new level; returns the level actually set
+            get_level: Callable returning the current level (read at burst start)
+            step: Level change per detent at slow speed
+            minimum: Lowest level
+            maximum: Highest level
+            window: Velocity measurement window (seconds)
+            interval: Minimum time between apply() calls (seconds)
+        """
+        self.apply = apply
+        self.get_level = get_level
+        self.step = step
+        self.minimum = minimum
+        self.maximum = maximum
+        self.window = window
+        self.interval = interval
+
+        self._cond = threading.Condition()
+        self._history = collections.deque()   # (time, delta)
+        self._last_read = None
+        self._target = None                   # level to commit, None when idle
+        self._dirty = False
+        self._last_commit = 0.0
+        self._running = True
+
+        # Counters
+        self.detents = 0
+        self.commits = 0
+        self.glitches = 0
+
+        self._thread = threading.Thread(target=self._run, name='rotation', daemon=True)
+        self._thread.start()
+
+    def _trim(self, now):
+        while self._history and now - self._history[0][0] > self.window:
+            self._history.popleft()
+
+    def velocity(self, now=None):
+        """Detents per second over the window (unsigned)."""
+        now = time.monotonic() if now is None else now
+        with self._cond:
+            self._trim(now)
+            return sum(abs(d) for _, d in self._history) / self.window
+
+    def multiplier(self, velocity):
+        """Step multiplier from ACCEL_CURVE for a velocity in detents/s."""
+        factor = 1
+        for threshold, mult in ACCEL_CURVE:
+            if velocity >= threshold:
+                factor = mult
+        return factor
+
+    def plausible(self, delta, now=None):
+        """
+        Decide whether a raw delta is real movement or an I2C glitch.
+
+        Also records the read time, so call it once for every read (including
+        reads that returned 0).
+
+        Args:
+            delta: Raw detents from one encoder read
+            now: Monotonic time of the read (default now)
+
+        Returns:
+            True if the delta should be used
+        """
+        now = time.monotonic() if now is None else now
+        with self._cond:
+            elapsed = now - self._last_read if self._last_read is not None else self.window
+            self._last_read = now
+
+            if abs(delta) <= MAX_ROTATION_DELTA:
+                return True
+
+            self._trim(now)
+            same_direction = any(d * delta > 0 for _, d in self._history)
+            reachable = abs(delta) <= MAX_DETENT_RATE * max(elapsed, self.interval)
+            if same_direction and reachable:
+                return True
+
+            self.glitches += 1
+        logger.warning(f"⚠️  Noise filtered: delta={delta} (ignoring)")
+        return False
+
+    def feed(self, delta, now=None):
+        """
+        Add movement; the resulting level is committed by the worker thread.
+
+        Args:
+            delta: Detents (positive = clockwise)
+            now: Monotonic time of the read (default now)
+
+        Returns:
+            Target level after this movement
+        """
+        if delta == 0:
+            with self._cond:
+                return self._target if self._target is not None else self.get_level()
+
+        now = time.monotonic() if now is None else now
+        with self._cond:
+            self._history.append((now, delta))
+            self._trim(now)
+            velocity = sum(abs(d) for _, d in self._history) / self.window
+            change = delta * self.step * self.multiplier(velocity)
+
+            # Start each burst from the real level (it may have changed elsewhere)
+            base = self._target if self._target is not None else self.get_level()
+            self._target = max(self.minimum, min(self.maximum, base + change))
+            self._dirty = True
+            self.detents += abs(delta)
+            self._cond.notify()
+            return self._target
+
+    def stats(self):
+        """Counters as a dict."""
+        with self._cond:
+            return {
+                'detents': self.detents,
+                'commits': self.commits,
+                'glitches': self.glitches,
+            }
+
+    def stop(self, flush=True):
+        """
+        Stop the commit thread.
+
+        Args:
+            flush: Apply any pending level before returning
+        """
+        with self._cond:
+            self._running = False
+            if not flush:
+                self._dirty = False
+            self._cond.notify()
+        self._thread.join(timeout=1.0)
+
+    def _take(self):
+        """Wait until a pending level may be committed; None on stop."""
+        with self._cond:
+            while True:
+                if self._dirty:
+                    now = time.monotonic()
+                    due = self._last_commit + self.interval
+                    if now >= due or not self._running:
+                        self._dirty = False
+                        self._last_commit = now
+                        return self._target
+                    self._cond.wait(due - now)
+                elif not self._running:
+                    return None
+                elif self._target is not None:
+                    # Burst is over once the velocity window has emptied
+                    now = time.monotonic()
+                    self._trim(now)
+                    if self._history:
+                        self._cond.wait(self._history[0][0] + self.window - now)
+                    else:
+                        self._target = None
+                else:
+                    self._cond.wait()
+
+    def _run(self):
+        while True:
+            level = self._take()
+            if level is None:
+                return
+            try:
+                actual = self.apply(level)
+                with self._cond:
+                    self.commits += 1
+                    # Apply may clamp or fail; follow the real level if idle
+                    if not self._dirty and actual is not None:
+                        self._target = actual
+            except Exception as e:
+                logger.error(f"❌ Level apply failed ({level}): {e}")
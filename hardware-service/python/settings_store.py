@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Persistent Settings Store
+
+Last frequency, presets, volume and mode, kept across reboots in one small
+file on the SD card. Every tune used to rewrite the whole station index, so
+a burst of scan presses meant a burst of card writes. SettingsStore keeps
+the values in memory and writes them from a worker thread once per burst:
+the first change schedules a write COALESCE_DELAY later and everything that
+changes meanwhile goes into that same write. Values that end up where they
+started are not written at all.
+
+Writes are crash-safe (temp file, fsync, rename), so after a power cut the
+file is either the old or the new version, never a torn one. Several
+processes share the file (radio daemon: frequency, hardware daemon: volume
+and mode), so a write takes a flock, re-reads the file and merges in only
+the keys this process changed. Reads come from memory; a process that needs
+another process's latest value calls reload() first.
+
+File format (compact JSON):
+    {"v":1,"frequency":99.1,"volume":40,"mode":"radio","presets":{}}
+
+At boot, start-radio.sh runs `settings_store.py restore`, which reads the
+file once and prints the station and volume as shell assignments.
+
+Usage:
+    settings = get_settings()
+    settings.update(frequency=99.1)   # returns immediately
+    settings.get('volume')
+    settings.reload()                 # pick up other processes' writes
+"""
+
+import fcntl
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+import state_files
+
+
+SETTINGS_FILE = os.environ.get(
+    "COGITO_SETTINGS",
+    os.path.expanduser("~/.cogito/settings.json")
+)
+SETTINGS_VERSION = 1
+COALESCE_DELAY = 1.0   # seconds from the first change to the write
+
+DEFAULTS = {
+    'frequency': None,
+    'volume': None,
+    'mode': 'radio',
+    'presets': {},
+}
+
+logger = logging.getLogger('settings-store')
+
+_settings = None
+_settings_lock = threading.Lock()
+
+
+def _read_file(path):
+    """Settings dict from disk (DEFAULTS for a missing, corrupt or foreign file)."""
+    values = dict(DEFAULTS)
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return values
+    if isinstance(data, dict) and data.get('v') == SETTINGS_VERSION:
+        values.update((key, data[key]) for key in DEFAULTS if key in data)
+    return values
+
+
+class SettingsStore:
+    """
+    Write-coalescing, crash-safe settings file with its own writer thread.
+    """
+
+    def __init__(self, path=SETTINGS_FILE, delay=COALESCE_DELAY):
+        """
+        Load the settings and start the writer thread.
+
+        Args:
+            path: Settings file
+            delay: Seconds from the first change to the write
+        """
+        self.path = path
+        self.delay = delay
+        self._values = _read_file(path)
+
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._dirty = set()
+        self._due = None
+        self._running = True
+
+        # Counters
+        self.updates = 0
+        self.writes = 0
+        self.errors = 0
+
+        self._thread = threading.Thread(target=self._run, name='settings-store', daemon=True)
+        self._thread.start()
+
+    def get(self, key, default=None):
+        """
+        Current value of a setting (including changes not yet written).
+
+        Args:
+            key: Setting name (see DEFAULTS)
+            default: Returned if the setting is unset
+        """
+        with self._cond:
+            value = self._values.get(key)
+        return default if value is None else value
+
+    def update(self, **fields):
+        """
+        Change settings; the write happens later on the worker thread.
+
+        Args:
+            **fields: Settings to change
+
+        Returns:
+            True if any value changed
+        """
+        with self._cond:
+            changed = {key: value for key, value in fields.items() if self._values.get(key) != value}
+            if not changed:
+                return False
+            self._values.update(changed)
+            self._dirty.update(changed)
+            self.updates += 1
+            if self._due is None:
+                self._due = time.monotonic() + self.delay
+                self._cond.notify()
+            return True
+
+    def reload(self):
+        """
+        Re-read the file, for values other processes wrote since we loaded it.
+        Changes of ours that are not written yet are kept.
+        """
+        # Writes are renames, so the file is never torn. The write lock keeps
+        # a flush in progress (dirty keys taken, file not written yet) from
+        # having its values replaced by the older ones on disk.
+        with self._write_lock:
+            values = _read_file(self.path)
+            with self._cond:
+                self._values.update((key, value) for key, value in values.items()
+                                    if key not in self._dirty)
+
+    def flush(self, sync=False):
+        """
+        Write pending changes now.
+
+        Args:
+            sync: Also fsync the directory (checkpoints before a reboot)
+        """
+        # One flush at a time, so an older batch never lands after a newer one
+        with self._write_lock:
+            with self._cond:
+                dirty, self._dirty, self._due = self._dirty, set(), None
+                values = {key: self._values[key] for key in dirty}
+            if dirty or sync:
+                self._write(values, sync)
+
+    def stats(self):
+        """Counters as a dict."""
+        with self._cond:
+            return {
+                'updates': self.updates,
+                'writes': self.writes,
+                'errors': self.errors,
+                'pending': len(self._dirty),
+            }
+
+    def stop(self, flush=True):
+        """
+        Stop the writer thread.
+
+        Args:
+            flush: Write pending changes before returning
+        """
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join(timeout=1.0)
+        if flush:
+            self.flush()
+
+    def _write(self, values, sync):
+        """Merge `values` into the file under the cross-process lock."""
+        directory = os.path.dirname(self.path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(f"{self.path}.lock", 'w') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                current = _read_file(self.path)
+                merged = dict(current, **values)
+                if merged != current or not os.path.exists(self.path):
+                    state_files.write_json(self.path, dict(v=SETTINGS_VERSION, **merged))
+                    with self._cond:
+                        self.writes += 1
+                if sync:
+                    state_files.sync_directory(directory)
+        except OSError as e:
+            with self._cond:
+                self.errors += 1
+                # Keep the changes so a later write retries them
+                self._dirty.update(values)
+                if self._due is None:
+                    self._due = time.monotonic() + self.delay
+                    self._cond.notify()
+            logger.error(f"❌ Could not write settings {self.path}: {e}")
+
+    def _run(self):
+        with self._cond:
+            while self._running:
+                if self._due is None:
+                    self._cond.wait()
+                    continue
+                remaining = self._due - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                self._cond.release()
+                try:
+                    self.flush()
+                finally:
+                    self._cond.acquire()
+
+
+def get_settings():
+    """
+    Shared SettingsStore for the process, loaded on first use.
+
+    Returns:
+        SettingsStore
+    """
+    global _settings
+    with _settings_lock:
+        if _settings is None:
+            _settings = SettingsStore()
+        return _settings
+
+
+def restore_lines(path=SETTINGS_FILE):
+    """
+    Shell assignments for start-radio.sh (numbers only, so eval is safe).
+
+    Returns:
+        List of 'SETTINGS_FREQUENCY=99.1' / 'SETTINGS_VOLUME=40' lines
+    """
+    values = _read_file(path)
+    return state_files.restore_lines('SETTINGS', values['frequency'], values['volume'])
+
+
+def main():
+    """CLI: `restore` prints shell assignments; `show` prints the settings."""
+    command = sys.argv[1] if len(sys.argv) > 1 else 'show'
+    if command == 'restore':
+        print("\n".join(restore_lines()))
+    elif command == 'show':
+        print(json.dumps(_read_file(SETTINGS_FILE), indent=2))
+    else:
+        print(f"Usage: {sys.argv[0]} [show|restore]", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
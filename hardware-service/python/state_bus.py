@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Shared-Memory Device State Bus
+
+Current mode, frequency and volume used to live in three places: a file
+re-read on every command, ANOEncoder.current_volume, and a global in the
+button handler that other processes had to ask hardware-service for over
+HTTP. StateBus keeps them in one small memory-mapped segment (tmpfs, so it
+never touches the SD card) that every Python process maps:
+
+    offset  size  field
+    0       4     magic b'CGST'
+    4       2     layout version
+    6       2     segment size
+    8       4     seq          (seqlock; odd while a write is in progress)
+    12      4     changes      (bumped once per write that changed something)
+    16      4     frequency    (kHz, 0 = unknown)
+    20      1     mode         (0 unknown, 1 radio, 2 ai)
+    21      1     volume       (0-100, 255 = unknown)
+    22      1     muted        (0 no, 1 yes, 255 = unknown)
+    23      1     reserved
+    24      8     updated      (time.time_ns() of the last change)
+    32      4     writer pid
+
+Readers never lock: they copy the fields between two reads of seq and retry
+if a write overlapped. Writers serialize with flock. wait_for_change()
+polls the change counter (a single 4-byte read) instead of a file or HTTP.
+
+Writers: radio_tuner (frequency, mute), ano_encoder (volume),
+button-vapi-handler (mode).
+
+Usage:
+    state = get_bus().read()
+    print(state.mode, state.frequency, state.volume)
+    publish(volume=40)
+"""
+
+import collections
+import contextlib
+import fcntl
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+
+
+STATE_BUS_PATH = os.environ.get("COGITO_STATE_BUS", "/dev/shm/cogito-state")
+MAGIC = b'CGST'
+VERSION = 1
+SIZE = 64
+WAIT_POLL = 0.005     # seconds between change-counter checks in wait_for_change()
+READ_RETRIES = 1000   # seqlock retries before falling back to a locked read
+
+MODES = (None, 'radio', 'ai')
+UNKNOWN = 255
+
+_HEADER = struct.Struct('<4sHH')
+_COUNTERS = struct.Struct('<II')              # seq, changes
+_PAYLOAD = struct.Struct('<IBBBBQI')          # frequency, mode, volume, muted, -, updated, pid
+_SEQ_OFFSET = _HEADER.size
+_PAYLOAD_OFFSET = _SEQ_OFFSET + _COUNTERS.size
+
+DeviceState = collections.namedtuple(
+    'DeviceState', ['mode', 'frequency', 'volume', 'muted', 'changes', 'updated', 'pid']
+)
+
+logger = logging.getLogger('state-bus')
+
+_bus = None
+_bus_failed = False
+
+
+class StateBus:
+    """
+    Seqlock-protected device state in a shared memory segment.
+    """
+
+    def __init__(self, path=STATE_BUS_PATH):
+        """
+        Map the segment, creating and initializing it if needed.
+
+        Args:
+            path: Segment file (on tmpfs, e.g. /dev/shm)
+
+        Raises:
+            OSError: The segment cannot be created or mapped
+        """
+        self.path = path
+        self._thread_lock = threading.Lock()
+        old_umask = os.umask(0)
+        try:
+            self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o666)
+        finally:
+            os.umask(old_umask)
+
+        with self._locked():
+            if os.fstat(self._fd).st_size < SIZE:
+                os.ftruncate(self._fd, SIZE)
+            self._mm = mmap.mmap(self._fd, SIZE)
+            magic, version, size = _HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC or version != VERSION or size != SIZE:
+                self._mm[:SIZE] = bytes(SIZE)
+                _PAYLOAD.pack_into(self._mm, _PAYLOAD_OFFSET, 0, 0, UNKNOWN, UNKNOWN, 0, 0, 0)
+                _HEADER.pack_into(self._mm, 0, MAGIC, VERSION, SIZE)
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """Exclusive writer lock: threads of this process, then flock across processes."""
+        with self._thread_lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    @property
+    def changes(self):
+        """Change counter (cheap: one 4-byte read, no seqlock)."""
+        return _COUNTERS.unpack_from(self._mm, _SEQ_OFFSET)[1]
+
+    def read(self):
+        """
+        Consistent snapshot of the state.
+
+        Returns:
+            DeviceState (unknown fields are None)
+        """
+        mm = self._mm
+        for _ in range(READ_RETRIES):
+            seq, changes = _COUNTERS.unpack_from(mm, _SEQ_OFFSET)
+            if seq & 1:
+                continue   # write in progress
+            payload = _PAYLOAD.unpack_from(mm, _PAYLOAD_OFFSET)
+            if _COUNTERS.unpack_from(mm, _SEQ_OFFSET)[0] == seq:
+                return self._decode(payload, changes)
+
+        # A writer died mid-write or is very slow: read under the lock
+        with self._locked():
+            seq, changes = _COUNTERS.unpack_from(mm, _SEQ_OFFSET)
+            return self._decode(_PAYLOAD.unpack_from(mm, _PAYLOAD_OFFSET), changes)
+
+    @staticmethod
+    def _decode(payload, changes):
+        frequency_khz, mode, volume, muted, _, updated, pid = payload
+        return DeviceState(
+            mode=MODES[mode] if mode < len(MODES) else None,
+            frequency=frequency_khz / 1000 if frequency_khz else None,
+            volume=None if volume == UNKNOWN else volume,
+            muted=None if muted == UNKNOWN else bool(muted),
+            changes=changes,
+            updated=updated / 1e9 if updated else None,
+            pid=pid,
+        )
+
+    def publish(self, mode=None, frequency=None, volume=None, muted=None):
+        """
+        Update the given fields (None = leave unchanged).
+
+        The change counter only moves if a value actually changed.
+
+        Args:
+            mode: 'radio' or 'ai'
+            frequency: MHz
+            volume: 0-100
+            muted: bool
+
+        Returns:
+            True if anything changed
+        """
+        mm = self._mm
+        with self._locked():
+            seq, changes = _COUNTERS.unpack_from(mm, _SEQ_OFFSET)
+            old = _PAYLOAD.unpack_from(mm, _PAYLOAD_OFFSET)
+            new = (
+                int(round(frequency * 1000)) if frequency is not None else old[0],
+                MODES.index(mode) if mode is not None else old[1],
+                max(0, min(100, int(volume))) if volume is not None else old[2],
+                int(bool(muted)) if muted is not None else old[3],
+            )
+            if new == old[:4]:
+                return False
+
+            _COUNTERS.pack_into(mm, _SEQ_OFFSET, seq + 1, changes)   # odd: writing
+            _PAYLOAD.pack_into(mm, _PAYLOAD_OFFSET, *new, 0, time.time_ns(), os.getpid())
+            _COUNTERS.pack_into(mm, _SEQ_OFFSET, seq + 2, (changes + 1) & 0xFFFFFFFF)
+            return True
+
+    def wait_for_change(self, since, timeout=None):
+        """
+        Block until the change counter differs from `since`.
+
+        Args:
+            since: Counter value already seen (DeviceState.changes)
+            timeout: Longest wait in seconds (None = forever)
+
+        Returns:
+            New DeviceState, or None on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.changes == since:
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(WAIT_POLL)
+        return self.read()
+
+    def close(self):
+        """Unmap the segment (it stays for other processes)."""
+        self._mm.close()
+        os.close(self._fd)
+
+
+def get_bus():
+    """
+    Shared StateBus for the process, mapped on first use.
+
+    Returns:
+        StateBus, or None if the segment is unavailable (logged once)
+    """
+    global _bus, _bus_failed
+    if _bus is None and not _bus_failed:
+        try:
+            _bus = StateBus()
+        except OSError as e:
+            _bus_failed = True
+            logger.warning(f"⚠️  State bus unavailable ({STATE_BUS_PATH}): {e}")
+    return _bus
+
+
+def publish(**fields):
+    """
+    Publish fields to the shared bus; a no-op if it is unavailable.
+
+    Args:
+        **fields: mode, frequency, volume and/or muted
+    """
+    bus = get_bus()
+    if bus is not None:
+        bus.publish(**fields)
+
+
+def main():
+    """CLI: print the state, or `watch` to print every change."""
+    bus = get_bus()
+    if bus is None:
+        sys.exit(1)
+
+    state = bus.read()
+    print(state)
+    if len(sys.argv) > 1 and sys.argv[1] == 'watch':
+        try:
+            while True:
+                state = bus.wait_for_change(state.changes)
+                print(state)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
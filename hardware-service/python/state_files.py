@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Durable State Files
+
+Shared by the files that must survive a power cut on the SD card: the
+settings file (settings_store.py), the station index (station_index.py) and
+the pre-reboot snapshot (checkpoint.py).
+
+- write_json(): replace a file atomically (temp file, optional fsync,
+  rename), so readers see either the old or the new version, never a torn
+  one; sync_dir also fsyncs the directory so the rename itself is durable.
+- restore_lines(): the frequency/volume shell assignments start-radio.sh
+  evals at boot. Values are formatted as numbers and anything else is left
+  out, so eval is safe.
+
+Usage:
+    write_json(path, data, sync_dir=True)
+    print("\\n".join(restore_lines('SETTINGS', frequency=99.1, volume=40)))
+"""
+
+import json
+import math
+import os
+
+
+def sync_directory(directory):
+    """fsync a directory, making renames inside it durable."""
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_json(path, data, fsync=True, sync_dir=False):
+    """
+    Atomically replace a file with compact JSON.
+
+    Args:
+        path: Destination file (its directory is created if needed)
+        data: JSON-serializable value
+        fsync: fsync the temp file before the rename
+        sync_dir: Also fsync the directory after the rename
+
+    Raises:
+        OSError: The file could not be written (the old version is kept)
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    if sync_dir:
+        sync_directory(directory)
+
+
+def restore_lines(prefix, frequency=None, volume=None):
+    """
+    Shell assignments for start-radio.sh (numbers only, so eval is safe).
+
+    Args:
+        prefix: Variable prefix, e.g. 'SETTINGS'
+        frequency: Station in MHz (left out unless a finite number)
+        volume: Volume 0-100 (left out unless a number)
+
+    Returns:
+        List of e.g. 'SETTINGS_FREQUENCY=99.1' / 'SETTINGS_VOLUME=40' lines
+    """
+    lines = []
+    try:
+        frequency = float(frequency)
+        if math.isfinite(frequency):
+            lines.append(f"{prefix}_FREQUENCY={frequency:.1f}")
+    except (TypeError, ValueError):
+        pass
+    try:
+        lines.append(f"{prefix}_VOLUME={int(volume)}")
+    except (TypeError, ValueError, OverflowError):
+        pass
+    return lines
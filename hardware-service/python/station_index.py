@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Persisted FM Station Index
+
+Stores what a full-band survey found on each channel (signal level, stereo
+flag, IF counter and when it was probed), the injection side and PLL trim
+chosen for each station, and the last tuned frequency. It replaces the
+single-float /tmp/radio_state.txt. The index is only rewritten when survey or
+tuning data changed; the last frequency is kept current in settings_store.py
+and only copied here when the index is saved anyway.
+
+Channels are integer indices on the tuner's grid (channel 0 = FREQ_MIN).
+After every update the index precomputes the station list and next/previous
+station tables, so "what stations exist" and "next station up from here"
+are O(1) lookups instead of a band sweep.
+
+File format (JSON, written atomically):
+    {
+      "version": 1,
+      "grid": [87500, 100],
+      "frequency": 99.1,
+      "channels": [[signal, stereo, if_count, probed_epoch] | null, ...],
+      "tuning": [[high_side, pll_trim] | null, ...]
+    }
+"""
+
+import json
+import os
+import time
+
+import state_files
+
+
+INDEX_FILE = os.environ.get(
+    "COGITO_STATION_INDEX",
+    os.path.expanduser("~/.cogito/radio_stations.json")
+)
+INDEX_VERSION = 1
+
+# Station classification
+STATION_MIN_SIGNAL = 7      # ADC level (0-15) to count as a station
+MARGINAL_BAND = 2           # Levels either side of the threshold re-probed on refresh
+IF_MIN = 0x31               # IF counter window for a correctly tuned carrier
+IF_MAX = 0x3E
+IF_CENTER = 0x37
+STALE_AGE = 7 * 24 * 3600   # Seconds before a channel is re-probed on refresh
+
+# Record fields
+SIGNAL, STEREO, IF_COUNT, PROBED = range(4)
+
+
+class StationIndex:
+    """
+    Per-channel survey results plus the last tuned frequency.
+    """
+
+    def __init__(self, channels, grid, path=INDEX_FILE):
+        """
+        Initialize and load the index from disk.
+
+        Args:
+            channels: Number of channels on the grid
+            grid: (min_khz, spacing_khz) the channel numbers refer to
+            path: JSON file to persist to
+        """
+        self.channels = channels
+        self.grid = list(grid)
+        self.path = path
+        self.frequency = None
+        self.records = [None] * channels
+        self.tuning = [None] * channels
+        self.dirty = False   # survey/tuning data changed since the last save
+        self.load()
+
+    def load(self):
+        """Load the index from disk. Discards channels from another grid."""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            self.rebuild()
+            return
+
+        self.frequency = data.get('frequency')
+        records = data.get('channels') or []
+        tuning = data.get('tuning') or [None] * self.channels
+        if data.get('version') == INDEX_VERSION and data.get('grid') == self.grid \
+                and len(records) == self.channels and len(tuning) == self.channels:
+            self.records = records
+            self.tuning = tuning
+        else:
+            self.records = [None] * self.channels
+            self.tuning = [None] * self.channels
+        self.rebuild()
+
+    def save(self, sync=False):
+        """
+        Write the index atomically (temp file + rename).
+
+        Args:
+            sync: fsync the file before the rename (checkpoints before a reboot)
+        """
+        data = {
+            'version': INDEX_VERSION,
+            'grid': self.grid,
+            'frequency': self.frequency,
+            'channels': self.records,
+            'tuning': self.tuning,
+        }
+        try:
+            state_files.write_json(self.path, data, fsync=sync)
+        except OSError:
+            return
+        self.dirty = False
+
+    def update(self, channel, signal, stereo, if_count, probed=None, rebuild=True):
+        """
+        Record a probe result for one channel and refresh the lookup tables.
+
+        Args:
+            channel: Channel index
+            signal: ADC level (0-15)
+            stereo: True if the pilot was detected
+            if_count: IF counter (7 bits)
+            probed: Epoch seconds (default now)
+            rebuild: Set False when batching updates, then call rebuild()
+        """
+        self.records[channel] = [
+            signal, int(bool(stereo)), if_count,
+            int(probed if probed is not None else time.time())
+        ]
+        self.dirty = True
+        if rebuild:
+            self.rebuild()
+
+    def set_tuning(self, channel, high_side, trim=0):
+        """
+        Cache the injection side and PLL trim chosen for a channel.
+
+        Args:
+            channel: Channel index
+            high_side: True for high-side injection
+            trim: PLL word offset applied on top of the grid table (AFC)
+        """
+        self.tuning[channel] = [int(bool(high_side)), trim]
+        self.dirty = True
+
+    def get_tuning(self, channel):
+        """Cached (high_side, trim) for a channel, or None."""
+        tuning = self.tuning[channel]
+        if tuning is None:
+            return None
+        return bool(tuning[0]), tuning[1]
+
+    def is_station(self, channel):
+        """True if the last probe of this channel found a listenable carrier."""
+        record = self.records[channel]
+        return record is not None and record[SIGNAL] >= STATION_MIN_SIGNAL \
+            and IF_MIN <= record[IF_COUNT] <= IF_MAX
+
+    def needs_probe(self, channel, now=None):
+        """
+        True if a refresh should re-probe this channel.
+
+        Channels are re-probed when never probed, older than STALE_AGE, or
+        marginal (signal near the threshold, or strong but off-frequency).
+        """
+        record = self.records[channel]
+        if record is None:
+            return True
+        if (now or time.time()) - record[PROBED] > STALE_AGE:
+            return True
+        if abs(record[SIGNAL] - STATION_MIN_SIGNAL) <= MARGINAL_BAND:
+            return True
+        return record[SIGNAL] >= STATION_MIN_SIGNAL and not self.is_station(channel)
+
+    @property
+    def stations(self):
+        """Channels currently classified as stations, ascending."""
+        return self._stations
+
+    def next_station(self, channel, up=True):
+        """
+        Nearest station strictly above/below a channel, wrapping at the band edge.
+
+        Returns:
+            Channel index, or None if the index has no stations
+        """
+        if not self._stations:
+            return None
+        table = self._next_up if up else self._next_down
+        return table[channel]
+
+    def rebuild(self):
+        """Recompute the station list and next/previous lookup tables."""
+        self._stations = [ch for ch in range(self.channels) if self.is_station(ch)]
+
+        self._next_up = [None] * self.channels
+        self._next_down = [None] * self.channels
+        if not self._stations:
+            return
+
+        following = self._stations[0]  # wraps to the lowest station
+        for ch in range(self.channels - 1, -1, -1):
+            self._next_up[ch] = following
+            if self.is_station(ch):
+                following = ch
+
+        preceding = self._stations[-1]  # wraps to the highest station
+        for ch in range(self.channels):
+            self._next_down[ch] = preceding
+            if self.is_station(ch):
+                preceding = ch
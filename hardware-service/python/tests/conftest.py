@@ -0,0 +1,32 @@
+"""
+Shared pytest setup: the hardware modules are plain scripts in the parent
+directory, so it is put on sys.path; tests that wait on background threads
+use the wait_until fixture.
+
+Run from hardware-service/python:
+    python3 -m pytest -q tests
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def poll_until(predicate, timeout=3.0, interval=0.01):
+    """True as soon as predicate() is true, False if it is not within timeout."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(interval)
+    return False
+
+
+@pytest.fixture
+def wait_until():
+    """poll_until() for tests waiting on a background thread."""
+    return poll_until
@@ -0,0 +1,93 @@
+"""
+Tests for dispatch_queue.DispatchQueue: coalescing by key and function,
+jobs that must not coalesce, and per-key ordering.
+"""
+
+import threading
+
+import pytest
+
+from dispatch_queue import DispatchQueue
+
+
+@pytest.fixture
+def queue():
+    queue = DispatchQueue(workers=1)
+    yield queue
+    queue.stop(timeout=1.0)
+
+
+@pytest.fixture
+def blocked(queue):
+    """Occupy the only worker so later jobs stay queued until set()."""
+    gate = threading.Event()
+    queue.submit(gate.wait, 3.0)
+    yield gate
+    gate.set()
+
+
+def drain(queue, gate):
+    gate.set()
+    queue.stop(timeout=2.0)
+
+
+def test_same_key_and_function_coalesces(queue, blocked):
+    calls = []
+
+    def scan(steps):
+        calls.append(steps)
+
+    for steps in (1, 2, 3):
+        queue.submit(scan, steps, key='scan', merge=lambda old, new: (old[0] + new[0],))
+    drain(queue, blocked)
+
+    assert calls == [6]
+    assert queue.stats()['coalesced'] == 2
+
+
+def test_different_function_under_same_key_is_queued(queue, blocked):
+    calls = []
+
+    def recall(slot):
+        calls.append(('recall', slot))
+
+    def save(slot):
+        calls.append(('save', slot))
+
+    queue.submit(save, 1, key='preset')
+    queue.submit(recall, 2, key='preset')
+    drain(queue, blocked)
+
+    assert calls == [('save', 1), ('recall', 2)]
+
+
+def test_save_is_not_merged_into_recall(queue, blocked):
+    calls = []
+
+    def recall(slot):
+        calls.append(('recall', slot))
+
+    def save(slot):
+        calls.append(('save', slot))
+
+    queue.submit(recall, 1, key='preset')
+    queue.submit(save, 1, key='preset', coalesce=False)
+    queue.submit(recall, 2, key='preset')
+    queue.submit(recall, 3, key='preset')
+    drain(queue, blocked)
+
+    assert calls == [('recall', 1), ('save', 1), ('recall', 3)]
+    assert queue.stats()['coalesced'] == 1
+
+
+def test_saves_of_different_slots_all_run(queue, blocked):
+    calls = []
+
+    def save(slot):
+        calls.append(slot)
+
+    queue.submit(save, 1, key='preset', coalesce=False)
+    queue.submit(save, 2, key='preset', coalesce=False)
+    drain(queue, blocked)
+
+    assert calls == [1, 2]
@@ -0,0 +1,219 @@
+"""
+Tests for mode_state.ModeStateMachine: local switching, dedup of repeated and
+cancelled-out presses, coalescing while a commit is in flight, rollback and
+remote confirmation.
+"""
+
+import threading
+
+import pytest
+
+from mode_state import ModeStateMachine
+
+
+class Server:
+    """Commit callable that records modes; blocks while `gate` is cleared."""
+
+    def __init__(self, result=True):
+        self.result = result
+        self.commits = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.entered = threading.Event()
+
+    def __call__(self, mode):
+        self.commits.append(mode)
+        self.entered.set()
+        self.gate.wait(3.0)
+        return self.result
+
+
+@pytest.fixture
+def changes():
+    return []
+
+
+def make(commit, changes, **kwargs):
+    return ModeStateMachine(commit=commit,
+                            on_change=lambda mode, reason: changes.append((mode, reason)),
+                            **kwargs)
+
+
+def test_request_switches_locally_and_commits(changes, wait_until):
+    server = Server()
+    modes = make(server, changes)
+    try:
+        assert modes.request('ai') is True
+        assert modes.mode == 'ai'
+        assert changes == [('ai', 'local')]
+        assert wait_until(lambda: modes.confirmed == 'ai')
+    finally:
+        modes.stop()
+
+    assert server.commits == ['ai']
+    assert modes.stats()['commits'] == 1
+
+
+def test_repeated_request_is_deduplicated(changes, wait_until):
+    server = Server()
+    modes = make(server, changes)
+    try:
+        assert modes.request('radio') is False
+        modes.request('ai')
+        assert modes.request('ai') is False
+        assert wait_until(lambda: not modes.pending)
+    finally:
+        modes.stop()
+
+    assert server.commits == ['ai']
+    assert changes == [('ai', 'local')]
+    assert modes.stats()['requests'] == 3
+
+
+def test_unknown_mode_is_rejected(changes):
+    modes = make(Server(), changes)
+    try:
+        with pytest.raises(ValueError):
+            modes.request('tv')
+    finally:
+        modes.stop()
+
+
+def test_presses_during_commit_coalesce_to_latest(changes, wait_until):
+    server = Server()
+    server.gate.clear()
+    modes = make(server, changes)
+    try:
+        modes.toggle()                      # ai, in flight
+        assert server.entered.wait(2.0)
+        modes.toggle()                      # radio
+        modes.toggle()                      # ai
+        modes.toggle()                      # radio, replaces both
+        server.gate.set()
+        assert wait_until(lambda: not modes.pending)
+    finally:
+        modes.stop()
+
+    assert server.commits == ['ai', 'radio']
+    assert modes.stats()['coalesced'] == 2
+    assert modes.mode == 'radio'
+
+
+def test_presses_that_cancel_out_are_skipped(changes, wait_until):
+    server = Server()
+    server.gate.clear()
+    modes = make(server, changes)
+    try:
+        modes.request('ai')
+        assert server.entered.wait(2.0)
+        modes.request('radio')
+        modes.request('ai')                 # back to what is in flight
+        server.gate.set()
+        assert wait_until(lambda: not modes.pending)
+    finally:
+        modes.stop()
+
+    # The follow-up ends where the server already is: no second request
+    assert server.commits == ['ai']
+    assert modes.stats()['skipped'] == 1
+
+
+def test_failed_commit_rolls_back(changes, wait_until):
+    modes = make(Server(result=False), changes)
+    try:
+        modes.request('ai')
+        assert wait_until(lambda: modes.stats()['rollbacks'] == 1)
+    finally:
+        modes.stop()
+
+    assert modes.mode == 'radio'
+    assert changes == [('ai', 'local'), ('radio', 'rollback')]
+
+
+def test_raising_commit_counts_as_failure(changes, wait_until):
+    def broken(mode):
+        raise RuntimeError("offline")
+
+    modes = make(broken, changes)
+    try:
+        modes.request('ai')
+        assert wait_until(lambda: modes.stats()['rollbacks'] == 1)
+    finally:
+        modes.stop()
+
+    assert modes.stats()['failures'] == 1
+    assert modes.mode == 'radio'
+
+
+def test_superseded_failure_does_not_roll_back(changes, wait_until):
+    server = Server(result=False)
+    server.gate.clear()
+    modes = make(server, changes)
+    try:
+        modes.request('ai')
+        assert server.entered.wait(2.0)
+        server.result = True
+        modes.request('radio')              # newer press; 'radio' is confirmed already
+        server.gate.set()
+        assert wait_until(lambda: not modes.pending)
+    finally:
+        modes.stop()
+
+    assert modes.stats()['rollbacks'] == 0
+    assert modes.mode == 'radio'
+
+
+def test_async_commit_waits_for_confirm(changes, wait_until):
+    sent = threading.Event()
+    modes = make(lambda mode: sent.set(), changes)   # returns None
+    try:
+        modes.request('ai')
+        assert sent.wait(2.0)
+        assert modes.confirm('ai') is True
+        assert wait_until(lambda: not modes.pending)
+    finally:
+        modes.stop()
+
+    assert modes.stats()['commits'] == 1
+    assert changes == [('ai', 'local')]
+
+
+def test_async_commit_without_confirm_rolls_back(changes, wait_until):
+    modes = make(lambda mode: None, changes, confirm_timeout=0.1)
+    try:
+        modes.request('ai')
+        assert wait_until(lambda: modes.stats()['rollbacks'] == 1)
+    finally:
+        modes.stop()
+
+    assert modes.mode == 'radio'
+
+
+def test_remote_change_applies_when_idle(changes):
+    modes = make(Server(), changes)
+    try:
+        assert modes.confirm('ai') is True
+        assert modes.confirm('ai') is False     # repeated broadcast
+        assert modes.confirm('tv') is False     # unknown mode
+    finally:
+        modes.stop()
+
+    assert modes.mode == 'ai'
+    assert changes == [('ai', 'remote')]
+
+
+def test_remote_change_does_not_override_pending_press(changes, wait_until):
+    server = Server()
+    server.gate.clear()
+    modes = make(server, changes)
+    try:
+        modes.request('ai')
+        assert server.entered.wait(2.0)
+        modes.confirm('radio')              # stale broadcast
+        assert modes.mode == 'ai'
+        server.gate.set()
+        assert wait_until(lambda: not modes.pending)
+    finally:
+        modes.stop()
+
+    assert changes == [('ai', 'local')]
@@ -0,0 +1,175 @@
+"""
+Tests for push_channel.PushChannel: Socket.io frame parsing, batching and
+reconnect against a local Engine.IO v4 server.
+"""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+websockets = pytest.importorskip("websockets")
+
+import push_channel  # noqa: E402
+from push_channel import PushChannel  # noqa: E402
+
+
+UNREACHABLE_URL = "http://127.0.0.1:9"   # nothing listens; the channel stays offline
+
+
+@pytest.fixture
+def offline_channel():
+    channel = PushChannel(UNREACHABLE_URL)
+    yield channel
+    channel.close()
+
+
+def test_dispatch_decodes_event_frames(offline_channel):
+    events = []
+    offline_channel.subscribe(lambda name, data: events.append((name, data)))
+
+    offline_channel._dispatch('["mode-changed",{"mode":"ai"}]')
+    offline_channel._dispatch('17["radio-state-update",{"frequency":99.1}]')  # with ack id
+    offline_channel._dispatch('["select"]')
+
+    assert events == [
+        ('mode-changed', {'mode': 'ai'}),
+        ('radio-state-update', {'frequency': 99.1}),
+        ('select', None),
+    ]
+    assert offline_channel.received == 3
+
+
+def test_dispatch_ignores_malformed_frames(offline_channel):
+    events = []
+    offline_channel.subscribe(lambda name, data: events.append(name))
+
+    offline_channel._dispatch('no json here')
+    offline_channel._dispatch('["unterminated"')
+    offline_channel._dispatch('[]')
+
+    assert events == []
+
+
+def test_failing_handler_does_not_stop_others(offline_channel):
+    events = []
+
+    def broken(name, data):
+        raise RuntimeError("boom")
+
+    offline_channel.subscribe(broken)
+    offline_channel.subscribe(lambda name, data: events.append(name))
+    offline_channel._dispatch('["speech-activity",{}]')
+
+    assert events == ['speech-activity']
+
+
+def test_send_merges_consecutive_scans(offline_channel):
+    offline_channel.send('scan', steps=1)
+    offline_channel.send('scan', steps=2)
+    offline_channel.send('select')
+    offline_channel.send('scan', steps=-1)
+
+    assert list(offline_channel._buffer) == [
+        {'type': 'scan', 'steps': 3},
+        {'type': 'select'},
+        {'type': 'scan', 'steps': -1},
+    ]
+    assert offline_channel.stats()['merged'] == 1
+
+
+def test_send_drops_oldest_when_buffer_is_full(offline_channel, monkeypatch):
+    monkeypatch.setattr(push_channel, 'MAX_BUFFER', 3)
+    for mode in ('radio', 'ai', 'radio', 'ai'):
+        offline_channel.send('mode', mode=mode)
+
+    assert [event['mode'] for event in offline_channel._buffer] == ['ai', 'radio', 'ai']
+    assert offline_channel.stats()['dropped'] == 1
+
+
+class FakeSocketIOServer:
+    """Minimal Engine.IO v4 / Socket.IO server on its own loop thread."""
+
+    def __init__(self):
+        self.received = []
+        self.sessions = 0
+        self.drop_first = False
+        self.port = None
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._stop = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait(2.0)
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._serve())
+
+    async def _serve(self):
+        self._stop = asyncio.Event()
+        async with websockets.serve(self._handler, "127.0.0.1", 0) as server:
+            self.port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            await self._stop.wait()
+
+    async def _handler(self, ws):
+        self.sessions += 1
+        await ws.send('0{"sid":"test","pingInterval":25000,"pingTimeout":20000}')
+        assert await ws.recv() == '40'
+        await ws.send('40{"sid":"sio"}')
+        if self.drop_first and self.sessions == 1:
+            return   # close right after the handshake
+        await ws.send('42["mode-changed",{"mode":"ai"}]')
+        async for packet in ws:
+            if packet.startswith('42'):
+                self.received.append(json.loads(packet[2:]))
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join(2.0)
+
+
+@pytest.fixture
+def server():
+    server = FakeSocketIOServer()
+    yield server
+    server.close()
+
+
+def test_handshake_events_and_batches(server, wait_until):
+    events = []
+    channel = PushChannel(f"http://127.0.0.1:{server.port}",
+                          on_event=lambda name, data: events.append((name, data)))
+    try:
+        assert wait_until(lambda: channel.connected)
+        assert wait_until(lambda: events)
+        assert events[0] == ('mode-changed', {'mode': 'ai'})
+
+        channel.send('scan', steps=1)
+        channel.send('scan', steps=1)
+        channel.send('mode', mode='radio')
+        assert wait_until(lambda: server.received)
+    finally:
+        channel.close()
+
+    assert server.received[0] == ['hardware-events', [
+        {'type': 'scan', 'steps': 2},
+        {'type': 'mode', 'mode': 'radio'},
+    ]]
+
+
+def test_reconnects_after_server_closes(server, monkeypatch, wait_until):
+    monkeypatch.setattr(push_channel, 'RECONNECT_MIN', 0.05)
+    server.drop_first = True
+    channel = PushChannel(f"http://127.0.0.1:{server.port}")
+    try:
+        assert wait_until(lambda: server.sessions >= 2 and channel.connected)
+        channel.send('select')
+        assert wait_until(lambda: server.received)
+    finally:
+        channel.close()
+
+    assert channel.stats()['reconnects'] >= 1
+    assert server.received[0] == ['hardware-events', [{'type': 'select'}]]
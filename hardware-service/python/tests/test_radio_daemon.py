@@ -0,0 +1,57 @@
+"""
+Tests for radio_daemon.RadioDaemon.handle: every request gets a reply, bad
+ones included.
+"""
+
+import pytest
+
+pytest.importorskip("smbus2")
+
+from radio_daemon import RadioDaemon  # noqa: E402
+
+
+class FakeTuner:
+    frequency = 99.1
+    muted = False
+
+    def __init__(self):
+        self.tuned = []
+
+    def set_frequency(self, freq):
+        self.tuned.append(freq)
+        return {'ok': True, 'frequency': freq}
+
+    def step(self, delta):
+        return {'ok': True, 'frequency': self.frequency}
+
+    def recall_preset(self, slot):
+        raise OSError("I2C bus error")
+
+
+@pytest.fixture
+def daemon():
+    return RadioDaemon(tuner=FakeTuner())
+
+
+@pytest.mark.parametrize('request_', [[1, 2], "set", 42, None])
+def test_non_object_request_is_rejected(daemon, request_):
+    assert daemon.handle(request_) == {'ok': False, 'error': "Request must be a JSON object"}
+
+
+@pytest.mark.parametrize('freq', ["NaN", float('nan'), float('inf'), "-Infinity", "fm", None])
+def test_invalid_frequency_never_reaches_the_tuner(daemon, freq):
+    response = daemon.handle({'cmd': 'set', 'freq': freq})
+    assert response['ok'] is False
+    assert daemon.tuner.tuned == []
+
+
+def test_infinite_step_is_rejected(daemon):
+    assert daemon.handle({'cmd': 'step', 'delta': float('inf')})['ok'] is False
+
+
+def test_raising_command_becomes_an_error_reply(daemon):
+    assert daemon.handle({'cmd': 'preset', 'slot': 1}) == {'ok': False, 'error': "I2C bus error"}
+
+
+def test_valid_request_passes_through(daemon):
+    assert daemon.handle({'cmd': 'SET', 'freq': "101.5"}) == {'ok': True, 'frequency': 101.5}
@@ -0,0 +1,83 @@
+"""
+Tests for radio_tuner.RadioTuner presets against a fake I2C bus: the shadow
+register of a fresh tuner and the PLL word a saved preset sends back.
+"""
+
+import pytest
+
+pytest.importorskip("smbus2")
+
+import radio_tuner  # noqa: E402
+import state_bus  # noqa: E402
+from settings_store import SettingsStore  # noqa: E402
+
+
+class FakeBus:
+    """SMBus stand-in recording every write."""
+
+    def __init__(self, bus_number):
+        self.writes = []
+
+    def i2c_rdwr(self, msg):
+        self.writes.append(list(msg))
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def settings(tmp_path):
+    store = SettingsStore(str(tmp_path / "settings.json"), delay=60.0)
+    yield store
+    store.stop(flush=False)
+
+
+@pytest.fixture
+def make_tuner(tmp_path, settings, monkeypatch):
+    monkeypatch.setattr(radio_tuner.smbus2, 'SMBus', FakeBus)
+    monkeypatch.setattr(radio_tuner, 'get_settings', lambda: settings)
+    monkeypatch.setattr(state_bus, 'get_bus', lambda: None)
+    monkeypatch.setattr(state_bus, 'publish', lambda **fields: None)
+
+    def make():
+        return radio_tuner.RadioTuner(index_file=str(tmp_path / "stations.json"),
+                                      auto_injection=False)
+    return make
+
+
+def pll_of(register):
+    return ((register[0] & 0x3F) << 8) | register[1]
+
+
+def test_fresh_tuner_shadows_restored_channel(make_tuner, settings):
+    settings.update(frequency=101.5)
+    tuner = make_tuner()
+
+    assert pll_of(tuner.register) == radio_tuner.GRID.pll(tuner.channel)
+    assert tuner.muted
+    assert tuner.bus.writes == []   # nothing sent until the first tune
+
+
+def test_preset_saved_on_fresh_tuner_recalls_its_station(make_tuner, settings):
+    settings.update(frequency=101.5)
+    tuner = make_tuner()
+    assert tuner.save_preset(1)['ok']
+
+    expected = radio_tuner.GRID.pll(radio_tuner.GRID.channel(101.5))
+    assert settings.get('presets')['1'] == [101.5, expected, 1]
+
+    tuner.set_frequency(88.1)
+    result = tuner.recall_preset(1)
+    assert result['ok'] and result['frequency'] == 101.5
+    assert pll_of(tuner.bus.writes[-1]) == expected
+
+
+def test_save_after_untuned_channel_change_uses_that_channel(make_tuner, settings):
+    tuner = make_tuner()
+    tuner.set_frequency(95.0)
+    tuner.frequency = 104.3          # e.g. reloaded from another process's tune
+    tuner.index.set_tuning(tuner.channel, False, 1)
+
+    assert tuner.save_preset(2)['ok']
+    channel = radio_tuner.GRID.channel(104.3)
+    assert settings.get('presets')['2'] == [104.3, radio_tuner.GRID.pll(channel, False) + 1, 0]
@@ -0,0 +1,139 @@
+"""
+Tests for settings_store.SettingsStore: write coalescing, no-op updates, the
+flock merge between processes sharing the file, reload() and restore_lines().
+"""
+
+import json
+import time
+
+import pytest
+
+from settings_store import SETTINGS_VERSION, SettingsStore, restore_lines
+
+
+MANUAL = 60.0   # coalescing delay that never fires during a test: flush by hand
+
+
+def read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "settings.json")
+
+
+@pytest.fixture
+def stores():
+    opened = []
+
+    def open_store(path, delay=MANUAL):
+        store = SettingsStore(path, delay=delay)
+        opened.append(store)
+        return store
+
+    yield open_store
+    for store in opened:
+        store.stop(flush=False)
+
+
+def test_missing_file_gives_defaults(path, stores):
+    settings = stores(path)
+    assert settings.get('mode') == 'radio'
+    assert settings.get('volume') is None
+    assert settings.get('volume', 40) == 40
+
+
+def test_foreign_file_is_ignored(path, stores):
+    with open(path, 'w') as f:
+        json.dump({'v': SETTINGS_VERSION + 1, 'volume': 99}, f)
+    assert stores(path).get('volume') is None
+
+
+def test_burst_of_updates_is_one_write(path, stores, wait_until):
+    settings = stores(path, delay=0.05)
+    for frequency in (99.1, 99.3, 99.5, 99.7):
+        settings.update(frequency=frequency)
+
+    assert wait_until(lambda: settings.stats()['writes'] == 1)
+    time.sleep(0.1)
+    assert settings.stats() == {'updates': 4, 'writes': 1, 'errors': 0, 'pending': 0}
+    assert read_json(path)['frequency'] == 99.7
+
+
+def test_unchanged_value_is_not_an_update(path, stores):
+    settings = stores(path)
+    assert settings.update(mode='radio') is False
+    assert settings.stats()['pending'] == 0
+
+
+def test_value_back_where_it_started_is_not_written(path, stores):
+    settings = stores(path)
+    settings.update(volume=40)
+    settings.flush()
+    assert settings.stats()['writes'] == 1
+
+    settings.update(volume=60)
+    settings.update(volume=40)
+    settings.flush()
+    assert settings.stats()['writes'] == 1
+
+
+def test_writers_merge_only_their_own_keys(path, stores):
+    radio = stores(path)
+    hardware = stores(path)          # loaded before the radio writes anything
+
+    radio.update(frequency=101.5)
+    radio.flush()
+    hardware.update(volume=55, mode='ai')
+    hardware.flush()
+
+    data = read_json(path)
+    assert data['v'] == SETTINGS_VERSION
+    assert (data['frequency'], data['volume'], data['mode']) == (101.5, 55, 'ai')
+
+
+def test_reload_picks_up_other_writers_and_keeps_pending_changes(path, stores):
+    radio = stores(path)
+    encoder = stores(path)
+    encoder.update(volume=30)        # not written yet
+
+    radio.update(frequency=88.1, volume=70)
+    radio.flush()
+    assert encoder.get('frequency') is None
+
+    encoder.reload()
+    assert encoder.get('frequency') == 88.1
+    assert encoder.get('volume') == 30
+
+    encoder.flush()
+    assert read_json(path)['volume'] == 30
+
+
+def test_stop_flushes_pending_changes(path):
+    settings = SettingsStore(path, delay=MANUAL)
+    settings.update(mode='ai')
+    settings.stop()
+
+    assert read_json(path)['mode'] == 'ai'
+    assert SettingsStore(path, delay=MANUAL).get('mode') == 'ai'
+
+
+def test_failed_write_is_retried(tmp_path, stores, wait_until):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    settings = stores(str(blocker / "settings.json"), delay=0.05)
+    settings.update(volume=20)
+
+    assert wait_until(lambda: settings.stats()['errors'] >= 1)
+    assert settings.stats()['pending'] == 1
+
+
+def test_restore_lines(path, stores):
+    settings = stores(path)
+    settings.update(frequency=99.1, volume=40)
+    settings.flush()
+
+    assert restore_lines(path) == ['SETTINGS_FREQUENCY=99.1', 'SETTINGS_VOLUME=40']
+    assert restore_lines(path + '.missing') == []
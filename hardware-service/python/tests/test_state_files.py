@@ -0,0 +1,45 @@
+"""
+Tests for state_files: atomic JSON writes and the start-radio.sh exporter.
+"""
+
+import json
+import os
+
+import pytest
+
+from state_files import restore_lines, write_json
+
+
+def test_write_json_replaces_file_and_creates_directory(tmp_path):
+    path = str(tmp_path / "sub" / "state.json")
+    write_json(path, {'frequency': 99.1}, sync_dir=True)
+    write_json(path, {'frequency': 101.5}, fsync=False)
+
+    with open(path) as f:
+        assert json.load(f) == {'frequency': 101.5}
+    assert os.listdir(tmp_path / "sub") == ["state.json"]   # no temp file left
+
+
+def test_failed_write_keeps_old_version(tmp_path):
+    path = str(tmp_path / "state.json")
+    write_json(path, {'volume': 40})
+    with pytest.raises(TypeError):
+        write_json(path, {'volume': object()})
+
+    with open(path) as f:
+        assert json.load(f) == {'volume': 40}
+    assert os.listdir(tmp_path) == ["state.json"]
+
+
+def test_restore_lines_formats_numbers():
+    assert restore_lines('SETTINGS', frequency="99.14", volume=40.7) == \
+        ['SETTINGS_FREQUENCY=99.1', 'SETTINGS_VOLUME=40']
+
+
+@pytest.mark.parametrize('frequency, volume', [
+    (None, None),
+    ("99.1; reboot", "$(reboot)"),
+    (float('nan'), float('inf')),
+])
+def test_restore_lines_leaves_out_anything_but_numbers(frequency, volume):
+    assert restore_lines('SNAPSHOT', frequency, volume) == []
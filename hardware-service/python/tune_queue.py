@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Coalescing Tune Queue
+
+Fast encoder spins and held scan buttons produce bursts of single-channel
+steps. Applying each one costs an I2C write (or a backend round-trip), so
+the radio falls seconds behind the knob. TuneCoalescer accumulates step
+deltas and hands the net delta to an apply callback once the burst goes
+quiet (latest wins), so a burst of N presses costs one tune.
+
+Usage:
+    queue = TuneCoalescer(lambda steps: send_command('step', delta=steps))
+    queue.step(+1)   # returns immediately
+    queue.step(+1)
+    ...
+    print(queue.stats())  # {'requests': 2, 'applied': 1, 'elided': 1, ...}
+"""
+
+import logging
+import threading
+import time
+
+
+COALESCE_WINDOW = 0.04  # seconds of quiet before the pending delta is applied
+MAX_DELAY = 0.15        # seconds; upper bound from first step to apply during a long spin
+
+logger = logging.getLogger('tune-queue')
+
+
+class TuneCoalescer:
+    """
+    Latest-wins tuning pipeline running on its own worker thread.
+    """
+
+    def __init__(self, apply, window=COALESCE_WINDOW, max_delay=MAX_DELAY):
+        """
+        Initialize and start the worker thread.
+
+        Args:
+            apply: Callable taking the net channel delta (int, never 0)
+            window: Quiet time that ends a burst (seconds)
+            max_delay: Longest a step may wait before being applied (seconds)
+        """
+        self.apply = apply
+        self.window = window
+        self.max_delay = max_delay
+
+        self._cond = threading.Condition()
+        self._pending = 0
+        self._batch = 0          # requests folded into the pending delta
+        self._first_time = None
+        self._last_time = None
+        self._running = True
+
+        # Counters
+        self.requests = 0
+        self.applied = 0
+        self.elided = 0
+        self.errors = 0
+
+        self._thread = threading.Thread(target=self._run, name='tune-queue', daemon=True)
+        self._thread.start()
+
+    def step(self, delta):
+        """
+        Queue a relative step (channels). Never blocks on the tuner.
+
+        Args:
+            delta: Channel steps (positive = up)
+        """
+        if delta == 0:
+            return
+        with self._cond:
+            now = time.monotonic()
+            if self._batch == 0:
+                self._first_time = now
+            self._pending += delta
+            self._batch += 1
+            self._last_time = now
+            self.requests += 1
+            self._cond.notify()
+
+    def stats(self):
+        """Counters as a dict."""
+        with self._cond:
+            return {
+                'requests': self.requests,
+                'applied': self.applied,
+                'elided': self.elided,
+                'errors': self.errors,
+                'pending': self._pending,
+            }
+
+    def stop(self, flush=True):
+        """
+        Stop the worker thread.
+
+        Args:
+            flush: Apply any pending delta before returning
+        """
+        with self._cond:
+            self._running = False
+            if not flush:
+                self._pending = 0
+                self._batch = 0
+            self._cond.notify()
+        self._thread.join(timeout=1.0)
+
+    def _take(self):
+        """Wait for a finished burst and return (delta, batch_size), or None on stop."""
+        with self._cond:
+            while True:
+                if self._batch:
+                    now = time.monotonic()
+                    quiet_at = self._last_time + self.window
+                    latest_at = self._first_time + self.max_delay
+                    due = min(quiet_at, latest_at)
+                    if now >= due or not self._running:
+                        delta, batch = self._pending, self._batch
+                        self._pending = 0
+                        self._batch = 0
+                        return delta, batch
+                    self._cond.wait(due - now)
+                elif not self._running:
+                    return None
+                else:
+                    self._cond.wait()
+
+    def _run(self):
+        while True:
+            taken = self._take()
+            if taken is None:
+                return
+            delta, batch = taken
+
+            with self._cond:
+                if delta == 0:
+                    # Steps cancelled out (e.g. up then down): nothing to write
+                    self.elided += batch
+                    continue
+                self.elided += batch - 1
+
+            try:
+                self.apply(delta)
+                with self._cond:
+                    self.applied += 1
+            except Exception as e:
+                with self._cond:
+                    self.errors += 1
+                logger.error(f"❌ Tune apply failed ({delta:+d} steps): {e}")
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+ALSA Volume Mixer
+
+Running `amixer set Master N%` for every encoder detent forks a process per
+step, so a fast spin launches dozens of them. VolumeMixer opens the ALSA
+mixer control once (pyalsaaudio) and reads/writes the volume in-process.
+
+It also subscribes to mixer change events, so volume set elsewhere (another
+process, alsamixer, hardware-service.js /api/radio/volume) is reported via
+the on_change callback without polling.
+
+Falls back to the amixer command when pyalsaaudio is not installed or the
+control cannot be opened.
+
+Usage:
+    mixer = VolumeMixer(on_change=lambda vol: print(f"Volume now {vol}%"))
+    mixer.set_volume(40)
+    print(mixer.get_volume())
+    mixer.close()
+"""
+
+import logging
+import re
+import select
+import subprocess
+import threading
+
+try:
+    import alsaaudio
+except ImportError:
+    alsaaudio = None
+
+
+MIXER_CONTROL = "Master"
+DEFAULT_VOLUME = 50
+AMIXER_TIMEOUT = 1  # seconds
+
+logger = logging.getLogger('volume-mixer')
+
+_PERCENT_RE = re.compile(r'\[(\d+)%\]')
+
+
+class VolumeMixer:
+    """
+    System volume via a persistent ALSA mixer handle, or amixer as a fallback.
+    """
+
+    def __init__(self, control=MIXER_CONTROL, on_change=None):
+        """
+        Open the mixer and start listening for external changes.
+
+        Args:
+            control: ALSA simple mixer control name
+            on_change: Callable taking the new volume (0-100) when it is
+                       changed by someone else (ALSA backend only)
+        """
+        self.control = control
+        self.on_change = on_change
+        self._mixer = None
+        self._lock = threading.Lock()
+        self._running = True
+        self._thread = None
+        self._volume = None
+
+        if alsaaudio is not None:
+            try:
+                self._mixer = alsaaudio.Mixer(control)
+            except alsaaudio.ALSAAudioError as e:
+                logger.warning(f"⚠️  ALSA mixer '{control}' unavailable ({e}), using amixer")
+        else:
+            logger.info("pyalsaaudio not installed, using amixer")
+
+        self._volume = self.get_volume()
+
+        if self._mixer is not None:
+            self._thread = threading.Thread(target=self._watch, name='volume-mixer', daemon=True)
+            self._thread.start()
+
+    @property
+    def native(self):
+        """True if the in-process ALSA backend is in use."""
+        return self._mixer is not None
+
+    @property
+    def volume(self):
+        """Last known volume (0-100), without touching the mixer."""
+        return self._volume
+
+    def get_volume(self):
+        """
+        Read the current volume.
+
+        Returns:
+            Volume (0-100); DEFAULT_VOLUME if it cannot be read
+        """
+        if self._mixer is not None:
+            with self._lock:
+                try:
+                    levels = self._mixer.getvolume()
+                except alsaaudio.ALSAAudioError as e:
+                    logger.warning(f"Could not read volume: {e}")
+                    return self._volume if self._volume is not None else DEFAULT_VOLUME
+            # Average the channels (Front Left / Front Right)
+            return round(sum(levels) / len(levels)) if levels else DEFAULT_VOLUME
+
+        try:
+            result = subprocess.run(
+                ['amixer', 'get', self.control],
+                capture_output=True,
+                text=True,
+                timeout=AMIXER_TIMEOUT
+            )
+            for line in result.stdout.split('\n'):
+                if 'Front Left:' in line or 'Mono:' in line:
+                    match = _PERCENT_RE.search(line)
+                    if match:
+                        return int(match.group(1))
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning(f"Could not read volume: {e}")
+        return DEFAULT_VOLUME
+
+    def set_volume(self, volume):
+        """
+        Set the volume on all channels.
+
+        Args:
+            volume: Volume level (0-100), clamped
+
+        Returns:
+            Volume actually set (unchanged on error)
+        """
+        volume = max(0, min(100, int(volume)))
+        if self._mixer is not None:
+            with self._lock:
+                try:
+                    self._mixer.setvolume(volume)
+                    self._volume = volume
+                except alsaaudio.ALSAAudioError as e:
+                    logger.error(f"Error setting volume: {e}")
+            return self._volume
+
+        try:
+            subprocess.run(
+                ['amixer', 'set', self.control, f'{volume}%'],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=AMIXER_TIMEOUT
+            )
+            self._volume = volume
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.error(f"Error setting volume: {e}")
+        return self._volume
+
+    def close(self):
+        """Stop the event listener and release the mixer."""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        if self._mixer is not None:
+            with self._lock:
+                self._mixer.close()
+                self._mixer = None
+
+    def _watch(self):
+        """Wait for mixer events and report volume changes made by others."""
+        poller = select.poll()
+        for fd, events in self._mixer.polldescriptors():
+            poller.register(fd, events)
+
+        while self._running:
+            # Short timeout so close() is noticed promptly
+            if not poller.poll(500):
+                continue
+            with self._lock:
+                if self._mixer is None:
+                    return
+                self._mixer.handleevents()
+            volume = self.get_volume()
+            if volume == self._volume:
+                continue  # Our own write, or a non-volume change (mute etc.)
+            self._volume = volume
+            if self.on_change is not None:
+                try:
+                    self.on_change(volume)
+                except Exception as e:
+                    logger.error(f"Volume change callback failed: {e}")
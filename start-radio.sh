@@ -1,18 +1,34 @@
 #!/bin/bash
 # Start FM Radio at boot
-# Tunes to 98.5 FM (WBLS) and turns radio ON
+# Tunes to the last station and volume (settings_store.py), or those an
+# emergency reboot saved (checkpoint.py snapshot), falling back to 98.5 FM
+# (WBLS), and turns radio ON
 
 RADIO_SCRIPT="/home/pi/cogito/hardware-service/python/radio-control.py"
+SETTINGS_SCRIPT="/home/pi/cogito/hardware-service/python/settings_store.py"
+CHECKPOINT_SCRIPT="/home/pi/cogito/hardware-service/python/checkpoint.py"
 
 echo "📻 Starting FM Radio at boot..."
 
 # Wait for I2C bus to be ready
 sleep 2
 
-# Set to 98.5 FM (WBLS) - as shown in the UI
-python3 "$RADIO_SCRIPT" set 98.5
+# Last station/volume (one read of the settings file)
+eval "$(python3 "$SETTINGS_SCRIPT" restore 2>/dev/null)"
+
+# Station/volume from before an emergency reboot (one-shot, takes precedence)
+eval "$(python3 "$CHECKPOINT_SCRIPT" restore 2>/dev/null)"
+FREQ="${SNAPSHOT_FREQUENCY:-${SETTINGS_FREQUENCY:-98.5}}"
+VOLUME="${SNAPSHOT_VOLUME:-$SETTINGS_VOLUME}"
+
+if [ -n "$VOLUME" ]; then
+    amixer -q set Master "${VOLUME}%"
+fi
+
+# Set to the restored station - 98.5 FM (WBLS) on first boot
+python3 "$RADIO_SCRIPT" set "$FREQ"
 
 # Turn radio ON
 python3 "$RADIO_SCRIPT" on
 
-echo "✅ Radio started at 98.5 FM (WBLS)"
+echo "✅ Radio started at $FREQ FM"